@@ -0,0 +1,116 @@
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.scheduler.queue import ExecutionQueue, TaskStatus
+from src.storage.memory import MemoryStore
+
+
+class LegacyQueue:
+    def __init__(self):
+        self.queue: List[Dict] = []
+
+    def add(self, task: Dict):
+        self.queue.append(task)
+        self.queue.sort(key=lambda t: (t["priority"], t["created_at"]), reverse=True)
+
+    def get_next(self) -> Optional[Dict]:
+        for task in self.queue:
+            if task["status"] == TaskStatus.PENDING:
+                return task
+        return None
+
+    def _find(self, task_id: str) -> Optional[Dict]:
+        for task in self.queue:
+            if task["task_id"] == task_id:
+                return task
+        return None
+
+    def start(self, task_id: str):
+        self._find(task_id)["status"] = TaskStatus.RUNNING
+
+    def complete(self, task_id: str):
+        self._find(task_id)["status"] = TaskStatus.COMPLETED
+
+    def is_running(self, channel: str) -> bool:
+        for task in self.queue:
+            if task["channel"] == channel and task["status"] == TaskStatus.RUNNING:
+                return True
+        return False
+
+
+def make_tasks(count: int, channels: int = 50) -> List[Dict]:
+    base = datetime(2025, 1, 1)
+    return [
+        {
+            "task_id": f"task_{i}",
+            "channel": f"channel_{i % channels}",
+            "command": "uv run python -m src.main",
+            "priority": i % 5,
+            "status": TaskStatus.PENDING,
+            "metadata": {},
+            "created_at": (base + timedelta(seconds=i)).isoformat(),
+            "started_at": None,
+            "completed_at": None,
+            "error": None
+        }
+        for i in range(count)
+    ]
+
+
+def drive(queue, ticks: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    for _ in range(ticks):
+        task = queue.get_next()
+        queue.is_running(task["channel"])
+        queue.start(task["task_id"])
+        queue.complete(task["task_id"])
+    return {"drain_per_tick_us": (time.perf_counter() - started) / ticks * 1e6}
+
+
+def bench_legacy(tasks: List[Dict], ticks: int) -> Dict[str, float]:
+    queue = LegacyQueue()
+    queue.queue = [dict(t) for t in tasks]
+    queue.queue.sort(key=lambda t: (t["priority"], t["created_at"]), reverse=True)
+    started = time.perf_counter()
+    for i, task in enumerate(tasks[:ticks]):
+        queue.add(dict(task, task_id=f"extra_{i}"))
+    result = {"add_us": (time.perf_counter() - started) / ticks * 1e6}
+    result.update(drive(queue, ticks))
+    return result
+
+
+def bench_indexed(tasks: List[Dict], ticks: int) -> Dict[str, float]:
+    store = MemoryStore()
+    store.records = {t["task_id"]: dict(t) for t in tasks}
+    queue = ExecutionQueue(storage=store)
+    started = time.perf_counter()
+    for i in range(ticks):
+        queue.add(f"channel_{i % 50}", "uv run python -m src.main", priority=i % 5)
+    result = {"add_us": (time.perf_counter() - started) / ticks * 1e6}
+    result.update(drive(queue, ticks))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ExecutionQueue scaling benchmark")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="Comma-separated queue sizes")
+    parser.add_argument("--ticks", type=int, default=200, help="Operations measured per size")
+    args = parser.parse_args()
+
+    results = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        tasks = make_tasks(size)
+        results.append({
+            "size": size,
+            "legacy": bench_legacy(tasks, args.ticks),
+            "indexed": bench_indexed(tasks, args.ticks)
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
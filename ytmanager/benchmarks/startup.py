@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS: Dict[str, List[str]] = {
+    "scheduler_list": ["scheduler", "--action", "list"],
+    "scheduler_queue": ["scheduler", "--action", "queue"],
+    "scheduler_series": ["scheduler", "--action", "series"],
+    "optimizer_help": ["optimizer", "--help"],
+    "analytics_help": ["analytics", "--help"],
+}
+
+HEAVY_MODULES = ["googleapiclient", "google.oauth2", "pydantic", "numpy", "requests", "asyncio", "yaml"]
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run(args: List[str], env: Dict[str, str], importtime: bool = False) -> subprocess.CompletedProcess:
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run([sys.executable, *flags, *args], env=env, capture_output=True, text=True)
+
+
+def wall_ms(args: List[str], env: Dict[str, str], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(args, env)
+        samples.append((time.perf_counter() - started) * 1e3)
+    return statistics.median(samples)
+
+
+def import_profile(args: List[str], env: Dict[str, str], exclude: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    profile = {}
+    for line in run(args, env, importtime=True).stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and match.group(4) not in (exclude or {}):
+            profile[match.group(4)] = int(match.group(2))
+    return profile
+
+
+def heavy_imports(profile: Dict[str, int]) -> List[str]:
+    return sorted(
+        heavy for heavy in HEAVY_MODULES
+        if any(module == heavy or module.startswith(heavy + ".") for module in profile)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup time and import profile")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per command; the median is reported")
+    parser.add_argument(
+        "--budget", type=float, default=1.5, help="Allowed time over a bare interpreter start, as a multiple of it"
+    )
+    parser.add_argument("--budget-ms", type=float, help="Absolute allowance in ms (overrides --budget)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed per command")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    cwd = os.getcwd()
+    report = {"commands": {}}
+    with tempfile.TemporaryDirectory() as root:
+        shutil.copytree(ROOT / "config", Path(root) / "config", ignore=shutil.ignore_patterns("youtube_credentials*"))
+        os.chdir(root)
+        report["interpreter_ms"] = wall_ms(["-c", "pass"], env, args.repeat)
+        report["budget_ms"] = args.budget_ms or args.budget * report["interpreter_ms"]
+        interpreter = import_profile(["-c", "pass"], env)
+        for name, command in COMMANDS.items():
+            argv = ["-m", "src", *command]
+            run(argv, env)
+            profile = import_profile(argv, env, exclude=interpreter)
+            total = wall_ms(argv, env, args.repeat)
+            report["commands"][name] = {
+                "wall_ms": total,
+                "overhead_ms": total - report["interpreter_ms"],
+                "heavy_imports": heavy_imports(profile),
+                "slowest_imports_us": dict(sorted(profile.items(), key=lambda item: -item[1])[:args.top]),
+            }
+        os.chdir(cwd)
+
+    failures = [
+        name for name, result in report["commands"].items()
+        if result["heavy_imports"] or result["overhead_ms"] > report["budget_ms"]
+    ]
+    report["failures"] = failures
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from src.scheduler.queue import ExecutionQueue
+from src.storage.journal import JournalStore
+from src.storage.json_store import JsonStore
+from src.storage.sqlite_store import SqliteStore
+
+from .queue_bench import make_tasks
+
+
+def backends(root: Path) -> Dict[str, Callable]:
+    return {
+        "json": lambda: JsonStore(str(root / "queue.json"), key_field="task_id"),
+        "journal": lambda: JournalStore(str(root / "queue_journal.json"), key_field="task_id"),
+        "sqlite": lambda: SqliteStore(str(root / "queue.db"), "execution_queue", "task_id"),
+    }
+
+
+def populate(store, size: int):
+    tasks = {t["task_id"]: t for t in make_tasks(size)}
+    if isinstance(store, SqliteStore):
+        store.put_many(tasks)
+    else:
+        store.records.update(tasks)
+        store.compact()
+
+
+def bench_backend(factory: Callable, size: int, ops: int) -> Dict[str, float]:
+    populate(factory(), size)
+
+    started = time.perf_counter()
+    queue = ExecutionQueue(storage=factory())
+    startup = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(ops):
+        task = queue.get_next()
+        queue.start(task["task_id"])
+        queue.complete(task["task_id"])
+    per_op = (time.perf_counter() - started) / (ops * 2)
+
+    return {"startup_ms": startup * 1e3, "transition_ms": per_op * 1e3}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage backend benchmark")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated record counts")
+    parser.add_argument("--ops", type=int, default=20, help="Queue transitions measured per backend")
+    parser.add_argument("--backends", default="json,journal,sqlite", help="Comma-separated backends")
+    args = parser.parse_args()
+
+    results = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        with tempfile.TemporaryDirectory() as root:
+            available = backends(Path(root))
+            row = {"size": size}
+            for name in args.backends.split(","):
+                row[name] = bench_backend(available[name], size, args.ops)
+            results.append(row)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.analytics.metrics import MetricsCalculator
+from src.channels.registry import ChannelRegistry
+from src.optimizer.ab_test import ABTest
+from src.optimizer.feedback_loop import FeedbackLoop
+from src.scheduler.queue import ExecutionQueue
+from src.storage import yaml_cache
+from src.storage.journal import JournalStore
+from src.storage.segmented_log import SegmentedLogStore
+from src.telemetry import Telemetry
+
+from .queue_bench import make_tasks
+from .synthetic import analytics_response, channels_config, daily_metrics, prompts_file
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+def timed(fn: Callable, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def bench_queue(size: int) -> Dict[str, float]:
+    ops = 200
+    store = JournalStore("queue.json", key_field="task_id")
+    store.records.update({t["task_id"]: t for t in make_tasks(size)})
+    store.compact()
+
+    started = time.perf_counter()
+    queue = ExecutionQueue("queue.json")
+    startup = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(ops):
+        queue.add(f"channel_{i % 50}", "uv run python -m src.main", priority=i % 5)
+    add = (time.perf_counter() - started) / ops
+
+    started = time.perf_counter()
+    for _ in range(ops):
+        task = queue.get_next()
+        queue.start(task["task_id"])
+        queue.complete(task["task_id"])
+    drain = (time.perf_counter() - started) / ops
+
+    return {"startup_ms": startup * 1e3, "add_us": add * 1e6, "get_start_complete_us": drain * 1e6}
+
+
+def bench_ab_test(size: int) -> Dict[str, float]:
+    ab = ABTest("ab_tests.json")
+    with ab.transaction():
+        for i in range(size):
+            ab.create_test(f"test_{i}", {"prompt": "a"}, {"prompt": "b"})
+    metrics = daily_metrics(1000)
+
+    single = timed(lambda: ab.record_result("test_0", "a", metrics[0]), repeat=50)
+    results = [(f"test_{i % size}", "ab"[i % 2], m) for i, m in enumerate(metrics)]
+    batch = timed(lambda: ab.record_results(results)) / len(results)
+    analyze = timed(lambda: [ab.analyze(f"test_{i}", min_sample_size=1) for i in range(size)])
+
+    return {"record_result_ms": single * 1e3, "record_results_us": batch * 1e6, "analyze_all_ms": analyze * 1e3}
+
+
+def bench_metrics(size: int) -> Dict[str, float]:
+    response = analytics_response(size)
+    calculator = MetricsCalculator()
+    return {
+        "calculate_all_ms": timed(lambda: calculator.calculate_all(response), repeat=3) * 1e3,
+        "calculate_frames_ms": timed(lambda: calculator.calculate_frames(response), repeat=3) * 1e3,
+    }
+
+
+def bench_feedback(size: int) -> Dict[str, float]:
+    prompts = Path("project/config/prompts.yaml")
+    prompts_file(prompts)
+    history_path = Path("feedback_history.json")
+    start = datetime(2023, 1, 1)
+    entries = [
+        {"timestamp": (start + timedelta(hours=2.4 * i)).isoformat(), "channel": f"channel_{i % 10}",
+         "metrics": m, "suggestions": {}, "applied": ["適用: script_prompt"] if i % 3 == 0 else []}
+        for i, m in enumerate(daily_metrics(size))
+    ]
+    history_path.write_text(json.dumps(entries, ensure_ascii=False))
+    middle = entries[len(entries) // 2]["timestamp"]
+
+    results = {}
+    stores = {
+        "segmented": lambda: SegmentedLogStore("feedback_history", legacy_path=str(history_path)),
+    }
+    for name, store in stores.items():
+        loop = FeedbackLoop(str(prompts), ab_test=ABTest("ab_tests.json"), history=store())
+        metrics = daily_metrics(10, seed=1)
+        run_daily = timed(lambda: [loop.run_daily(m, "channel_0") for m in metrics]) / len(metrics)
+        recent = timed(lambda: loop.get_recent_improvements(10), repeat=5)
+        month = timed(lambda: loop.history.range("channel_3", middle, middle[:7] + "-28"), repeat=5)
+        results[f"{name}_run_daily_ms"] = run_daily * 1e3
+        results[f"{name}_recent_improvements_ms"] = recent * 1e3
+        results[f"{name}_range_month_ms"] = month * 1e3
+
+    return results
+
+
+def bench_registry(size: int) -> Dict[str, float]:
+    path = Path("channels.yaml")
+    channels_config(path, size)
+
+    def cold():
+        yaml_cache._memo.clear()
+        for cached in yaml_cache.CACHE_DIR.glob("*.json"):
+            cached.unlink()
+        return ChannelRegistry(str(path))
+
+    def warm():
+        yaml_cache._memo.clear()
+        return ChannelRegistry(str(path))
+
+    cold_load = timed(cold)
+    warm_load = timed(warm, repeat=3)
+    registry = warm()
+    get_all = timed(lambda: [registry.get(name) for name in registry.list()])
+
+    return {"cold_load_ms": cold_load * 1e3, "cached_load_ms": warm_load * 1e3, "get_all_ms": get_all * 1e3}
+
+
+def bench_telemetry(size: int) -> Dict[str, float]:
+    def work(value):
+        return value + 1
+
+    def per_call(telemetry: Telemetry) -> float:
+        fn = telemetry.timed("bench.work", case="telemetry")(work)
+        return timed(lambda: [fn(i) for i in range(size)]) / size
+
+    disabled = Telemetry()
+    enabled = Telemetry(enabled=True)
+    traced = Telemetry(enabled=True, trace_path="trace.jsonl")
+    results = {
+        "plain_ns": timed(lambda: [work(i) for i in range(size)]) / size * 1e9,
+        "disabled_ns": per_call(disabled) * 1e9,
+        "enabled_ns": per_call(enabled) * 1e9,
+        "traced_ns": per_call(traced) * 1e9,
+        "prometheus_ms": timed(enabled.prometheus, repeat=3) * 1e3,
+    }
+    traced.disable()
+    return results
+
+
+CASES: Dict[str, Dict] = {
+    "queue": {"fn": bench_queue, "full": [1000, 10000, 100000], "quick": [1000]},
+    "ab_test": {"fn": bench_ab_test, "full": [10, 100, 1000], "quick": [10]},
+    "metrics": {"fn": bench_metrics, "full": [1000, 10000, 100000], "quick": [1000]},
+    "feedback": {"fn": bench_feedback, "full": [100, 1000, 10000], "quick": [100]},
+    "registry": {"fn": bench_registry, "full": [10, 100, 1000], "quick": [10]},
+    "telemetry": {"fn": bench_telemetry, "full": [10000, 100000], "quick": [10000]},
+}
+
+
+def run_case(fn: Callable, size: int, repeat: int) -> Dict[str, float]:
+    samples: List[Dict[str, float]] = []
+    cwd = os.getcwd()
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as root:
+            os.chdir(root)
+            samples.append(fn(size))
+            os.chdir(cwd)
+    return {metric: statistics.median(s[metric] for s in samples) for metric in samples[0]}
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> Dict:
+    regressions = []
+    improvements = []
+    for key, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(key, {}).get(metric)
+            if not base:
+                continue
+            ratio = value / base
+            row = {"case": key, "metric": metric, "baseline": base, "current": value, "ratio": round(ratio, 3)}
+            if ratio > 1 + threshold:
+                regressions.append(row)
+            elif ratio < 1 - threshold:
+                improvements.append(row)
+    return {"threshold": threshold, "regressions": regressions, "improvements": improvements}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for scheduler, optimizer and analytics hot paths")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated cases")
+    parser.add_argument("--sizes", help="Comma-separated sizes overriding each case's defaults")
+    parser.add_argument("--quick", action="store_true", help="Smallest size per case only")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the median is reported")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio before failing")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.cases.split(","):
+        case = CASES[name]
+        sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else case["quick" if args.quick else "full"]
+        for size in sizes:
+            results[f"{name}[{size}]"] = run_case(case["fn"], size, args.repeat)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        report["comparison"] = compare(results, json.loads(baseline_path.read_text())["results"], args.threshold)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
+    if args.save_baseline:
+        baseline_path.write_text(text)
+    if report.get("comparison", {}).get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
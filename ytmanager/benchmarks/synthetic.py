@@ -0,0 +1,94 @@
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import yaml
+
+from src.analytics.fake_server import headers
+
+METRIC_COLUMNS = [
+    "views",
+    "estimatedMinutesWatched",
+    "averageViewDuration",
+    "averageViewPercentage",
+    "likes",
+    "comments",
+    "shares",
+    "subscribersGained",
+    "subscribersLost",
+]
+
+
+def analytics_response(rows: int, videos: int = 500, seed: int = 0) -> Dict:
+    rng = np.random.default_rng(seed)
+    start = date(2025, 1, 1)
+    days = [(start + timedelta(days=int(i))).isoformat() for i in rng.integers(0, 365, rows)]
+    video_ids = [f"video_{int(i)}" for i in rng.integers(0, videos, rows)]
+    views = rng.integers(100, 20000, rows)
+    numeric = np.column_stack([
+        views,
+        views * rng.integers(2, 6, rows),
+        rng.integers(90, 390, rows),
+        rng.integers(20, 90, rows),
+        views // rng.integers(15, 25, rows),
+        views // rng.integers(80, 120, rows),
+        views // rng.integers(150, 200, rows),
+        rng.integers(0, 40, rows),
+        rng.integers(0, 7, rows),
+    ]).tolist()
+    return {
+        "columnHeaders": headers(["day", "video", *METRIC_COLUMNS]),
+        "rows": [[d, v, *values] for d, v, values in zip(days, video_ids, numeric)],
+    }
+
+
+def daily_metrics(count: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "views": rng.uniform(100, 20000),
+            "watch_time": rng.uniform(1000, 90000),
+            "average_view_duration": rng.uniform(60, 400),
+            "engagement_rate": rng.uniform(0.0, 0.1),
+            "retention_rate": rng.uniform(0.2, 0.8),
+            "subscriber_net": rng.uniform(-5, 40),
+        }
+        for _ in range(count)
+    ]
+
+
+def channels_config(path: Path, channels: int):
+    config = {
+        "storage": {"backend": "json"},
+        "templates": {
+            "default": {
+                "youtube_channel_id": "",
+                "schedule": "0 6 * * *",
+                "analytics": {"enabled": True, "metrics": ["watch_time", "ctr", "engagement_rate"], "lookback_days": 7},
+                "optimizer": {"enabled": True, "auto_tune": False, "min_sample_size": 10},
+            },
+            "finance": {"extends": "default", "analytics": {"lookback_days": 28}},
+        },
+        "channels": {
+            f"channel_{i}": {
+                "extends": "finance" if i % 2 else "default",
+                "project_path": f"../project_{i}",
+                "youtube_channel_id": f"UC{i:020d}",
+                "description": f"synthetic channel {i}",
+            }
+            for i in range(channels)
+        },
+    }
+    path.write_text(yaml.dump(config, allow_unicode=True, sort_keys=False))
+
+
+def prompts_file(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    prompts = {
+        "news_prompt": "最新の金融ニュースを要約する。" * 20,
+        "script_prompt": "視聴者向けの台本を書く。" * 40,
+        "metadata_prompt": "タイトルと説明文を作る。" * 10,
+    }
+    path.write_text(yaml.dump(prompts, allow_unicode=True, sort_keys=False))
@@ -1,19 +1,25 @@
 import argparse
-from .youtube_api import YouTubeAPI
-from .metrics import MetricsCalculator
+from typing import List, Optional
+
 from ..channels.registry import ChannelRegistry
+from .cache import AnalyticsCache
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="YouTube Analytics")
     parser.add_argument("--channel", required=True, help="Channel name")
     parser.add_argument("--credentials", default="config/youtube_credentials.json", help="YouTube credentials path")
-    args = parser.parse_args()
+    parser.add_argument("--no-cache", action="store_true", help="Refetch the whole lookback window")
+    args = parser.parse_args(argv)
+
+    from .metrics import MetricsCalculator
+    from .timeseries import WINDOWS, MetricsStore
+    from .youtube_api import YouTubeAPI
 
     registry = ChannelRegistry()
     channel_config = registry.get(args.channel)
 
-    api = YouTubeAPI(args.credentials)
+    api = YouTubeAPI(args.credentials, cache=None if args.no_cache else AnalyticsCache())
     calculator = MetricsCalculator()
 
     analytics = api.get_channel_analytics(
@@ -21,12 +27,19 @@ def main():
         channel_config.analytics.lookback_days
     )
 
-    metrics = calculator.calculate_all(analytics)
+    frames = calculator.calculate_frames(analytics)
+    store = MetricsStore()
+    store.ingest_frames(args.channel, frames)
 
     print(f"Analytics for {args.channel}:")
-    for metric, value in metrics.items():
+    for metric, value in frames.summary.items():
         print(f"  {metric}: {value}")
 
+    for days in WINDOWS:
+        print(f"Rolling {days}d mean:")
+        for metric, value in store.window(args.channel, days).items():
+            print(f"  {metric}: {value}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,142 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import requests
+from google.auth.credentials import Credentials
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+
+from ..telemetry import TELEMETRY
+from .quota import QuotaGuard
+
+DATA_API_URL = "https://www.googleapis.com/youtube/v3"
+ANALYTICS_API_URL = "https://youtubeanalytics.googleapis.com/v2"
+VIDEO_METRICS = "views,estimatedMinutesWatched,averageViewDuration,averageViewPercentage,likes,comments,shares"
+
+
+class BulkFetchError(RuntimeError):
+    def __init__(self, results: Dict[str, Dict], errors: Dict[str, Exception]):
+        failed = ", ".join(f"{channel_id}: {error!r}" for channel_id, error in errors.items())
+        super().__init__(f"{len(errors)} of {len(results) + len(errors)} channels failed ({failed})")
+        self.results = results
+        self.errors = errors
+
+
+def chunked(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def merge_reports(reports: List[Dict]) -> Dict:
+    merged = {"kind": "youtubeAnalytics#resultTable", "columnHeaders": [], "rows": []}
+    for report in reports:
+        merged["columnHeaders"] = merged["columnHeaders"] or report.get("columnHeaders", [])
+        merged["rows"].extend(report.get("rows", []))
+    return merged
+
+
+class BulkAnalyticsFetcher:
+    def __init__(
+        self,
+        session: requests.Session,
+        max_workers: int = 8,
+        chunk_size: int = 200,
+        data_api_url: str = DATA_API_URL,
+        analytics_api_url: str = ANALYTICS_API_URL,
+        quota: Optional[QuotaGuard] = None
+    ):
+        self.session = session
+        self.quota = quota or QuotaGuard()
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.data_api_url = data_api_url
+        self.analytics_api_url = analytics_api_url
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_credentials(cls, credentials: Credentials, **kwargs) -> "BulkAnalyticsFetcher":
+        return cls(AuthorizedSession(credentials), **kwargs)
+
+    def _get(self, method: str, url: str, params: Dict) -> Dict:
+        with TELEMETRY.span("youtube_api.execute", method=method, client="bulk"):
+            return self.quota.execute(method, lambda: self._request(url, params))
+
+    def _request(self, url: str, params: Dict) -> Dict:
+        response = self.session.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def estimate_quota(self, video_counts: Dict[str, int]) -> int:
+        search_cost = QuotaGuard.cost("youtube.search.list")
+        report_cost = QuotaGuard.cost("youtubeAnalytics.reports.query")
+        return sum(
+            max(math.ceil(count / 50), 1) * search_cost + math.ceil(count / self.chunk_size) * report_cost
+            for count in video_counts.values()
+        )
+
+    def list_channel_video_ids(self, channel_id: str, limit: Optional[int] = None) -> List[str]:
+        video_ids = []
+        params = {"part": "id", "channelId": channel_id, "maxResults": 50, "order": "date", "type": "video"}
+        while True:
+            page = self._get("youtube.search.list", f"{self.data_api_url}/search", params)
+            video_ids.extend(item["id"]["videoId"] for item in page.get("items", []))
+            if not page.get("nextPageToken") or (limit and len(video_ids) >= limit):
+                return video_ids[:limit] if limit else video_ids
+            params = {**params, "pageToken": page["nextPageToken"]}
+
+    def get_videos_analytics(
+        self,
+        video_ids: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        ids: str = "channel==MINE",
+        metrics: str = VIDEO_METRICS
+    ) -> Dict:
+        reports = []
+        for chunk in chunked(video_ids, self.chunk_size):
+            reports.append(self._get("youtubeAnalytics.reports.query", f"{self.analytics_api_url}/reports", {
+                "ids": ids,
+                "startDate": start_date.strftime("%Y-%m-%d"),
+                "endDate": end_date.strftime("%Y-%m-%d"),
+                "metrics": metrics,
+                "dimensions": "video",
+                "filters": f"video=={','.join(chunk)}",
+                "maxResults": len(chunk)
+            }))
+        return merge_reports(reports)
+
+    def fetch_channel(
+        self,
+        channel_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None
+    ) -> Dict:
+        video_ids = self.list_channel_video_ids(channel_id, limit)
+        return self.get_videos_analytics(video_ids, start_date, end_date, ids=f"channel=={channel_id}")
+
+    def fetch_channels(
+        self,
+        channel_ids: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                channel_id: executor.submit(self.fetch_channel, channel_id, start_date, end_date, limit)
+                for channel_id in channel_ids
+            }
+        results, errors = {}, {}
+        for channel_id, future in futures.items():
+            if future.exception():
+                errors[channel_id] = future.exception()
+            else:
+                results[channel_id] = future.result()
+        if errors:
+            raise BulkFetchError(results, errors)
+        return results
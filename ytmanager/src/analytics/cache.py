@@ -0,0 +1,105 @@
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from ..storage.files import atomic_write_text
+from ..telemetry import TELEMETRY
+
+CHANNEL_METRICS = (
+    "views,estimatedMinutesWatched,averageViewDuration,averageViewPercentage,"
+    "likes,comments,shares,subscribersGained,subscribersLost"
+)
+
+
+def date_range(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def contiguous_spans(days: List[date]) -> List[Tuple[date, date]]:
+    spans = []
+    for day in sorted(days):
+        if spans and day == spans[-1][1] + timedelta(days=1):
+            spans[-1] = (spans[-1][0], day)
+        else:
+            spans.append((day, day))
+    return spans
+
+
+class AnalyticsCache:
+    def __init__(self, cache_dir: str = "data/analytics_cache", settle_days: int = 3, ttl_hours: float = 6):
+        self.cache_dir = Path(cache_dir)
+        self.settle_days = settle_days
+        self.ttl = timedelta(hours=ttl_hours)
+
+    def _path(self, channel_id: str, metrics: str) -> Path:
+        digest = hashlib.sha1(metrics.encode()).hexdigest()[:12]
+        return self.cache_dir / channel_id / f"{digest}.json"
+
+    @TELEMETRY.timed("storage.load", backend="analytics_cache")
+    def _load(self, path: Path) -> Dict:
+        if path.exists():
+            with open(path) as f:
+                return json.load(f)
+        return {"columnHeaders": [], "days": {}}
+
+    def _is_fresh(self, day: date, entry: Dict, now: datetime) -> bool:
+        fetched_at = datetime.fromisoformat(entry["fetched_at"])
+        settled_at = datetime.combine(day + timedelta(days=self.settle_days), datetime.min.time())
+        return fetched_at >= settled_at or now - fetched_at < self.ttl
+
+    def stale_days(self, channel_id: str, metrics: str, start: date, end: date) -> List[date]:
+        return self._stale(self._load(self._path(channel_id, metrics))["days"], start, end)
+
+    def settled_days(self, channel_id: str, metrics: str, start: date, end: date) -> Dict[str, Dict[str, float]]:
+        cache = self._load(self._path(channel_id, metrics))
+        names = [header["name"] for header in cache["columnHeaders"]]
+        settled = {}
+        for day in date_range(start, end):
+            entry = cache["days"].get(day.isoformat())
+            if not entry or not entry["row"]:
+                continue
+            settled_at = datetime.combine(day + timedelta(days=self.settle_days), datetime.min.time())
+            if datetime.fromisoformat(entry["fetched_at"]) >= settled_at:
+                settled[day.isoformat()] = {
+                    name: value for name, value in zip(names, entry["row"]) if isinstance(value, (int, float))
+                }
+        return settled
+
+    def _stale(self, cached: Dict, start: date, end: date) -> List[date]:
+        now = datetime.now()
+        return [
+            day for day in date_range(start, end)
+            if day.isoformat() not in cached or not self._is_fresh(day, cached[day.isoformat()], now)
+        ]
+
+    def get_report(
+        self,
+        channel_id: str,
+        metrics: str,
+        start: date,
+        end: date,
+        fetch: Callable[[date, date], Dict]
+    ) -> Dict:
+        path = self._path(channel_id, metrics)
+        cache = self._load(path)
+        stale = self._stale(cache["days"], start, end)
+
+        if stale:
+            fetched_at = datetime.now().isoformat()
+            for span_start, span_end in contiguous_spans(stale):
+                report = fetch(span_start, span_end)
+                cache["columnHeaders"] = report.get("columnHeaders", cache["columnHeaders"])
+                rows = {row[0]: row for row in report.get("rows", [])}
+                for day in date_range(span_start, span_end):
+                    cache["days"][day.isoformat()] = {"row": rows.get(day.isoformat()), "fetched_at": fetched_at}
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(path, json.dumps(cache, ensure_ascii=False), durable=False)
+
+        rows = [
+            cache["days"][day.isoformat()]["row"]
+            for day in date_range(start, end)
+            if cache["days"].get(day.isoformat(), {}).get("row")
+        ]
+        return {"kind": "youtubeAnalytics#resultTable", "columnHeaders": cache["columnHeaders"], "rows": rows}
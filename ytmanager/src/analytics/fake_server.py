@@ -0,0 +1,137 @@
+import argparse
+import json
+import threading
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 50
+
+
+def _seed(*parts: str) -> int:
+    return zlib.crc32("|".join(parts).encode())
+
+
+def video_row(video_id: str, start: str, end: str) -> List:
+    seed = _seed(video_id, start, end)
+    views = 100 + seed % 5000
+    return [
+        video_id,
+        views,
+        views * (2 + seed % 4),
+        90 + seed % 300,
+        20 + seed % 70,
+        views // (15 + seed % 10),
+        views // (80 + seed % 40),
+        views // (150 + seed % 50),
+    ]
+
+
+def day_row(channel_id: str, day: str) -> List:
+    seed = _seed(channel_id, day)
+    views = 500 + seed % 20000
+    return [
+        day,
+        views,
+        views * (2 + seed % 4),
+        90 + seed % 300,
+        20 + seed % 70,
+        views // (15 + seed % 10),
+        views // (80 + seed % 40),
+        views // (150 + seed % 50),
+        seed % 40,
+        seed % 7,
+    ]
+
+
+def headers(names: List[str]) -> List[Dict]:
+    return [{"name": name, "columnType": "DIMENSION" if i == 0 else "METRIC"} for i, name in enumerate(names)]
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.server.request_log.append((url.path, params))
+        if url.path.endswith("/search"):
+            body = self._search(params)
+        else:
+            body = self._report(params)
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _search(self, params: Dict) -> Dict:
+        offset = int(params.get("pageToken", 0))
+        size = min(int(params.get("maxResults", PAGE_SIZE)), PAGE_SIZE)
+        total = self.server.videos_per_channel
+        items = [
+            {"id": {"kind": "youtube#video", "videoId": f"{params['channelId']}_v{i:05d}"}}
+            for i in range(offset, min(offset + size, total))
+        ]
+        body = {"kind": "youtube#searchListResponse", "items": items}
+        if offset + size < total:
+            body["nextPageToken"] = str(offset + size)
+        return body
+
+    def _report(self, params: Dict) -> Dict:
+        start, end = params["startDate"], params["endDate"]
+        metrics = params["metrics"].split(",")
+        if params.get("dimensions") == "video":
+            video_ids = params.get("filters", "video==").split("==", 1)[1].split(",")
+            rows = [video_row(v, start, end)[:len(metrics) + 1] for v in video_ids if v]
+            return {"columnHeaders": headers(["video", *metrics]), "rows": rows}
+
+        channel_id = params["ids"].split("==", 1)[1]
+        first, last = date.fromisoformat(start), date.fromisoformat(end)
+        days = [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+        rows = [day_row(channel_id, d)[:len(metrics) + 1] for d in days]
+        return {"columnHeaders": headers(["day", *metrics]), "rows": rows}
+
+
+class FakeYouTubeServer:
+    def __init__(self, port: int = 0, videos_per_channel: int = 300):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), FakeYouTubeHandler)
+        self.httpd.videos_per_channel = videos_per_channel
+        self.httpd.request_log = []
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_log(self) -> List:
+        return self.httpd.request_log
+
+    def __enter__(self) -> "FakeYouTubeServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Local fake YouTube Data/Analytics API")
+    parser.add_argument("--port", type=int, default=8765, help="Listen port")
+    parser.add_argument("--videos", type=int, default=300, help="Videos per channel")
+    args = parser.parse_args(argv)
+
+    server = FakeYouTubeServer(args.port, args.videos)
+    print(f"Fake YouTube API on {server.url} (data: {server.url}/youtube/v3, analytics: {server.url}/v2)")
+    server.httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
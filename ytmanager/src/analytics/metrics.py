@@ -1,4 +1,46 @@
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+DEFAULT_COLUMNS = [
+    "day",
+    "views",
+    "estimatedMinutesWatched",
+    "averageViewDuration",
+    "averageViewPercentage",
+    "likes",
+    "comments",
+    "shares",
+    "subscribersGained",
+    "subscribersLost",
+]
+DIMENSIONS = {"day", "video", "month", "country", "insightTrafficSourceType", "deviceType"}
+SERIES = ["views", "watch_time", "average_view_duration", "engagement_rate", "retention_rate", "subscriber_net"]
+PERCENTILES = [50, 90]
+
+Frame = Dict[str, np.ndarray]
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype=float), where=denominator > 0)
+
+
+@dataclass
+class MetricsFrames:
+    series: Frame = field(default_factory=dict)
+    per_day: Frame = field(default_factory=dict)
+    per_video: Frame = field(default_factory=dict)
+    aggregates: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    summary: Dict[str, float] = field(default_factory=dict)
+
+
+def frame_to_rows(frame: Frame) -> List[Dict]:
+    columns = list(frame)
+    return [
+        {c: frame[c][i].item() for c in columns}
+        for i in range(len(frame[columns[0]]) if columns else 0)
+    ]
 
 
 class MetricsCalculator:
@@ -22,24 +64,96 @@ class MetricsCalculator:
     def calculate_retention_rate(average_view_percentage: float) -> float:
         return average_view_percentage / 100.0
 
-    def calculate_all(self, analytics_data: Dict) -> Dict:
-        metrics = {}
+    @staticmethod
+    def columns(analytics_data: Dict) -> Dict[str, np.ndarray]:
         rows = analytics_data.get("rows", [])
-        if not rows:
-            return metrics
-
-        for row in rows:
-            views = row[1]
-            estimated_minutes_watched = row[2]
-            average_view_duration = row[3]
-            average_view_percentage = row[4]
-            likes = row[5]
-            comments = row[6]
-            shares = row[7]
-
-            metrics["watch_time"] = self.calculate_watch_time_minutes(estimated_minutes_watched)
-            metrics["average_view_duration"] = self.calculate_average_view_duration_seconds(average_view_duration)
-            metrics["engagement_rate"] = self.calculate_engagement_rate(views, likes, comments, shares)
-            metrics["retention_rate"] = self.calculate_retention_rate(average_view_percentage)
-
-        return metrics
+        names = [h["name"] for h in analytics_data.get("columnHeaders", [])] or DEFAULT_COLUMNS[:len(rows[0])]
+        dimension_count = sum(1 for name in names if name in DIMENSIONS)
+        numeric = np.array([row[dimension_count:] for row in rows], dtype=float).reshape(len(rows), -1)
+        columns = {name: np.array([row[i] for row in rows]) for i, name in enumerate(names[:dimension_count])}
+        columns.update({name: numeric[:, i] for i, name in enumerate(names[dimension_count:])})
+        return columns
+
+    @staticmethod
+    def series(columns: Dict[str, np.ndarray]) -> Frame:
+        zeros = np.zeros(len(next(iter(columns.values()))))
+        views = columns.get("views", zeros)
+        engagements = columns.get("likes", zeros) + columns.get("comments", zeros) + columns.get("shares", zeros)
+        frame = {name: columns[name] for name in columns if name in DIMENSIONS}
+        frame.update({
+            "views": views,
+            "engagements": engagements,
+            "watch_time": columns.get("estimatedMinutesWatched", zeros),
+            "average_view_duration": columns.get("averageViewDuration", zeros),
+            "engagement_rate": _ratio(engagements, views),
+            "retention_rate": columns.get("averageViewPercentage", zeros) / 100.0,
+            "subscriber_net": columns.get("subscribersGained", zeros) - columns.get("subscribersLost", zeros),
+        })
+        return frame
+
+    @staticmethod
+    def group(series: Frame, key: str) -> Frame:
+        if key not in series:
+            return {}
+        keys, inverse = np.unique(series[key], return_inverse=True)
+        size = len(keys)
+        views = np.bincount(inverse, weights=series["views"], minlength=size)
+        engagements = np.bincount(inverse, weights=series["engagements"], minlength=size)
+        weighted = {
+            name: _ratio(np.bincount(inverse, weights=series[name] * series["views"], minlength=size), views)
+            for name in ("average_view_duration", "retention_rate")
+        }
+        return {
+            key: keys,
+            "views": views,
+            "watch_time": np.bincount(inverse, weights=series["watch_time"], minlength=size),
+            "average_view_duration": weighted["average_view_duration"],
+            "engagement_rate": _ratio(engagements, views),
+            "retention_rate": weighted["retention_rate"],
+            "subscriber_net": np.bincount(inverse, weights=series["subscriber_net"], minlength=size),
+        }
+
+    @staticmethod
+    def aggregate(series: Frame) -> Dict[str, Dict[str, float]]:
+        views = series["views"]
+        total_views = views.sum()
+        aggregates = {}
+        for name in SERIES:
+            values = series[name]
+            stats = {
+                "sum": float(values.sum()),
+                "mean": float(values.mean()),
+                "weighted_mean": float((values * views).sum() / total_views) if total_views > 0 else 0.0,
+            }
+            for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                stats[f"p{q}"] = float(value)
+            aggregates[name] = stats
+        return aggregates
+
+    def calculate_frames(self, analytics_data: Dict) -> MetricsFrames:
+        if not analytics_data.get("rows"):
+            return MetricsFrames()
+
+        series = self.series(self.columns(analytics_data))
+        aggregates = self.aggregate(series)
+        total_views = series["views"].sum()
+
+        summary = {
+            "views": aggregates["views"]["sum"],
+            "watch_time": aggregates["watch_time"]["sum"],
+            "average_view_duration": aggregates["average_view_duration"]["weighted_mean"],
+            "engagement_rate": float(series["engagements"].sum() / total_views) if total_views > 0 else 0.0,
+            "retention_rate": aggregates["retention_rate"]["weighted_mean"],
+            "subscriber_net": aggregates["subscriber_net"]["sum"],
+        }
+
+        return MetricsFrames(
+            series=series,
+            per_day=self.group(series, "day"),
+            per_video=self.group(series, "video"),
+            aggregates=aggregates,
+            summary=summary,
+        )
+
+    def calculate_all(self, analytics_data: Dict) -> Dict:
+        return self.calculate_frames(analytics_data).summary
@@ -0,0 +1,175 @@
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+from zoneinfo import ZoneInfo
+
+from ..storage.files import FileLock, atomic_write_text
+from ..telemetry import TELEMETRY
+
+T = TypeVar("T")
+
+QUOTA_COSTS = {
+    "youtube.search.list": 100,
+    "youtube.videos.list": 1,
+    "youtube.channels.list": 1,
+    "youtube.playlistItems.list": 1,
+    "youtubeAnalytics.reports.query": 1,
+}
+DEFAULT_COST = 1
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRYABLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError", "internalError"}
+EXHAUSTED_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+class QuotaExhausted(RuntimeError):
+    pass
+
+
+def error_status(exc: Exception) -> tuple[Optional[int], str]:
+    response = getattr(exc, "resp", None) or getattr(exc, "response", None)
+    status = getattr(response, "status", None) or getattr(response, "status_code", None)
+    content = getattr(exc, "content", None) or getattr(response, "content", None) or b""
+    match = re.search(rb'"reason"\s*:\s*"(\w+)"', content if isinstance(content, bytes) else content.encode())
+    return (int(status) if status else None), (match.group(1).decode() if match else "")
+
+
+class TokenBucket:
+    def __init__(self, rate: float = 5.0, capacity: float = 10.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class QuotaLedger:
+    def __init__(self, path: str = "data/quota_ledger.json", daily_limit: int = 10000, keep_days: int = 30):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.daily_limit = daily_limit
+        self.keep_days = keep_days
+        self._thread_lock = threading.Lock()
+        self._file_lock = FileLock(str(self.path.with_suffix(".lock")))
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+    @TELEMETRY.timed("storage.load", backend="quota_ledger")
+    def _load(self) -> Dict:
+        if self.path.exists():
+            with open(self.path) as f:
+                return json.load(f)
+        return {}
+
+    def usage(self, day: Optional[str] = None) -> Dict:
+        return self._load().get(day or self.today(), {"used": 0, "calls": 0, "retries": 0, "by_method": {}})
+
+    def remaining(self) -> int:
+        return max(self.daily_limit - self.usage()["used"], 0)
+
+    @TELEMETRY.timed("storage.save", backend="quota_ledger")
+    def record(self, method: str, cost: int, retries: int = 0):
+        with self._thread_lock, self._file_lock:
+            ledger = self._load()
+            day = self.today()
+            entry = ledger.setdefault(day, {"used": 0, "calls": 0, "retries": 0, "by_method": {}})
+            entry["used"] += cost
+            entry["calls"] += 1
+            entry["retries"] += retries
+            entry["by_method"][method] = entry["by_method"].get(method, 0) + cost
+            cutoff = (datetime.fromisoformat(day) - timedelta(days=self.keep_days)).date().isoformat()
+            ledger = {d: v for d, v in ledger.items() if d >= cutoff}
+            atomic_write_text(self.path, json.dumps(ledger, indent=2), durable=False)
+
+    def mark_exhausted(self):
+        self.record("quotaExceeded", self.remaining())
+
+
+class QuotaGuard:
+    def __init__(
+        self,
+        ledger: Optional[QuotaLedger] = None,
+        bucket: Optional[TokenBucket] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 64.0
+    ):
+        self.ledger = ledger or QuotaLedger()
+        self.bucket = bucket or TokenBucket()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def cost(method: str) -> int:
+        return QUOTA_COSTS.get(method, DEFAULT_COST)
+
+    def can_afford(self, method: str, calls: int = 1) -> bool:
+        return self.cost(method) * calls <= self.ledger.remaining()
+
+    def execute(self, method: str, call: Callable[[], T]) -> T:
+        cost = self.cost(method)
+        if cost > self.ledger.remaining():
+            raise QuotaExhausted(f"{method} needs {cost} units, {self.ledger.remaining()} left today")
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                result = call()
+            except Exception as exc:
+                status, reason = error_status(exc)
+                if reason in EXHAUSTED_REASONS:
+                    self.ledger.mark_exhausted()
+                    raise QuotaExhausted(f"{method}: {reason}") from exc
+                network_error = status is None and isinstance(exc, OSError)
+                retryable = network_error or status in RETRYABLE_STATUSES or reason in RETRYABLE_REASONS
+                if not retryable or attempt == self.max_retries:
+                    raise
+                TELEMETRY.count("youtube_api.retries", method=method, status=status or reason or "network")
+                self._backoff(attempt)
+                continue
+            self.ledger.record(method, cost, retries=attempt)
+            TELEMETRY.count("youtube_api.quota_units", cost, method=method)
+            return result
+
+    def _backoff(self, attempt: int):
+        time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+    def metrics(self) -> Dict:
+        usage = self.ledger.usage()
+        return {
+            "date": self.ledger.today(),
+            "daily_limit": self.ledger.daily_limit,
+            "used": usage["used"],
+            "remaining": self.ledger.remaining(),
+            "calls": usage["calls"],
+            "retries": usage["retries"],
+            "by_method": usage["by_method"],
+        }
+
+
+def main(argv: Optional[List[str]] = None):
+    print(json.dumps(QuotaGuard().metrics(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
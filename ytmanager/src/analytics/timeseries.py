@@ -0,0 +1,173 @@
+import json
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from ..storage.files import atomic_write_text
+from .metrics import MetricsFrames
+
+WINDOWS = (7, 28, 90)
+MIN_CAPACITY = 128
+
+
+class MetricSeries:
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.meta_path = self.path / "meta.json"
+        self.meta = self._load_meta()
+        self.values = self._open("values")
+        self.prefix_sum = self._open("prefix_sum")
+        self.prefix_count = self._open("prefix_count")
+
+    def _load_meta(self) -> Dict:
+        if self.meta_path.exists():
+            with open(self.meta_path) as f:
+                return json.load(f)
+        return {"origin": None, "length": 0, "capacity": 0, "metrics": []}
+
+    def _save_meta(self):
+        atomic_write_text(self.meta_path, json.dumps(self.meta), durable=False)
+
+    def _open(self, name: str) -> Optional[np.ndarray]:
+        file = self.path / f"{name}.npy"
+        return open_memmap(file, mode="r+") if file.exists() else None
+
+    @property
+    def metrics(self) -> List[str]:
+        return self.meta["metrics"]
+
+    @property
+    def origin(self) -> Optional[date]:
+        return date.fromisoformat(self.meta["origin"]) if self.meta["origin"] else None
+
+    @property
+    def last_day(self) -> Optional[date]:
+        return self.origin + timedelta(days=self.meta["length"] - 1) if self.meta["length"] else None
+
+    def _index(self, day: date) -> int:
+        return (day - self.origin).days
+
+    def _resize(self, origin: date, capacity: int, metrics: List[str]):
+        shift = (self.origin - origin).days if self.origin else 0
+        values = np.full((len(metrics), capacity), np.nan)
+        if self.values is not None:
+            rows = [metrics.index(m) for m in self.metrics]
+            values[rows, shift:shift + self.meta["length"]] = self.values[:, :self.meta["length"]]
+        length = shift + self.meta["length"]
+
+        self.meta.update({"origin": origin.isoformat(), "length": length, "capacity": capacity, "metrics": metrics})
+        self.values = self._write("values", values)
+        present = ~np.isnan(values)
+        prefix_sum = np.zeros((len(metrics), capacity + 1))
+        prefix_count = np.zeros((len(metrics), capacity + 1))
+        prefix_sum[:, 1:] = np.cumsum(np.where(present, values, 0.0), axis=1)
+        prefix_count[:, 1:] = np.cumsum(present, axis=1)
+        self.prefix_sum = self._write("prefix_sum", prefix_sum)
+        self.prefix_count = self._write("prefix_count", prefix_count)
+        self._save_meta()
+
+    def _write(self, name: str, array: np.ndarray) -> np.ndarray:
+        mapped = open_memmap(self.path / f"{name}.npy", mode="w+", dtype=np.float64, shape=array.shape)
+        mapped[:] = array
+        mapped.flush()
+        return mapped
+
+    def _ensure(self, day: date, metrics: List[str]):
+        new_metrics = self.metrics + [m for m in metrics if m not in self.metrics]
+        origin = min(self.origin or day, day)
+        needed = (max(self.last_day or day, day) - origin).days + 1
+        capacity = self.meta["capacity"]
+        if origin != self.origin or needed > capacity or new_metrics != self.metrics:
+            if needed > capacity:
+                capacity = max(MIN_CAPACITY, capacity * 2, needed)
+            self._resize(origin, capacity, new_metrics)
+
+    def put(self, day: date, metrics: Dict[str, float]):
+        self._ensure(day, list(metrics))
+        i = self._index(day)
+        length = self.meta["length"]
+        if i >= length:
+            self.prefix_sum[:, length + 1:i + 2] = self.prefix_sum[:, length:length + 1]
+            self.prefix_count[:, length + 1:i + 2] = self.prefix_count[:, length:length + 1]
+            self.meta["length"] = length = i + 1
+            self._save_meta()
+
+        rows = np.array([self.metrics.index(m) for m in metrics])
+        new = np.array(list(metrics.values()), dtype=float)
+        old = self.values[rows, i]
+        delta_sum = np.nan_to_num(new) - np.nan_to_num(old)
+        delta_count = (~np.isnan(new)).astype(float) - (~np.isnan(old)).astype(float)
+        self.values[rows, i] = new
+        self.prefix_sum[rows, i + 1:length + 1] += delta_sum[:, None]
+        self.prefix_count[rows, i + 1:length + 1] += delta_count[:, None]
+
+    def flush(self):
+        for array in (self.values, self.prefix_sum, self.prefix_count):
+            if array is not None:
+                array.flush()
+
+    def _bounds(self, days: int, end: Optional[date]) -> Tuple[int, int]:
+        end_index = min(self._index(end or self.last_day), self.meta["length"] - 1)
+        return max(end_index - days + 1, 0), end_index + 1
+
+    def window(self, days: int, end: Optional[date] = None) -> Dict[str, Dict[str, float]]:
+        if not self.meta["length"]:
+            return {}
+        start, stop = self._bounds(days, end)
+        if stop <= 0:
+            return {}
+        sums = self.prefix_sum[:, stop] - self.prefix_sum[:, start]
+        counts = self.prefix_count[:, stop] - self.prefix_count[:, start]
+        return {
+            metric: {
+                "sum": float(sums[i]),
+                "count": int(counts[i]),
+                "mean": float(sums[i] / counts[i]) if counts[i] else 0.0,
+            }
+            for i, metric in enumerate(self.metrics)
+        }
+
+    def range(self, start: date, end: date) -> Dict[str, np.ndarray]:
+        first = max(self._index(start), 0)
+        last = min(self._index(end), self.meta["length"] - 1)
+        return {metric: self.values[i, first:last + 1] for i, metric in enumerate(self.metrics)}
+
+
+class MetricsStore:
+    def __init__(self, root: str = "data/metrics_ts"):
+        self.root = Path(root)
+        self._series: Dict[str, MetricSeries] = {}
+
+    def series(self, key: str) -> MetricSeries:
+        if key not in self._series:
+            self._series[key] = MetricSeries(self.root / key)
+        return self._series[key]
+
+    def ingest(self, key: str, day: date, metrics: Dict[str, float]):
+        series = self.series(key)
+        series.put(day, metrics)
+        series.flush()
+
+    def ingest_frames(self, key: str, frames: MetricsFrames, day: Optional[date] = None):
+        series = self.series(key)
+        per_day = frames.per_day
+        if not per_day:
+            if frames.summary:
+                series.put(day or date.today(), frames.summary)
+            series.flush()
+            return
+        metrics = [name for name in per_day if name != "day"]
+        for i, day_key in enumerate(per_day["day"]):
+            series.put(date.fromisoformat(str(day_key)), {name: float(per_day[name][i]) for name in metrics})
+        series.flush()
+
+    def window(self, key: str, days: int, end: Optional[date] = None) -> Dict[str, float]:
+        return {metric: stats["mean"] for metric, stats in self.series(key).window(days, end).items() if stats["count"]}
+
+    def windows(self, key: str, end: Optional[date] = None) -> Dict[int, Dict[str, Dict[str, float]]]:
+        series = self.series(key)
+        return {days: series.window(days, end) for days in WINDOWS}
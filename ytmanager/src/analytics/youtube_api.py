@@ -1,14 +1,62 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from datetime import datetime, timedelta
-from typing import Dict, List
+
+from ..telemetry import TELEMETRY
+from .cache import CHANNEL_METRICS, AnalyticsCache
+from .quota import QuotaGuard
+
+if TYPE_CHECKING:
+    from google_auth_httplib2 import AuthorizedHttp
+
+    from .bulk import BulkAnalyticsFetcher
 
 
 class YouTubeAPI:
-    def __init__(self, credentials_path: str):
+    def __init__(
+        self,
+        credentials_path: str,
+        cache: Optional[AnalyticsCache] = None,
+        quota: Optional[QuotaGuard] = None
+    ):
+        self.cache = cache
+        self.quota = quota or QuotaGuard()
         self.credentials = Credentials.from_authorized_user_file(credentials_path)
-        self.youtube = build("youtube", "v3", credentials=self.credentials)
-        self.youtube_analytics = build("youtubeAnalytics", "v2", credentials=self.credentials)
+        self._services: Dict[str, Any] = {}
+        self._services_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _service(self, name: str, version: str) -> Any:
+        with self._services_lock:
+            if name not in self._services:
+                from googleapiclient.discovery import build
+
+                self._services[name] = build(
+                    name, version, credentials=self.credentials, static_discovery=True, cache_discovery=False
+                )
+            return self._services[name]
+
+    @property
+    def youtube(self) -> Any:
+        return self._service("youtube", "v3")
+
+    @property
+    def youtube_analytics(self) -> Any:
+        return self._service("youtubeAnalytics", "v2")
+
+    def _http(self) -> "AuthorizedHttp":
+        if not hasattr(self._local, "http"):
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
+
+            self._local.http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+        return self._local.http
+
+    def _execute(self, method: str, request) -> Dict:
+        with TELEMETRY.span("youtube_api.execute", method=method):
+            return self.quota.execute(method, lambda: request.execute(http=self._http()))
 
     def get_channel_videos(self, channel_id: str, max_results: int = 50) -> List[Dict]:
         request = self.youtube.search().list(
@@ -18,9 +66,29 @@ class YouTubeAPI:
             order="date",
             type="video"
         )
-        response = request.execute()
+        response = self._execute("youtube.search.list", request)
         return response.get("items", [])
 
+    def get_all_channel_videos(self, channel_id: str, limit: Optional[int] = None) -> List[Dict]:
+        search = self.youtube.search()
+        request = search.list(part="id,snippet", channelId=channel_id, maxResults=50, order="date", type="video")
+        items = []
+        while request is not None and not (limit and len(items) >= limit):
+            response = self._execute("youtube.search.list", request)
+            items.extend(response.get("items", []))
+            request = search.list_next(request, response)
+        return items[:limit] if limit else items
+
+    def bulk_fetcher(self, max_workers: int = 8, chunk_size: int = 200) -> "BulkAnalyticsFetcher":
+        from .bulk import BulkAnalyticsFetcher
+
+        return BulkAnalyticsFetcher.from_credentials(
+            self.credentials,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+            quota=self.quota
+        )
+
     def get_video_analytics(self, video_id: str, start_date: datetime, end_date: datetime) -> Dict:
         request = self.youtube_analytics.reports().query(
             ids=f"channel==MINE",
@@ -30,18 +98,29 @@ class YouTubeAPI:
             dimensions="video",
             filters=f"video=={video_id}"
         )
-        response = request.execute()
+        response = self._execute("youtubeAnalytics.reports.query", request)
         return response
 
     def get_channel_analytics(self, channel_id: str, lookback_days: int = 7) -> Dict:
-        end_date = datetime.now()
+        end_date = datetime.now().date()
         start_date = end_date - timedelta(days=lookback_days)
+        if self.cache:
+            return self.cache.get_report(
+                channel_id,
+                CHANNEL_METRICS,
+                start_date,
+                end_date,
+                lambda start, end: self._query_channel_days(channel_id, start, end)
+            )
+        return self._query_channel_days(channel_id, start_date, end_date)
+
+    def _query_channel_days(self, channel_id: str, start_date: date, end_date: date) -> Dict:
         request = self.youtube_analytics.reports().query(
             ids=f"channel=={channel_id}",
             startDate=start_date.strftime("%Y-%m-%d"),
             endDate=end_date.strftime("%Y-%m-%d"),
-            metrics="views,estimatedMinutesWatched,averageViewDuration,averageViewPercentage,likes,comments,shares,subscribersGained,subscribersLost",
+            metrics=CHANNEL_METRICS,
             dimensions="day"
         )
-        response = request.execute()
+        response = self._execute("youtubeAnalytics.reports.query", request)
         return response
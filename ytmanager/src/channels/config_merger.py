@@ -0,0 +1,16 @@
+from typing import Dict, List
+
+
+def deep_merge(base: Dict, override: Dict) -> Dict:
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def parents(node: Dict) -> List[str]:
+    extends = node.get("extends") or []
+    return [extends] if isinstance(extends, str) else list(extends)
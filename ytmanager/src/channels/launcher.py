@@ -1,27 +1,188 @@
+import hashlib
+import json
+import os
+import shlex
 import subprocess
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
+
+from ..optimizer.ab_test import ABTest
+from ..optimizer.prompt_tuner import PromptTuner
+from ..scheduler.series_manager import SeriesManager
+from ..storage.yaml_cache import dump_yaml
+from ..telemetry import TELEMETRY
+from .output import RunOutput
+from .run_index import RunIndex
+
+DEFAULT_COMMAND = "uv run python -m src.main"
 
 
 class Launcher:
-    def __init__(self, project_path: str):
+    def __init__(
+        self,
+        project_path: str,
+        channel: Optional[str] = None,
+        experiments: Optional[ABTest] = None,
+        overlay_dir: str = "data/prompt_overlays",
+        index: Optional[RunIndex] = None,
+        series: Optional[SeriesManager] = None,
+        log_dir: str = "data/logs/runs",
+        command: str = DEFAULT_COMMAND
+    ):
         self.project_path = Path(project_path)
+        self.runs_dir = self.project_path / "runs"
+        self.channel = channel
+        self.experiments = experiments
+        self.overlay_dir = Path(overlay_dir)
+        self.index = index or RunIndex()
+        self.series = series
+        self.log_dir = Path(log_dir)
+        self.command = command
+        self.output: Optional[RunOutput] = None
+        self.last_assignment: Dict[str, str] = {}
+        self.last_run: Optional[Dict] = None
+
+    def assign(self) -> Dict[str, str]:
+        if not self.experiments or not self.channel:
+            return {}
+        with self.experiments.transaction():
+            return self.experiments.assign(self.channel)
 
-    def run(self, news_query: Optional[str] = None, dry_run: bool = False) -> subprocess.CompletedProcess:
-        cmd = ["uv", "run", "python", "-m", "src.main"]
+    def _write_overlay(self, assignment: Dict[str, str]) -> Path:
+        tuner = PromptTuner(str(self.project_path / "config" / "prompts.yaml"))
+        prompts = tuner.render(self.experiments.patches(assignment))
+        text = dump_yaml(prompts)
+        path = self.overlay_dir / self.channel / f"{hashlib.sha256(text.encode()).hexdigest()[:16]}.yaml"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        return path.resolve()
+
+    def prepare(
+        self,
+        news_query: Optional[str] = None,
+        dry_run: bool = False,
+        assignment: Optional[Dict[str, str]] = None,
+        series_id: Optional[str] = None,
+        episode: Optional[int] = None
+    ) -> Dict:
+        cmd = shlex.split(self.command)
         if news_query:
             cmd.extend(["--news-query", news_query])
         if dry_run:
             cmd.append("--dry-run")
-        return subprocess.run(cmd, cwd=self.project_path, capture_output=True, text=True)
+        self.last_assignment = self.assign() if assignment is None else assignment
+        started = datetime.now()
+        run_id = f"{self.channel or self.project_path.name}_{started:%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+        env = {
+            **os.environ,
+            "YTMANAGER_RUN_ID": run_id,
+            "YTMANAGER_RUN_DIR": str((self.runs_dir / run_id).resolve()),
+        }
+        if self.last_assignment:
+            env["YTMANAGER_PROMPTS_PATH"] = str(self._write_overlay(self.last_assignment))
+            env["YTMANAGER_ASSIGNMENT"] = json.dumps(self.last_assignment)
+        if series_id and self.series and episode is None:
+            episode = self.series.get_next_episode(series_id)
+        return {
+            "run_id": run_id,
+            "cmd": cmd,
+            "env": env,
+            "started": started,
+            "dry_run": dry_run,
+            "assignment": self.last_assignment,
+            "series_id": series_id,
+            "episode": episode,
+        }
+
+    @TELEMETRY.timed("launcher.run")
+    def run(
+        self,
+        news_query: Optional[str] = None,
+        dry_run: bool = False,
+        assignment: Optional[Dict[str, str]] = None,
+        series_id: Optional[str] = None,
+        episode: Optional[int] = None,
+        stream: bool = False,
+        on_progress: Optional[Callable[[Dict], None]] = None
+    ) -> subprocess.CompletedProcess:
+        launch = self.prepare(news_query, dry_run, assignment, series_id, episode)
+        output = None
+        with TELEMETRY.span("launcher.subprocess", channel=self.channel, stream=stream):
+            if stream:
+                output = self._open_output(launch["started"], on_progress)
+                result = self._stream(launch["cmd"], launch["env"], output)
+            else:
+                result = subprocess.run(
+                    launch["cmd"], cwd=self.project_path, capture_output=True, text=True, env=launch["env"]
+                )
+        self.finish(launch, result.returncode, output)
+        return result
+
+    def _open_output(self, started: datetime, on_progress: Optional[Callable[[Dict], None]]) -> RunOutput:
+        name = self.channel or self.project_path.name
+        self.output = RunOutput(str(self.log_dir / name / f"{started:%Y%m%d_%H%M%S_%f}.log"), on_progress=on_progress)
+        return self.output
+
+    def _stream(self, cmd: list, env: Optional[Dict], output: RunOutput) -> subprocess.CompletedProcess:
+        returncode = -1
+        try:
+            process = subprocess.Popen(
+                cmd,
+                cwd=self.project_path,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace"
+            )
+            for line in process.stdout:
+                output.feed(line)
+            returncode = process.wait()
+        finally:
+            output.close(returncode)
+        return subprocess.CompletedProcess(cmd, returncode, stdout=output.tail(), stderr="")
+
+    def finish(self, launch: Dict, exit_code: int, output: Optional[RunOutput] = None) -> Dict:
+        finished = datetime.now()
+        started = launch["started"]
+        series_id = launch["series_id"]
+        outputs = {file.stem: str(file.resolve()) for file in (self.runs_dir / launch["run_id"]).glob("*.json")}
+        TELEMETRY.count("launcher.runs", channel=self.channel, status="ok" if exit_code == 0 else "failed")
+
+        run = self.index.record({
+            "run_id": launch["run_id"],
+            "channel": self.channel,
+            "project_path": str(self.project_path.resolve()),
+            "started_at": started.isoformat(),
+            "finished_at": finished.isoformat(),
+            "duration_seconds": (finished - started).total_seconds(),
+            "exit_code": exit_code,
+            "dry_run": launch["dry_run"],
+            "outputs": outputs,
+            "assignment": launch["assignment"],
+            "series": {"series_id": series_id, "episode": launch["episode"]} if series_id else None,
+            "log": str(output.log_path) if output else None
+        })
+        if series_id and self.series and exit_code == 0 and not launch["dry_run"]:
+            self.series.add_episode(series_id, launch["run_id"], launch["episode"], {"outputs": sorted(outputs)})
+        self.last_run = run
+        return run
 
     def get_latest_run_id(self) -> Optional[str]:
-        runs_dir = self.project_path / "runs"
-        runs = sorted(runs_dir.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+        run = self.index.latest(self.channel, str(self.project_path.resolve()))
+        if run:
+            return run["run_id"]
+        runs = sorted(self.runs_dir.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
         return runs[0].name if runs else None
 
     def get_run_outputs(self, run_id: str) -> dict:
-        run_dir = self.project_path / "runs" / run_id
+        run = self.index.get(run_id)
+        if run:
+            return self.index.outputs(run_id)
+        run_dir = self.runs_dir / run_id
         outputs = {}
         for file in run_dir.glob("*.json"):
             outputs[file.stem] = file
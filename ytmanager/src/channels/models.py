@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+
+class AnalyticsConfig(BaseModel):
+    enabled: bool = True
+    metrics: list[str]
+    lookback_days: int = 7
+
+
+class OptimizerConfig(BaseModel):
+    enabled: bool = True
+    auto_tune: bool = False
+    ab_test_ratio: float = 0.1
+    feedback_interval: str = "daily"
+    min_sample_size: int = 10
+
+
+class ChannelConfig(BaseModel):
+    project_path: str
+    youtube_channel_id: str
+    schedule: str
+    analytics: AnalyticsConfig
+    optimizer: OptimizerConfig
+    description: str = ""
@@ -0,0 +1,112 @@
+import json
+import re
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Pattern
+
+from ..storage.files import atomic_write_text
+
+PROGRESS_PATTERNS: List[Pattern] = [
+    re.compile(r"\[?(?:step|STEP|Step)\s+(?P<step>\d+)\s*/\s*(?P<total>\d+)\]?\s*:?\s*(?P<stage>.*)"),
+    re.compile(r"(?:progress|PROGRESS|Progress)\s*[:=]\s*(?P<percent>\d+(?:\.\d+)?)\s*%?"),
+    re.compile(r"^\s*(?P<percent>\d{1,3}(?:\.\d+)?)%\|"),
+]
+
+
+class RunOutput:
+    def __init__(
+        self,
+        log_path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 3,
+        buffer_lines: int = 200,
+        patterns: Optional[List[Pattern]] = None,
+        on_progress: Optional[Callable[[Dict], None]] = None
+    ):
+        self.log_path = Path(log_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.status_path = self.log_path.with_suffix(".status.json")
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.buffer = deque(maxlen=buffer_lines)
+        self.patterns = PROGRESS_PATTERNS if patterns is None else patterns
+        self.on_progress = on_progress
+        self.status = {
+            "state": "running",
+            "log": str(self.log_path),
+            "lines": 0,
+            "step": None,
+            "total": None,
+            "percent": None,
+            "stage": None,
+            "started_at": datetime.now().isoformat(),
+            "updated_at": None,
+        }
+        self._file = open(self.log_path, "a", buffering=1, errors="replace")
+        self._size = self.log_path.stat().st_size
+        self._save_status()
+
+    def feed(self, line: str):
+        if not line.endswith("\n"):
+            line += "\n"
+        self._write(line)
+        self.buffer.append(line)
+        self.status["lines"] += 1
+        progress = self._parse(line)
+        if progress:
+            self.status.update(progress)
+            self.status["updated_at"] = datetime.now().isoformat()
+            self._save_status()
+            if self.on_progress:
+                self.on_progress(self.status)
+
+    def _parse(self, line: str) -> Optional[Dict]:
+        for pattern in self.patterns:
+            match = pattern.search(line)
+            if not match:
+                continue
+            groups = {key: value for key, value in match.groupdict().items() if value}
+            progress = {}
+            if "step" in groups:
+                progress["step"] = int(groups["step"])
+                progress["total"] = int(groups["total"])
+                total = progress["total"]
+                progress["percent"] = round(100 * progress["step"] / total, 1) if total else None
+            if "percent" in groups:
+                progress["percent"] = float(groups["percent"])
+            if groups.get("stage", "").strip():
+                progress["stage"] = groups["stage"].strip()
+            return progress
+        return None
+
+    def _write(self, line: str):
+        size = len(line.encode(errors="replace"))
+        if self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._file.write(line)
+        self._size += size
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = self.log_path.with_name(f"{self.log_path.name}.{i}")
+            if source.exists():
+                source.replace(self.log_path.with_name(f"{self.log_path.name}.{i + 1}"))
+        if self.backups:
+            self.log_path.replace(self.log_path.with_name(f"{self.log_path.name}.1"))
+        self._file = open(self.log_path, "w", buffering=1, errors="replace")
+        self._size = 0
+
+    def _save_status(self):
+        atomic_write_text(self.status_path, json.dumps(self.status, ensure_ascii=False), durable=False)
+
+    def tail(self) -> str:
+        return "".join(self.buffer)
+
+    def close(self, returncode: int):
+        self._file.close()
+        self.status["state"] = "completed" if returncode == 0 else "failed"
+        self.status["exit_code"] = returncode
+        self.status["updated_at"] = datetime.now().isoformat()
+        self._save_status()
@@ -1,46 +1,94 @@
 from pathlib import Path
-from typing import Dict
-import yaml
-from pydantic import BaseModel
+from typing import TYPE_CHECKING, Dict, List, Literal, Set, Tuple, get_args
+from .config_merger import deep_merge, parents
+from ..storage.yaml_cache import file_hash, load_yaml
 
+if TYPE_CHECKING:
+    from .models import ChannelConfig
 
-class AnalyticsConfig(BaseModel):
-    enabled: bool = True
-    metrics: list[str]
-    lookback_days: int = 7
+StorageBackend = Literal["json", "sqlite"]
 
 
-class OptimizerConfig(BaseModel):
-    enabled: bool = True
-    auto_tune: bool = False
-    ab_test_ratio: float = 0.1
-    feedback_interval: str = "daily"
-    min_sample_size: int = 10
-
-
-class ChannelConfig(BaseModel):
-    project_path: str
-    youtube_channel_id: str
-    schedule: str
-    analytics: AnalyticsConfig
-    optimizer: OptimizerConfig
-    description: str = ""
+class StorageConfig:
+    def __init__(self, backend: StorageBackend = "json", sqlite_path: str = "data/ytmanager.db"):
+        if backend not in get_args(StorageBackend):
+            raise ValueError(f"storage.backend must be one of {get_args(StorageBackend)}, got {backend!r}")
+        self.backend = backend
+        self.sqlite_path = sqlite_path
 
 
 class ChannelRegistry:
     def __init__(self, config_path: str = "config/channels.yaml"):
         self.config_path = Path(config_path)
-        self.channels: Dict[str, ChannelConfig] = {}
+        self.channels: Dict[str, "ChannelConfig"] = {}
+        self.nodes: Dict[str, Dict] = {}
+        self.channel_names: List[str] = []
+        self.storage = StorageConfig()
+        self._resolved: Dict[str, Dict] = {}
+        self._digest = None
         self.load()
 
+    def _read(self) -> Dict[str, Dict]:
+        data, self._digest = load_yaml(str(self.config_path))
+        self.storage = StorageConfig(**(data.get("storage") or {}))
+        templates = data.get("templates") or {}
+        channels = data["channels"]
+        overlap = set(templates) & set(channels)
+        if overlap:
+            raise ValueError(f"names used for both templates and channels: {sorted(overlap)}")
+        self.channel_names = list(channels)
+        return {**templates, **channels}
+
     def load(self):
-        with open(self.config_path) as f:
-            data = yaml.safe_load(f)
-        for name, config in data["channels"].items():
-            self.channels[name] = ChannelConfig(**config)
+        self.nodes = self._read()
+        self._resolved = {}
+        self.channels = {}
+
+    def reload(self) -> List[str]:
+        if file_hash(str(self.config_path)) == self._digest:
+            return []
+        previous = self.nodes
+        previous_channels = set(self.channel_names)
+        self.nodes = self._read()
+        changed = {name for name in set(previous) | set(self.nodes) if previous.get(name) != self.nodes.get(name)}
+        stale = {name for name in set(self._resolved) | set(self.nodes) if self._lineage(name) & changed}
+        for name in stale:
+            self._resolved.pop(name, None)
+            self.channels.pop(name, None)
+        return sorted(name for name in stale | changed if name in self.channel_names or name in previous_channels)
+
+    def _lineage(self, name: str) -> Set[str]:
+        seen = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            pending.extend(parents(self.nodes.get(current, {})))
+        return seen
+
+    def resolve(self, name: str, _chain: Tuple[str, ...] = ()) -> Dict:
+        if name in self._resolved:
+            return self._resolved[name]
+        if name in _chain:
+            raise ValueError(f"config inheritance cycle: {' -> '.join(_chain + (name,))}")
+        node = self.nodes[name]
+        merged = {}
+        for parent in parents(node):
+            merged = deep_merge(merged, self.resolve(parent, _chain + (name,)))
+        merged = deep_merge(merged, {key: value for key, value in node.items() if key != "extends"})
+        self._resolved[name] = merged
+        return merged
+
+    def get(self, name: str) -> "ChannelConfig":
+        from .models import ChannelConfig
 
-    def get(self, name: str) -> ChannelConfig:
+        if name not in self.channels:
+            if name not in self.channel_names:
+                raise KeyError(name)
+            self.channels[name] = ChannelConfig(**self.resolve(name))
         return self.channels[name]
 
     def list(self) -> list[str]:
-        return list(self.channels.keys())
+        return list(self.channel_names)
@@ -0,0 +1,88 @@
+import bisect
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..storage.base import RecordStore
+from ..storage.journal import JournalStore
+
+
+class RunIndex:
+    def __init__(self, index_file: str = "data/run_index.json", storage: Optional[RecordStore] = None):
+        self.index_file = Path(index_file)
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        self.storage = storage or JournalStore(str(self.index_file), key_field="run_id")
+        self._order: List[Tuple[str, str]] = []
+        self._by_channel: Dict[str, List[Tuple[str, str]]] = {}
+        with self.storage.lock():
+            self.storage.load()
+            self._reindex()
+
+    @property
+    def runs(self) -> Dict[str, Dict]:
+        return self.storage.records
+
+    def _reindex(self):
+        self._order = sorted((run["started_at"], run["run_id"]) for run in self.runs.values())
+        self._by_channel = {}
+        for entry in self._order:
+            self._by_channel.setdefault(self.runs[entry[1]]["channel"], []).append(entry)
+
+    def _index(self, run: Dict):
+        entry = (run["started_at"], run["run_id"])
+        bisect.insort(self._order, entry)
+        bisect.insort(self._by_channel.setdefault(run["channel"], []), entry)
+
+    def _unindex(self, run: Dict):
+        entry = (run["started_at"], run["run_id"])
+        for entries in (self._order, self._by_channel.get(run["channel"], [])):
+            i = bisect.bisect_left(entries, entry)
+            if i < len(entries) and entries[i] == entry:
+                entries.pop(i)
+
+    def _sync(self):
+        changes = self.storage.refresh()
+        if changes is None:
+            self._reindex()
+            return
+        for run_id, previous in changes.items():
+            if previous:
+                self._unindex(previous)
+            if run_id in self.runs:
+                self._index(self.runs[run_id])
+
+    def refresh(self):
+        with self.storage.lock():
+            self._sync()
+
+    def record(self, run: Dict) -> Dict:
+        with self.storage.lock():
+            self._sync()
+            previous = self.runs.get(run["run_id"])
+            if previous:
+                self._unindex(previous)
+            self.storage.put(run["run_id"], run)
+            self._index(run)
+            return run
+
+    def get(self, run_id: str) -> Optional[Dict]:
+        self.refresh()
+        return self.runs.get(run_id)
+
+    def latest(self, channel: Optional[str] = None, project_path: Optional[str] = None) -> Optional[Dict]:
+        self.refresh()
+        entries = self._by_channel.get(channel, []) if channel else self._order
+        for _, run_id in reversed(entries):
+            run = self.runs[run_id]
+            if not project_path or run["project_path"] == project_path:
+                return run
+        return None
+
+    def for_channel(self, channel: str, limit: Optional[int] = None) -> List[Dict]:
+        self.refresh()
+        entries = self._by_channel.get(channel, [])
+        selected = entries[-limit:] if limit else entries
+        return [self.runs[run_id] for _, run_id in reversed(selected)]
+
+    def outputs(self, run_id: str) -> Dict[str, Path]:
+        run = self.get(run_id)
+        return {name: Path(path) for name, path in run["outputs"].items()} if run else {}
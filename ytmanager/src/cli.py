@@ -0,0 +1,47 @@
+import argparse
+import atexit
+import os
+import sys
+from importlib import import_module
+from pathlib import Path
+from typing import List, Optional
+
+COMMANDS = {
+    "analytics": (".analytics.__main__", "Fetch analytics and update rolling metrics"),
+    "optimizer": (".optimizer.__main__", "Run the daily/weekly feedback loop or roll back prompts"),
+    "scheduler": (".scheduler.__main__", "List, queue, run workers or the cron loop"),
+    "supervisor": (".supervisor.__main__", "Resident daemon with hot reload and a control socket"),
+    "storage": (".storage.__main__", "Storage maintenance (JSON to SQLite migration)"),
+    "quota": (".analytics.quota", "Show today's API quota usage"),
+    "fake-server": (".analytics.fake_server", "Serve a local fake YouTube API"),
+}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="ytmanager",
+        description="YouTube channel manager",
+        epilog="\n".join(f"  {name:<12} {help}" for name, (_, help) in COMMANDS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--trace", metavar="PATH", help="Append JSONL trace spans to this file")
+    parser.add_argument("--metrics", metavar="PATH", help="Write Prometheus text metrics to this file on exit")
+    parser.add_argument("command", choices=COMMANDS, metavar="command", help="Subcommand (see below)")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the subcommand")
+    args = parser.parse_args(argv)
+
+    if args.trace or args.metrics:
+        from .telemetry import TELEMETRY
+
+        os.environ["YTMANAGER_TELEMETRY"] = str(Path(args.trace).resolve()) if args.trace else "1"
+        TELEMETRY.enable(args.trace)
+        if args.metrics:
+            atexit.register(TELEMETRY.write_prometheus, args.metrics)
+
+    sys.argv[0] = f"ytmanager {args.command}"
+    module = import_module(COMMANDS[args.command][0], __package__)
+    module.main(args.args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,78 @@
 import argparse
+import json
 from pathlib import Path
-from .feedback_loop import FeedbackLoop
+from typing import Dict, List, Optional
+
+from ..analytics.cache import AnalyticsCache
 from ..channels.registry import ChannelRegistry
-from ..analytics.youtube_api import YouTubeAPI
-from ..analytics.metrics import MetricsCalculator
+from ..storage.factory import StorageFactory
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Optimizer")
-    parser.add_argument("--channel", required=True, help="Channel name")
-    parser.add_argument("--mode", choices=["daily", "weekly"], default="daily", help="Optimization mode")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--channel", help="Channel name")
+    target.add_argument("--all-channels", action="store_true", help="Optimize every enabled channel in one process")
+    parser.add_argument("--mode", choices=["daily", "weekly", "rollback"], default="daily", help="Optimization mode")
     parser.add_argument("--auto-apply", action="store_true", help="Auto apply improvements")
     parser.add_argument("--credentials", default="config/youtube_credentials.json", help="YouTube credentials")
-    args = parser.parse_args()
+    parser.add_argument("--no-cache", action="store_true", help="Refetch the whole lookback window")
+    parser.add_argument("--version", help="Prompt version to restore in rollback mode (default: previous)")
+    parser.add_argument(
+        "--experiment-channels", nargs="+", help="Serve improvements as experiment arms on these channels"
+    )
+    parser.add_argument("--fetch-workers", type=int, default=8, help="Concurrent analytics fetches (--all-channels)")
+    parser.add_argument("--workers", type=int, help="Tuning processes (--all-channels, default: CPU count)")
+    parser.add_argument("--report", help="Write the consolidated --all-channels report JSON to this file")
+    args = parser.parse_args(argv)
 
     registry = ChannelRegistry()
+
+    if args.all_channels:
+        if args.mode != "daily":
+            parser.error("--all-channels only supports --mode daily")
+        from ..analytics.youtube_api import YouTubeAPI
+        from .fanout import run_all
+
+        api = YouTubeAPI(args.credentials, cache=None if args.no_cache else AnalyticsCache())
+        report = run_all(
+            registry,
+            api,
+            auto_apply=args.auto_apply,
+            experiment_channels=args.experiment_channels,
+            fetch_workers=args.fetch_workers,
+            tune_workers=args.workers
+        )
+        print_report(report)
+        if args.report:
+            Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+            Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
     channel_config = registry.get(args.channel)
+    for name in args.experiment_channels or []:
+        registry.get(name)
+
+    from .ab_test import ABTest
+    from .feedback_loop import FeedbackLoop
 
     prompts_path = Path(channel_config.project_path) / "config" / "prompts.yaml"
-    feedback_loop = FeedbackLoop(str(prompts_path))
+    storage = StorageFactory(registry.storage.backend, registry.storage.sqlite_path)
+    feedback_loop = FeedbackLoop(
+        str(prompts_path),
+        ab_test=ABTest(storage=storage.open("ab_tests"), archive=storage.open("ab_tests_archive")),
+        history=storage.open_log("feedback_history")
+    )
 
-    api = YouTubeAPI(args.credentials)
+    if args.mode == "rollback":
+        entry = feedback_loop.tuner.rollback(args.version)
+        print(f"Rolled back {args.channel} prompts to {entry['version'][:12]}")
+        return
+
+    from ..analytics.metrics import MetricsCalculator
+    from ..analytics.youtube_api import YouTubeAPI
+
+    api = YouTubeAPI(args.credentials, cache=None if args.no_cache else AnalyticsCache())
     calculator = MetricsCalculator()
 
     if args.mode == "daily":
@@ -28,23 +80,51 @@ def main():
             channel_config.youtube_channel_id,
             channel_config.analytics.lookback_days
         )
-        metrics = calculator.calculate_all(analytics)
+        from ..channels.run_index import RunIndex
+        from .results import ExperimentResults
+
+        ingested = 0
+        if api.cache:
+            results = ExperimentResults(feedback_loop.ab_test, RunIndex(storage=storage.open("run_index")), api.cache)
+            ingested = results.ingest(args.channel, channel_config.youtube_channel_id)
+        frames = calculator.calculate_frames(analytics)
+        feedback_loop.metrics_store.ingest_frames(args.channel, frames)
+        metrics = frames.summary
 
         result = feedback_loop.run_daily(
             metrics,
             args.channel,
-            auto_apply=args.auto_apply
+            auto_apply=args.auto_apply,
+            experiment_channels=args.experiment_channels
         )
 
         print(f"Daily optimization for {args.channel}:")
         print(f"  Suggestions: {len(result['suggestions'])}")
         print(f"  Applied: {len(result['applied'])}")
+        print(f"  Experiment results ingested: {ingested}")
+        if result["experiment"]:
+            print(f"  Experiment: {result['experiment']}")
 
     elif args.mode == "weekly":
         result = feedback_loop.run_weekly([], args.channel)
         print(f"Weekly optimization for {args.channel}:")
+        print(f"  Metrics aggregated: {len(result['aggregated_metrics'])}")
         print(f"  AB tests analyzed: {len(result['ab_test_analyses'])}")
 
 
+def print_report(report: Dict):
+    summary = report["summary"]
+    print(f"Daily optimization for {summary['channels']} channels ({summary['ok']} ok, {summary['failed']} failed):")
+    for name, result in report["channels"].items():
+        if result["status"] != "ok":
+            print(f"  {name}: {result['status']} {result['error']}")
+            continue
+        line = f"  {name}: suggestions={result['suggestions']} applied={result['applied']}"
+        if result["experiment"]:
+            line += f" experiment={result['experiment']}"
+        print(line)
+    print(f"  Fetch: {summary['fetch_seconds']:.1f}s  Total: {summary['total_seconds']:.1f}s")
+
+
 if __name__ == "__main__":
     main()
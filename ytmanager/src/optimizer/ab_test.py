@@ -1,47 +1,221 @@
 from pathlib import Path
-from typing import Dict, Optional
-import json
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import copy
+import math
 import random
+from contextlib import contextmanager
 from datetime import datetime
+from .stats import always_valid_p_value, thompson_draw, variance, welford_update
+from ..storage.base import RecordStore
+from ..storage.journal import JournalStore
+from ..storage.json_store import JsonStore
+
+TOP_TWO_BETA = 0.5
 
 
 class ABTest:
-    def __init__(self, storage_path: str = "data/ab_tests.json"):
+    def __init__(
+        self,
+        storage_path: str = "data/ab_tests.json",
+        storage: Optional[RecordStore] = None,
+        archive: Optional[RecordStore] = None
+    ):
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        self.tests = self._load()
-
-    def _load(self) -> Dict:
-        if self.storage_path.exists():
-            with open(self.storage_path) as f:
-                return json.load(f)
-        return {}
-
-    def _save(self):
-        with open(self.storage_path, "w") as f:
-            json.dump(self.tests, f, indent=2, ensure_ascii=False)
-
-    def create_test(self, test_id: str, variant_a: Dict, variant_b: Dict, ratio: float = 0.5) -> Dict:
-        self.tests[test_id] = {
-            "created_at": datetime.now().isoformat(),
-            "variant_a": variant_a,
-            "variant_b": variant_b,
-            "ratio": ratio,
-            "results": {
-                "a": {"runs": 0, "total_metrics": {}},
-                "b": {"runs": 0, "total_metrics": {}}
-            },
-            "status": "active"
-        }
-        self._save()
-        return self.tests[test_id]
+        self.storage = storage or JsonStore(str(self.storage_path))
+        self.archive = archive or JournalStore(
+            str(self.storage_path.with_name(f"{self.storage_path.stem}_archive.json"))
+        )
+        self._depth = 0
+        self._dirty: Set[str] = set()
+        self._before: Dict[str, Optional[Dict]] = {}
+        self._archive_loaded = False
+        with self.storage.lock():
+            self.tests = self.storage.load()
+        with self.transaction():
+            self._dirty.update(tid for tid, test in self.tests.items() if test["status"] == "concluded")
+
+    @contextmanager
+    def transaction(self) -> Iterator["ABTest"]:
+        with self.storage.lock():
+            if self._depth == 0:
+                self.storage.refresh()
+            self._depth += 1
+            try:
+                yield self
+                if self._depth == 1:
+                    self._flush()
+            except BaseException:
+                if self._depth == 1:
+                    self._rollback()
+                raise
+            finally:
+                self._depth -= 1
+
+    def _touch(self, test_id: str):
+        if test_id not in self._before:
+            self._before[test_id] = copy.deepcopy(self.tests.get(test_id))
+        self._dirty.add(test_id)
+
+    def _rollback(self):
+        for tid, test in self._before.items():
+            if test is None:
+                self.tests.pop(tid, None)
+            else:
+                self.tests[tid] = test
+        self._before.clear()
+        self._dirty.clear()
+
+    def _flush(self):
+        dirty = {tid: self.tests[tid] for tid in self._dirty if tid in self.tests}
+        self._dirty.clear()
+        self._before.clear()
+        concluded = {tid: test for tid, test in dirty.items() if test["status"] == "concluded"}
+        if concluded:
+            with self.archive.lock():
+                self._load_archive()
+                self.archive.put_many(concluded)
+        active = {tid: test for tid, test in dirty.items() if tid not in concluded}
+        self.storage.put_many(active, deletes=list(concluded))
+
+    def _load_archive(self):
+        if self._archive_loaded:
+            self.archive.refresh()
+        else:
+            self.archive.load()
+            self._archive_loaded = True
+
+    @property
+    def archived(self) -> Dict[str, Dict]:
+        with self.archive.lock():
+            self._load_archive()
+        return self.archive.records
 
-    def select_variant(self, test_id: str) -> str:
+    def get(self, test_id: str) -> Optional[Dict]:
+        return self.tests.get(test_id) or self.archived.get(test_id)
+
+    def create_test(
+        self,
+        test_id: str,
+        variant_a: Dict,
+        variant_b: Dict,
+        ratio: float = 0.5,
+        allocation: str = "ratio",
+        primary_metric: Optional[str] = None,
+        alpha: float = 0.05
+    ) -> Dict:
+        return self.create_experiment(
+            test_id,
+            {"a": variant_a, "b": variant_b},
+            control="a",
+            weights={"a": 1 - ratio, "b": ratio},
+            allocation=allocation,
+            primary_metric=primary_metric,
+            alpha=alpha
+        )
+
+    def create_experiment(
+        self,
+        test_id: str,
+        arms: Dict[str, Dict],
+        control: Optional[str] = None,
+        channels: Optional[List[str]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        allocation: str = "ratio",
+        primary_metric: Optional[str] = None,
+        alpha: float = 0.05
+    ) -> Dict:
+        if len(arms) < 2:
+            raise ValueError(f"experiment {test_id!r} needs at least 2 arms")
+        if test_id in self.tests:
+            raise ValueError(f"experiment {test_id!r} already exists")
+        control = control or next(iter(arms))
+        if control not in arms:
+            raise ValueError(f"control arm {control!r} is not one of {list(arms)}")
+        with self.transaction():
+            self._touch(test_id)
+            self.tests[test_id] = {
+                "created_at": datetime.now().isoformat(),
+                "arms": arms,
+                "control": control,
+                "channels": list(channels or []),
+                "weights": weights or {arm: 1.0 for arm in arms},
+                "allocation": allocation,
+                "primary_metric": primary_metric,
+                "alpha": alpha,
+                "results": {arm: {"runs": 0, "total_metrics": {}, "stats": {}} for arm in arms},
+                "p_values": {},
+                "retired": [],
+                "status": "active"
+            }
+            return self.tests[test_id]
+
+    def _arms(self, test: Dict) -> Dict[str, Dict]:
+        if "arms" in test:
+            return test["arms"]
+        return {"a": test["variant_a"], "b": test["variant_b"]}
+
+    def _weights(self, test: Dict) -> Dict[str, float]:
+        if "weights" in test:
+            return test["weights"]
+        return {"a": 1 - test["ratio"], "b": test["ratio"]}
+
+    def _live_arms(self, test: Dict) -> List[str]:
+        return [arm for arm in self._arms(test) if arm not in test.get("retired", [])]
+
+    def select_variant(self, test_id: str, mode: Optional[str] = None) -> str:
         test = self.tests.get(test_id)
-        return "b" if random.random() < test["ratio"] else "a"
+        arms = self._live_arms(test)
+        mode = mode or test.get("allocation", "ratio")
+        if mode == "thompson":
+            metric = self._primary_metric(test)
+            if metric:
+                random.shuffle(arms)
+                arms.sort(key=lambda arm: thompson_draw(test["results"][arm].get("stats", {}).get(metric, {})))
+                return arms[-1] if len(arms) == 1 or random.random() < TOP_TWO_BETA else arms[-2]
+        weights = [self._weights(test).get(arm, 1.0) for arm in arms]
+        return random.choices(arms, weights=weights if sum(weights) > 0 else None)[0]
+
+    def _primary_metric(self, test: Dict) -> Optional[str]:
+        if test.get("primary_metric"):
+            return test["primary_metric"]
+        stats = test["results"][test.get("control", "a")].get("stats", {})
+        return next(iter(stats), None)
 
-    def record_result(self, test_id: str, variant: str, metrics: Dict):
+    def active_for(self, channel: str) -> List[str]:
+        return [
+            test_id for test_id, test in self.tests.items()
+            if test["status"] == "active" and channel in test.get("channels", [])
+        ]
+
+    def assign(self, channel: str) -> Dict[str, str]:
+        return {test_id: self.select_variant(test_id) for test_id in self.active_for(channel)}
+
+    def patches(self, assignment: Dict[str, str]) -> Dict[str, List[str]]:
+        merged: Dict[str, List[str]] = {}
+        for test_id, arm in assignment.items():
+            for key, addition in self._arms(self.get(test_id))[arm].items():
+                merged.setdefault(key, []).append(addition)
+        return merged
+
+    def record_result(self, test_id: str, variant: str, metrics: Dict, run_id: Optional[str] = None) -> bool:
+        with self.transaction():
+            return self._record(test_id, variant, metrics, run_id)
+
+    def record_results(self, results: Iterable[Tuple]) -> int:
+        count = 0
+        with self.transaction():
+            for test_id, variant, metrics, *run_id in results:
+                count += self._record(test_id, variant, metrics, *run_id)
+        return count
+
+    def _record(self, test_id: str, variant: str, metrics: Dict, run_id: Optional[str] = None) -> bool:
         test = self.tests[test_id]
+        if run_id and run_id in test.get("ingested_runs", []):
+            return False
+        self._touch(test_id)
+        if run_id:
+            test.setdefault("ingested_runs", []).append(run_id)
         result = test["results"][variant]
         result["runs"] += 1
 
@@ -49,15 +223,50 @@ class ABTest:
             if metric not in result["total_metrics"]:
                 result["total_metrics"][metric] = 0
             result["total_metrics"][metric] += value
+            welford_update(result.setdefault("stats", {}).setdefault(metric, {}), value)
+
+        self._update_p_values(test, variant, metrics)
+        return True
+
+    def _update_p_values(self, test: Dict, variant: str, metrics: Dict):
+        control_arm = test.get("control", "a")
+        control = test["results"][control_arm].get("stats", {})
+        p_values = test.setdefault("p_values", {})
+        arms = [arm for arm in test["results"] if arm != control_arm and variant in (arm, control_arm)]
+        for arm in arms:
+            treatment = test["results"][arm].get("stats", {})
+            arm_p = p_values.setdefault(arm, {})
+            for metric in metrics:
+                if metric in control and metric in treatment:
+                    arm_p[metric] = always_valid_p_value(arm_p.get(metric, 1.0), control[metric], treatment[metric])
+        for arm, (_, verdict) in self._verdicts(test).items():
+            if verdict == "worse" and arm not in test.setdefault("retired", []):
+                test["retired"].append(arm)
 
-        self._save()
+    def _verdicts(self, test: Dict) -> Dict[str, Tuple[str, str]]:
+        control = test.get("control", "a")
+        challengers = [arm for arm in test["results"] if arm != control]
+        alpha = test.get("alpha", 0.05) / max(len(challengers), 1)
+        primary = test.get("primary_metric")
+        verdicts = {}
+        for arm in challengers:
+            significant = sorted(
+                (p, metric) for metric, p in test.get("p_values", {}).get(arm, {}).items()
+                if p <= alpha and (not primary or metric == primary)
+            )
+            if significant:
+                metric = significant[0][1]
+                mean = test["results"][arm]["stats"][metric]["mean"]
+                better = mean > test["results"][control]["stats"][metric]["mean"]
+                verdicts[arm] = (metric, "better" if better else "worse")
+        return verdicts
 
     def get_averages(self, test_id: str) -> Dict:
-        test = self.tests[test_id]
-        averages = {"a": {}, "b": {}}
+        test = self.get(test_id)
+        averages = {}
 
-        for variant in ["a", "b"]:
-            result = test["results"][variant]
+        for variant, result in test["results"].items():
+            averages[variant] = {}
             runs = result["runs"]
             if runs > 0:
                 for metric, total in result["total_metrics"].items():
@@ -65,37 +274,55 @@ class ABTest:
 
         return averages
 
+    def get_deviations(self, test_id: str) -> Dict:
+        test = self.get(test_id)
+        return {
+            variant: {metric: math.sqrt(variance(stats)) for metric, stats in result.get("stats", {}).items()}
+            for variant, result in test["results"].items()
+        }
+
     def analyze(self, test_id: str, min_sample_size: int = 10) -> Optional[Dict]:
-        test = self.tests[test_id]
-        results_a = test["results"]["a"]
-        results_b = test["results"]["b"]
+        test = self.get(test_id)
+        sample_sizes = {arm: result["runs"] for arm, result in test["results"].items()}
 
-        if results_a["runs"] < min_sample_size or results_b["runs"] < min_sample_size:
+        if min(sample_sizes[arm] for arm in self._live_arms(test)) < min_sample_size:
             return None
 
+        control = test.get("control", "a")
         averages = self.get_averages(test_id)
-        winner = None
         improvements = {}
 
-        for metric in averages["a"].keys():
-            a_val = averages["a"][metric]
-            b_val = averages["b"][metric]
-            diff = ((b_val - a_val) / a_val * 100) if a_val > 0 else 0
-            improvements[metric] = diff
+        for arm in averages:
+            if arm == control:
+                continue
+            improvements[arm] = {}
+            for metric, base in averages[control].items():
+                value = averages[arm].get(metric, 0)
+                improvements[arm][metric] = ((value - base) / base * 100) if base > 0 else 0
 
-            if abs(diff) > 10:
-                winner = "b" if diff > 0 else "a"
+        verdicts = self._verdicts(test)
+        better = [arm for arm, (_, verdict) in verdicts.items() if verdict == "better"]
+        winner = None
+        if better:
+            winner = max(better, key=lambda arm: improvements[arm].get(verdicts[arm][0], 0))
+        elif len(verdicts) == len(improvements):
+            winner = control
 
         return {
             "winner": winner,
             "averages": averages,
+            "deviations": self.get_deviations(test_id),
             "improvements": improvements,
-            "sample_sizes": {"a": results_a["runs"], "b": results_b["runs"]}
+            "p_values": test.get("p_values", {}),
+            "verdicts": {arm: verdict for arm, (_, verdict) in verdicts.items()},
+            "retired": test.get("retired", []),
+            "sample_sizes": sample_sizes
         }
 
     def conclude(self, test_id: str) -> Dict:
-        analysis = self.analyze(test_id)
-        self.tests[test_id]["status"] = "concluded"
-        self.tests[test_id]["conclusion"] = analysis
-        self._save()
-        return analysis
+        with self.transaction():
+            analysis = self.analyze(test_id)
+            self._touch(test_id)
+            self.tests[test_id]["status"] = "concluded"
+            self.tests[test_id]["conclusion"] = analysis
+            return analysis
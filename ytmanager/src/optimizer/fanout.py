@@ -0,0 +1,151 @@
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from ..analytics.cache import AnalyticsCache
+from ..analytics.metrics import MetricsCalculator
+from ..channels.models import ChannelConfig
+from ..channels.registry import ChannelRegistry
+from ..channels.run_index import RunIndex
+from ..storage.factory import StorageFactory
+from ..telemetry import TELEMETRY
+from .ab_test import ABTest
+from .feedback_loop import FeedbackLoop
+from .results import ExperimentResults
+
+if TYPE_CHECKING:
+    from ..analytics.youtube_api import YouTubeAPI
+
+
+def enabled_channels(registry: ChannelRegistry) -> Dict[str, ChannelConfig]:
+    configs = {name: registry.get(name) for name in registry.list()}
+    return {
+        name: config for name, config in configs.items()
+        if config.optimizer.enabled and config.analytics.enabled and config.youtube_channel_id
+    }
+
+
+def timed_call(fn, *args) -> Dict:
+    started = time.perf_counter()
+    result = fn(*args)
+    return {"result": result, "seconds": time.perf_counter() - started}
+
+
+def prefetch(api: "YouTubeAPI", channels: Dict[str, ChannelConfig], max_workers: int = 8) -> Dict[str, Future]:
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(channels)))) as executor:
+        return {
+            name: executor.submit(
+                timed_call, api.get_channel_analytics, config.youtube_channel_id, config.analytics.lookback_days
+            )
+            for name, config in channels.items()
+        }
+
+
+def cache_settings(cache: Optional[AnalyticsCache]) -> Optional[Dict]:
+    if not cache:
+        return None
+    return {
+        "cache_dir": str(cache.cache_dir.resolve()),
+        "settle_days": cache.settle_days,
+        "ttl_hours": cache.ttl.total_seconds() / 3600,
+    }
+
+
+def optimize_project(jobs: List[Dict]) -> Dict:
+    TELEMETRY.reset()
+    storage = StorageFactory(jobs[0]["backend"], jobs[0]["sqlite_path"])
+    feedback_loop = FeedbackLoop(
+        jobs[0]["prompts_path"],
+        ab_test=ABTest(storage=storage.open("ab_tests"), archive=storage.open("ab_tests_archive")),
+        history=storage.open_log("feedback_history")
+    )
+    results = None
+    if jobs[0]["cache"]:
+        index = RunIndex(storage=storage.open("run_index"))
+        results = ExperimentResults(feedback_loop.ab_test, index, AnalyticsCache(**jobs[0]["cache"]))
+    channels = {job["channel"]: optimize_channel(feedback_loop, job, results) for job in jobs}
+    return {"channels": channels, "telemetry": TELEMETRY.snapshot()}
+
+
+def optimize_channel(feedback_loop: FeedbackLoop, job: Dict, results: Optional[ExperimentResults] = None) -> Dict:
+    started = time.perf_counter()
+    ingested = results.ingest(job["channel"], job["channel_id"]) if results else 0
+    frames = MetricsCalculator().calculate_frames(job["analytics"])
+    feedback_loop.metrics_store.ingest_frames(job["channel"], frames)
+    entry = feedback_loop.run_daily(
+        frames.summary,
+        job["channel"],
+        auto_apply=job["auto_apply"],
+        experiment_channels=job["experiment_channels"]
+    )
+    return {
+        "suggestions": len(entry["suggestions"]),
+        "applied": len(entry["applied"]),
+        "experiment": entry["experiment"],
+        "ingested": ingested,
+        "metrics": entry["metrics"],
+        "pid": os.getpid(),
+        "tune_seconds": time.perf_counter() - started,
+    }
+
+
+def run_all(
+    registry: ChannelRegistry,
+    api: "YouTubeAPI",
+    auto_apply: bool = False,
+    experiment_channels: Optional[List[str]] = None,
+    fetch_workers: int = 8,
+    tune_workers: Optional[int] = None
+) -> Dict:
+    started = time.perf_counter()
+    channels = enabled_channels(registry)
+    report = {"started_at": datetime.now().isoformat(), "channels": {}}
+    fetched = prefetch(api, channels, fetch_workers)
+    fetch_seconds = time.perf_counter() - started
+
+    projects: Dict[str, List[Dict]] = {}
+    for name, future in fetched.items():
+        if future.exception():
+            report["channels"][name] = {"status": "fetch_failed", "error": repr(future.exception())}
+            continue
+        report["channels"][name] = {"status": "fetched", "fetch_seconds": future.result()["seconds"]}
+        prompts_path = str(Path(channels[name].project_path).resolve() / "config" / "prompts.yaml")
+        projects.setdefault(prompts_path, []).append({
+            "channel": name,
+            "channel_id": channels[name].youtube_channel_id,
+            "prompts_path": prompts_path,
+            "analytics": future.result()["result"],
+            "auto_apply": auto_apply,
+            "experiment_channels": [name] if name in (experiment_channels or []) else None,
+            "backend": registry.storage.backend,
+            "sqlite_path": registry.storage.sqlite_path,
+            "cache": cache_settings(api.cache),
+        })
+
+    if projects:
+        workers = max(1, min(tune_workers or os.cpu_count() or 1, len(projects)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tuned = {executor.submit(optimize_project, jobs): jobs for jobs in projects.values()}
+            for future, jobs in tuned.items():
+                if not future.exception():
+                    TELEMETRY.merge(future.result()["telemetry"])
+                for job in jobs:
+                    if future.exception():
+                        error = {"status": "tune_failed", "error": repr(future.exception())}
+                        report["channels"][job["channel"]].update(error)
+                    else:
+                        result = future.result()["channels"][job["channel"]]
+                        report["channels"][job["channel"]].update({"status": "ok", **result})
+
+    statuses = [result["status"] for result in report["channels"].values()]
+    report["summary"] = {
+        "channels": len(statuses),
+        "ok": statuses.count("ok"),
+        "failed": len(statuses) - statuses.count("ok"),
+        "fetch_seconds": fetch_seconds,
+        "total_seconds": time.perf_counter() - started,
+    }
+    return report
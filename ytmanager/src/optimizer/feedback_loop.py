@@ -1,33 +1,51 @@
-from typing import Dict
 from pathlib import Path
-import json
+from typing import Dict, List, Optional
 from datetime import datetime
 from .prompt_tuner import PromptTuner
 from .ab_test import ABTest
+from ..analytics.timeseries import MetricsStore
+from ..storage.base import LogStore
+from ..storage.segmented_log import SegmentedLogStore
+from ..telemetry import TELEMETRY
 
 
 class FeedbackLoop:
-    def __init__(self, prompts_path: str, ab_test_storage: str = "data/ab_tests.json", history_path: str = "data/feedback_history.json"):
+    def __init__(
+        self,
+        prompts_path: str,
+        ab_test_storage: str = "data/ab_tests.json",
+        history_path: str = "data/feedback_history.json",
+        ab_test: Optional[ABTest] = None,
+        history: Optional[LogStore] = None,
+        metrics_store: Optional[MetricsStore] = None
+    ):
         self.tuner = PromptTuner(prompts_path)
-        self.ab_test = ABTest(ab_test_storage)
-        self.history_path = Path(history_path)
-        self.history_path.parent.mkdir(parents=True, exist_ok=True)
-        self.history = self._load_history()
-
-    def _load_history(self) -> list:
-        if self.history_path.exists():
-            with open(self.history_path) as f:
-                return json.load(f)
-        return []
-
-    def _save_history(self):
-        with open(self.history_path, "w") as f:
-            json.dump(self.history, f, indent=2, ensure_ascii=False)
-
-    def run_daily(self, metrics: Dict, channel: str, auto_apply: bool = False) -> Dict:
+        self.ab_test = ab_test or ABTest(ab_test_storage)
+        self.history = history or SegmentedLogStore(str(Path(history_path).with_suffix("")), legacy_path=history_path)
+        self.metrics_store = metrics_store or MetricsStore()
+
+    def run_daily(
+        self,
+        metrics: Dict,
+        channel: str,
+        auto_apply: bool = False,
+        experiment_channels: Optional[List[str]] = None
+    ) -> Dict:
         timestamp = datetime.now().isoformat()
-
-        tuning_result = self.tuner.tune(metrics, ab_test=False, dry_run=not auto_apply)
+        experiment = bool(experiment_channels)
+
+        tuning_result = self.tuner.tune(metrics, ab_test=experiment, dry_run=experiment or not auto_apply)
+        experiment_id = None
+        if experiment and len(tuning_result["arms"]) > 1 and not self.ab_test.active_for(channel):
+            experiment_id = f"{channel}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            self.ab_test.create_experiment(
+                experiment_id,
+                tuning_result["arms"],
+                control="control",
+                channels=experiment_channels,
+                allocation="thompson",
+                primary_metric="views"
+            )
 
         entry = {
             "timestamp": timestamp,
@@ -36,18 +54,31 @@ class FeedbackLoop:
             "suggestions": tuning_result["suggestions"],
             "improvements": tuning_result["improvements"],
             "applied": tuning_result["applied"],
-            "auto_applied": auto_apply
+            "patch_status": tuning_result["patch_status"],
+            "auto_applied": auto_apply and not experiment,
+            "experiment": experiment_id
         }
 
         self.history.append(entry)
-        self._save_history()
+        for name, value in metrics.items():
+            if isinstance(value, (int, float)):
+                TELEMETRY.track(f"metrics.{name}", value, channel=channel)
 
         return entry
 
-    def run_weekly(self, weekly_metrics: list[Dict], channel: str, min_sample_size: int = 10) -> Dict:
+    def run_weekly(
+        self,
+        weekly_metrics: list[Dict],
+        channel: str,
+        min_sample_size: int = 10,
+        window_days: int = 7
+    ) -> Dict:
         timestamp = datetime.now().isoformat()
 
-        aggregated_metrics = self._aggregate_metrics(weekly_metrics)
+        if weekly_metrics:
+            aggregated_metrics = self._aggregate_metrics(weekly_metrics)
+        else:
+            aggregated_metrics = self.metrics_store.window(channel, window_days)
 
         active_tests = [tid for tid, test in self.ab_test.tests.items() if test["status"] == "active"]
         analyses = {}
@@ -72,7 +103,6 @@ class FeedbackLoop:
         }
 
         self.history.append(entry)
-        self._save_history()
 
         return entry
 
@@ -90,4 +120,4 @@ class FeedbackLoop:
         return aggregated
 
     def get_recent_improvements(self, limit: int = 10) -> list[Dict]:
-        return [h for h in self.history if h.get("applied")][-limit:]
+        return self.history.tail(limit, where=lambda h: bool(h.get("applied")))
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..storage.files import FileLock, atomic_write_text
+
+PATCH_TOKEN_ALLOWANCE = 200
+
+
+def estimate_tokens(text: str) -> int:
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return (len(text) - ascii_chars) + math.ceil(ascii_chars / 4)
+
+
+def compact(text: str) -> str:
+    seen = set()
+    paragraphs = []
+    for paragraph in text.split("\n\n"):
+        key = paragraph.strip()
+        if key and key in seen:
+            continue
+        seen.add(key)
+        paragraphs.append(paragraph)
+    return "\n\n".join(paragraphs)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class PromptHistory:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.log_path = self.root / "versions.jsonl"
+        self._lock: Optional[FileLock] = None
+
+    @property
+    def lock(self) -> FileLock:
+        if self._lock is None:
+            self._lock = FileLock(str(self.root / "history.lock"))
+        return self._lock
+
+    def versions(self) -> List[Dict]:
+        if not self.log_path.exists():
+            return []
+        with open(self.log_path) as f:
+            return [json.loads(line) for line in f if line.endswith("\n")]
+
+    def head(self) -> Optional[Dict]:
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def find(self, version: str) -> Dict:
+        matches = [v for v in self.versions() if v["version"].startswith(version)]
+        if not matches:
+            raise ValueError(f"unknown prompt version: {version!r}")
+        return matches[-1]
+
+    def read(self, version: str) -> str:
+        return (self.objects / f"{version}.yaml").read_text()
+
+    def commit(self, text: str, applied: Dict[str, List[str]], message: str, patches: List[str] = ()) -> Dict:
+        version = content_hash(text)
+        obj = self.objects / f"{version}.yaml"
+        if not obj.exists():
+            self.objects.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(obj, text, durable=False)
+        head = self.head()
+        entry = {
+            "version": version,
+            "parent": head["version"] if head else None,
+            "timestamp": datetime.now().isoformat(),
+            "message": message,
+            "patches": list(patches),
+            "applied": applied,
+        }
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
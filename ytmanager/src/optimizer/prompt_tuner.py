@@ -1,20 +1,94 @@
 from pathlib import Path
-from typing import Dict, List
-import yaml
+from typing import Dict, List, Optional
+from .patches import PATCH_TOKEN_ALLOWANCE, PromptHistory, compact, content_hash, estimate_tokens
+from ..storage.files import atomic_write_text
+from ..storage.yaml_cache import load_yaml, parse_yaml, save_yaml
+from ..telemetry import TELEMETRY
+
+PROMPT_KEYS = ("news_prompt", "script_prompt", "metadata_prompt")
 
 
 class PromptTuner:
-    def __init__(self, prompts_path: str):
+    def __init__(
+        self,
+        prompts_path: str,
+        history_dir: Optional[str] = None,
+        token_budget: Optional[Dict[str, int]] = None
+    ):
         self.prompts_path = Path(prompts_path)
+        self.history = PromptHistory(Path(history_dir) if history_dir else self.prompts_path.parent / ".prompt_history")
         self.prompts = self._load()
+        head = self.history.head()
+        self.applied: Dict[str, List[str]] = {key: list(ids) for key, ids in head["applied"].items()} if head else {}
+        self.token_budget = token_budget or self._default_budget()
+        self.statuses: Dict[str, str] = {}
 
+    @TELEMETRY.timed("prompt_tuner.load")
     def _load(self) -> Dict:
-        with open(self.prompts_path) as f:
-            return yaml.safe_load(f)
+        prompts, self._hash = load_yaml(str(self.prompts_path))
+        return prompts
+
+    def _default_budget(self) -> Dict[str, int]:
+        versions = self.history.versions()
+        base = parse_yaml(self.history.read(versions[0]["version"])) if versions else self.prompts
+        return {
+            key: estimate_tokens(base[key]) + PATCH_TOKEN_ALLOWANCE
+            for key in PROMPT_KEYS if isinstance(base.get(key), str)
+        }
 
-    def _save(self):
-        with open(self.prompts_path, "w") as f:
-            yaml.dump(self.prompts, f, allow_unicode=True, sort_keys=False)
+    def _commit_external(self):
+        head = self.history.head()
+        if not head or head["version"] != self._hash:
+            self.history.commit(self.prompts_path.read_text(), head["applied"] if head else {}, "external")
+
+    @TELEMETRY.timed("prompt_tuner.save")
+    def _save(self, patches: List[str], message: str = "patch"):
+        with self.history.lock:
+            self._commit_external()
+            text, written = save_yaml(str(self.prompts_path), self.prompts)
+            if written:
+                self.history.commit(text, self.applied, message, patches)
+        self._hash = content_hash(text)
+
+    def rollback(self, version: Optional[str] = None) -> Dict:
+        with self.history.lock:
+            head = self.history.head()
+            if version:
+                target = self.history.find(version)
+            elif head and head["version"] != self._hash:
+                target = head
+            elif head and head["parent"]:
+                target = self.history.find(head["parent"])
+            else:
+                raise ValueError("no earlier prompt version to roll back to")
+            self._commit_external()
+            text = self.history.read(target["version"])
+            atomic_write_text(self.prompts_path, text)
+            self.prompts = parse_yaml(text)
+            self.applied = {key: list(ids) for key, ids in target["applied"].items()}
+            self._hash = content_hash(text)
+            return self.history.commit(text, self.applied, f"rollback to {target['version'][:12]}")
+
+    def _patch(
+        self,
+        prompts: Dict,
+        patch_id: Optional[str],
+        key: str,
+        addition: str,
+        applied: Optional[Dict[str, List[str]]] = None
+    ) -> str:
+        if patch_id in (self.applied if applied is None else applied).get(key, []) or addition.strip() in prompts[key]:
+            return "skipped"
+        patched = prompts[key] + addition
+        status = "applied"
+        budget = self.token_budget.get(key)
+        if budget and estimate_tokens(patched) > budget:
+            patched = compact(patched)
+            status = "compacted"
+            if estimate_tokens(patched) > budget:
+                return "rejected"
+        prompts[key] = patched
+        return status
 
     def analyze_metrics(self, metrics: Dict) -> Dict:
         suggestions = {}
@@ -38,25 +112,29 @@ class PromptTuner:
         improvements = {}
 
         if "engagement" in suggestions:
-            improvements["news_prompt"] = {
+            improvements["news-question-hook"] = {
+                "prompt": "news_prompt",
                 "addition": "\n\n視聴者の関心を引く質問形式や驚きの事実を含める。",
                 "ab_variant": ab_test
             }
 
         if "retention" in suggestions:
-            improvements["script_prompt"] = {
+            improvements["script-early-core"] = {
+                "prompt": "script_prompt",
                 "addition": "\n\n冒頭15秒で核心に触れ、視聴継続の動機を明確に示す。テンポよく展開。",
                 "ab_variant": ab_test
             }
 
         if "ctr" in suggestions:
-            improvements["metadata_prompt"] = {
+            improvements["metadata-title-hooks"] = {
+                "prompt": "metadata_prompt",
                 "addition": "\n\nタイトルは数字・疑問形・緊急性を含める。25-35文字推奨。",
                 "ab_variant": ab_test
             }
 
         if "duration" in suggestions:
-            improvements["script_prompt"] = {
+            improvements["script-short-intro"] = {
+                "prompt": "script_prompt",
                 "addition": "\n\n導入は30秒以内。すぐ本題へ。",
                 "ab_variant": ab_test
             }
@@ -65,21 +143,47 @@ class PromptTuner:
 
     def apply_improvements(self, improvements: Dict, dry_run: bool = False) -> List[str]:
         applied = []
-
-        for key, change in improvements.items():
-            if key in self.prompts:
-                original = self.prompts[key]
+        patched = []
+        self.statuses = {}
+        prompts = dict(self.prompts)
+        staged = {key: list(ids) for key, ids in self.applied.items()}
+
+        for patch_id, change in improvements.items():
+            key = change["prompt"]
+            if key in prompts:
                 if change.get("ab_variant"):
                     applied.append(f"A/Bテスト: {key} - {change['addition']}")
-                else:
-                    self.prompts[key] = original + change["addition"]
-                    applied.append(f"適用: {key}")
-
-        if not dry_run:
-            self._save()
+                    continue
+                status = self._patch(prompts, patch_id, key, change["addition"], staged)
+                self.statuses[patch_id] = status
+                if status in ("applied", "compacted"):
+                    staged.setdefault(key, []).append(patch_id)
+                    patched.append(patch_id)
+                    applied.append(f"適用: {key} ({patch_id})")
+
+        if not dry_run and patched:
+            self.prompts = prompts
+            self.applied = staged
+            self._save(patched)
 
         return applied
 
+    def build_arms(self, improvements: Dict) -> Dict[str, Dict[str, str]]:
+        arms = {"control": {}}
+        for patch_id, change in improvements.items():
+            if change["prompt"] in PROMPT_KEYS:
+                arms[patch_id] = {change["prompt"]: change["addition"]}
+        return arms
+
+    def render(self, patches: Dict[str, List[str]]) -> Dict:
+        prompts = dict(self.prompts)
+        for key, additions in patches.items():
+            if key in PROMPT_KEYS and key in prompts:
+                for addition in additions:
+                    self._patch(prompts, None, key, addition)
+        return prompts
+
+    @TELEMETRY.timed("prompt_tuner.tune")
     def tune(self, metrics: Dict, ab_test: bool = False, dry_run: bool = False) -> Dict:
         suggestions = self.analyze_metrics(metrics)
         improvements = self.generate_prompt_improvements(suggestions, ab_test)
@@ -88,5 +192,7 @@ class PromptTuner:
         return {
             "suggestions": suggestions,
             "improvements": improvements,
-            "applied": applied
+            "applied": applied,
+            "patch_status": self.statuses,
+            "arms": self.build_arms(improvements) if ab_test else {}
         }
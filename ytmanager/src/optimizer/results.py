@@ -0,0 +1,57 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+
+from ..analytics.cache import CHANNEL_METRICS, AnalyticsCache
+from ..channels.run_index import RunIndex
+from ..telemetry import TELEMETRY
+from .ab_test import ABTest
+
+
+class ExperimentResults:
+    def __init__(self, ab_test: ABTest, index: RunIndex, cache: AnalyticsCache, attribution_days: int = 1):
+        self.ab_test = ab_test
+        self.index = index
+        self.cache = cache
+        self.attribution_days = attribution_days
+
+    def pending(self, channel: str) -> List[Dict]:
+        return [
+            run for run in self.index.for_channel(channel)
+            if run.get("assignment") and run["exit_code"] == 0 and not run["dry_run"] and not run.get("ingested_at")
+        ]
+
+    def attribution_window(self, run: Dict) -> Tuple[date, date]:
+        start = datetime.fromisoformat(run["finished_at"]).date()
+        return start, start + timedelta(days=self.attribution_days - 1)
+
+    def metrics_for(self, run: Dict, channel_id: str, metrics: str = CHANNEL_METRICS) -> Dict[str, float]:
+        start, end = self.attribution_window(run)
+        days = self.cache.settled_days(channel_id, metrics, start, end)
+        if len(days) < (end - start).days + 1:
+            return {}
+        totals: Dict[str, float] = {}
+        for values in days.values():
+            for name, value in values.items():
+                totals[name] = totals.get(name, 0) + value
+        return {name: total / len(days) for name, total in totals.items()}
+
+    @TELEMETRY.timed("optimizer.ingest_results")
+    def ingest(self, channel: str, channel_id: str, metrics: str = CHANNEL_METRICS) -> int:
+        ingested = []
+        results = []
+        with self.ab_test.transaction():
+            for run in self.pending(channel):
+                values = self.metrics_for(run, channel_id, metrics)
+                if not values:
+                    continue
+                for test_id, arm in run["assignment"].items():
+                    test = self.ab_test.tests.get(test_id)
+                    if test and test["status"] == "active" and arm in test["results"]:
+                        results.append((test_id, arm, values, run["run_id"]))
+                ingested.append(run)
+            recorded = self.ab_test.record_results(results)
+        ingested_at = datetime.now().isoformat()
+        for run in ingested:
+            self.index.record({**run, "ingested_at": ingested_at})
+        TELEMETRY.count("optimizer.results_ingested", recorded, channel=channel)
+        return recorded
@@ -0,0 +1,41 @@
+import math
+import random
+from typing import Dict
+
+
+def welford_update(stats: Dict, value: float) -> Dict:
+    stats["n"] = stats.get("n", 0) + 1
+    delta = value - stats.get("mean", 0.0)
+    stats["mean"] = stats.get("mean", 0.0) + delta / stats["n"]
+    stats["m2"] = stats.get("m2", 0.0) + delta * (value - stats["mean"])
+    return stats
+
+
+def variance(stats: Dict) -> float:
+    return stats["m2"] / (stats["n"] - 1) if stats.get("n", 0) > 1 else 0.0
+
+
+def msprt_likelihood_ratio(control: Dict, treatment: Dict, mixture_scale: float = 0.5) -> float:
+    var_a, var_b = variance(control), variance(treatment)
+    v = var_a / control["n"] + var_b / treatment["n"]
+    tau2 = (mixture_scale ** 2) * (var_a + var_b) / 2
+    if v <= 0 or tau2 <= 0:
+        return 1.0
+    theta = treatment["mean"] - control["mean"]
+    exponent = theta ** 2 * tau2 / (2 * v * (v + tau2))
+    return math.sqrt(v / (v + tau2)) * math.exp(min(exponent, 700.0))
+
+
+def always_valid_p_value(
+    previous: float, control: Dict, treatment: Dict, mixture_scale: float = 0.5, burn_in: int = 10
+) -> float:
+    if control.get("n", 0) < burn_in or treatment.get("n", 0) < burn_in:
+        return previous
+    return min(previous, 1.0 / msprt_likelihood_ratio(control, treatment, mixture_scale))
+
+
+def thompson_draw(stats: Dict, burn_in: int = 5) -> float:
+    n = stats.get("n", 0)
+    if n < burn_in:
+        return float("inf")
+    return random.gauss(stats["mean"], math.sqrt(variance(stats) / n))
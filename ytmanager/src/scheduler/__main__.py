@@ -1,37 +1,101 @@
 import argparse
+from typing import TYPE_CHECKING, List, Optional, Union
+
+from ..channels.registry import ChannelRegistry
+from ..storage.factory import StorageFactory
+from ..supervisor.client import SupervisorClient
 from .cron_manager import CronManager
-from .series_manager import SeriesManager
 from .queue import ExecutionQueue
-from ..channels.registry import ChannelRegistry
 
+if TYPE_CHECKING:
+    from ..supervisor.state import SupervisorState
 
-def main():
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Scheduler")
-    parser.add_argument("--action", choices=["list", "run", "series", "queue"], required=True, help="Action")
+    parser.add_argument(
+        "--action",
+        choices=["list", "run", "series", "queue", "worker", "cron"],
+        required=True,
+        help="Action"
+    )
     parser.add_argument("--channel", help="Channel name")
     parser.add_argument("--series-id", help="Series ID")
-    args = parser.parse_args()
+    parser.add_argument("--concurrency", type=int, default=2, help="Max parallel tasks for worker action")
+    parser.add_argument("--timeout", type=float, default=3600, help="Per-task timeout seconds for worker action")
+    parser.add_argument("--once", action="store_true", help="Worker exits when the queue is drained")
+    parser.add_argument("--lease", type=float, default=300, help="Task lease seconds renewed by worker heartbeats")
+    parser.add_argument("--local", action="store_true", help="Read state files directly even if a supervisor runs")
+    parser.add_argument("--system-cron", action="store_true", help="Also mirror schedules into a marked crontab block")
+    args = parser.parse_args(argv)
+
+    if args.action in ("list", "series", "queue", "run"):
+        client = None if args.local else SupervisorClient.connect()
+        if not client:
+            from ..supervisor.state import SupervisorState
+
+            client = SupervisorState()
+        show(client, args)
+        return
 
-    cron = CronManager()
-    series = SeriesManager()
-    queue = ExecutionQueue()
     registry = ChannelRegistry()
+    storage = StorageFactory(registry.storage.backend, registry.storage.sqlite_path)
+    cron = CronManager(storage=storage.open("cron_schedule"), system_cron=args.system_cron)
+    queue = ExecutionQueue(storage=storage.open("execution_queue"))
+
+    if args.action == "worker":
+        import asyncio
+
+        from ..channels.run_index import RunIndex
+        from ..optimizer.ab_test import ABTest
+        from .series_manager import SeriesManager
+        from .worker import WorkerPool
+
+        pool = WorkerPool(
+            queue,
+            registry,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+            lease_seconds=args.lease,
+            experiments=ABTest(storage=storage.open("ab_tests"), archive=storage.open("ab_tests_archive")),
+            index=RunIndex(storage=storage.open("run_index")),
+            series=SeriesManager(storage=storage.open("series"))
+        )
+        print(f"Worker started (concurrency={args.concurrency})")
+        asyncio.run(pool.run(once=args.once))
+
+    elif args.action == "cron":
+        import asyncio
+
+        from .cron_scheduler import CronScheduler
+
+        for name in registry.list():
+            if name not in cron.schedule:
+                cron.add(name, registry.get(name).schedule, "uv run python -m src.main")
+        scheduler = CronScheduler(cron, queue)
+        print("Cron scheduler started:")
+        for entry in cron.list():
+            print(f"  {entry['channel']}: {entry['cron']} (next: {entry['next_run']})")
+        asyncio.run(scheduler.run())
 
+
+def show(client: Union[SupervisorClient, "SupervisorState"], args: argparse.Namespace):
     if args.action == "list":
         print("Scheduled channels:")
-        for entry in cron.list():
-            print(f"  {entry['channel']}: {entry['cron']} ({'enabled' if entry['enabled'] else 'disabled'})")
+        for entry in client.call("cron.list"):
+            state = 'enabled' if entry['enabled'] else 'disabled'
+            print(f"  {entry['channel']}: {entry['cron']} ({state}, next: {entry['next_run']})")
 
     elif args.action == "series":
         print("Active series:")
-        for s in series.list_active():
+        for s in client.call("series.list"):
             progress = len(s["episodes_produced"])
             total = s["total_episodes"]
             print(f"  {s['series_id']}: {s['title']} ({progress}/{total})")
 
     elif args.action == "queue":
         print("Execution queue:")
-        for task in queue.list():
+        for task in client.call("queue.list"):
             print(f"  {task['task_id']}: {task['channel']} [{task['status']}]")
 
     elif args.action == "run":
@@ -39,14 +103,8 @@ def main():
             print("--channel required for run action")
             return
 
-        channel_config = registry.get(args.channel)
         print(f"Queueing {args.channel}...")
-
-        task_id = queue.add(
-            args.channel,
-            f"uv run python -m src.main",
-            priority=0
-        )
+        task_id = client.call("queue.add", channel=args.channel, priority=0)
         print(f"Task queued: {task_id}")
 
 
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+
+MONTH_NAMES = {name: i + 1 for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+)}
+DAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+SEARCH_LIMIT = timedelta(days=366 * 5)
+
+
+def _value(token: str, names: dict) -> int:
+    return names[token.lower()] if token.lower() in names else int(token)
+
+
+def parse_field(field: str, low: int, high: int, names: Optional[dict] = None) -> Set[int]:
+    names = names or {}
+    values = set()
+    for part in field.split(","):
+        base, _, step = part.partition("/")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            first, last = base.split("-")
+            start, end = _value(first, names), _value(last, names)
+        else:
+            start = _value(base, names)
+            end = high if step else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron field out of range: {part!r} (allowed {low}-{high})")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return values
+
+
+class CronExpression:
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        minute, hour, day, month, weekday = fields
+        self.minutes = sorted(parse_field(minute, 0, 59))
+        self.hours = sorted(parse_field(hour, 0, 23))
+        self.days = parse_field(day, 1, 31)
+        self.months = parse_field(month, 1, 12, MONTH_NAMES)
+        self.weekdays = {d % 7 for d in parse_field(weekday, 0, 7, DAY_NAMES)}
+        self.day_restricted = not day.startswith("*")
+        self.weekday_restricted = not weekday.startswith("*")
+
+    def matches_day(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + SEARCH_LIMIT
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year = candidate.year + candidate.month // 12
+                candidate = candidate.replace(year=year, month=candidate.month % 12 + 1, day=1, hour=0, minute=0)
+                continue
+            if not self.matches_day(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            hour = self._first_at_least(self.hours, candidate.hour)
+            if hour is None:
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if hour != candidate.hour:
+                candidate = candidate.replace(hour=hour, minute=0)
+            minute = self._first_at_least(self.minutes, candidate.minute)
+            if minute is None:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            return candidate.replace(minute=minute)
+        raise ValueError(f"cron expression never fires: {self.expression!r}")
+
+    def next_runs(self, moment: datetime, count: int) -> List[datetime]:
+        runs = []
+        for _ in range(count):
+            moment = self.next_after(moment)
+            runs.append(moment)
+        return runs
+
+    @staticmethod
+    def _first_at_least(values: List[int], current: int):
+        for value in values:
+            if value >= current:
+                return value
+        return None
@@ -1,75 +1,107 @@
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import subprocess
-import json
 from datetime import datetime
+from .cron import CronExpression
+from ..storage.base import RecordStore
+from ..storage.json_store import JsonStore
+
+BLOCK_BEGIN = "# BEGIN ytmanager"
+BLOCK_END = "# END ytmanager"
 
 
 class CronManager:
-    def __init__(self, cron_file: str = "data/cron_schedule.json"):
+    def __init__(
+        self,
+        cron_file: str = "data/cron_schedule.json",
+        storage: Optional[RecordStore] = None,
+        system_cron: bool = False
+    ):
         self.cron_file = Path(cron_file)
         self.cron_file.parent.mkdir(parents=True, exist_ok=True)
-        self.schedule = self._load()
-
-    def _load(self) -> Dict:
-        if self.cron_file.exists():
-            with open(self.cron_file) as f:
-                return json.load(f)
-        return {}
-
-    def _save(self):
-        with open(self.cron_file, "w") as f:
-            json.dump(self.schedule, f, indent=2, ensure_ascii=False)
+        self.storage = storage or JsonStore(str(self.cron_file))
+        self.system_cron = system_cron
+        self._user_crontab: Optional[List[str]] = None
+        self._installed_block: Optional[List[str]] = None
+        with self.storage.lock():
+            self.schedule = self.storage.load()
 
     def add(self, channel: str, cron_expression: str, command: str) -> Dict:
-        self.schedule[channel] = {
-            "cron": cron_expression,
-            "command": command,
-            "enabled": True,
-            "last_run": None,
-            "next_run": self._calculate_next_run(cron_expression)
-        }
-        self._save()
-        self._update_system_cron()
-        return self.schedule[channel]
+        with self.storage.lock():
+            self.storage.refresh()
+            self.storage.put(channel, {
+                "cron": cron_expression,
+                "command": command,
+                "enabled": True,
+                "last_run": None,
+                "next_run": self._calculate_next_run(cron_expression)
+            })
+            self._update_system_cron()
+            return self.schedule[channel]
 
     def remove(self, channel: str):
-        if channel in self.schedule:
-            del self.schedule[channel]
-            self._save()
-            self._update_system_cron()
+        with self.storage.lock():
+            self.storage.refresh()
+            if channel in self.schedule:
+                self.storage.delete(channel)
+                self._update_system_cron()
 
     def enable(self, channel: str):
-        if channel in self.schedule:
-            self.schedule[channel]["enabled"] = True
-            self._save()
-            self._update_system_cron()
+        self._set_enabled(channel, True)
 
     def disable(self, channel: str):
-        if channel in self.schedule:
-            self.schedule[channel]["enabled"] = False
-            self._save()
-            self._update_system_cron()
+        self._set_enabled(channel, False)
+
+    def _set_enabled(self, channel: str, enabled: bool):
+        with self.storage.lock():
+            self.storage.refresh()
+            if channel in self.schedule:
+                self.schedule[channel]["enabled"] = enabled
+                self.storage.put(channel, self.schedule[channel])
+                self._update_system_cron()
 
     def list(self) -> List[Dict]:
         return [{"channel": ch, **info} for ch, info in self.schedule.items()]
 
-    def _calculate_next_run(self, cron_expression: str) -> str:
-        return datetime.now().isoformat()
+    def _calculate_next_run(self, cron_expression: str, after: Optional[datetime] = None) -> str:
+        return CronExpression(cron_expression).next_after(after or datetime.now()).isoformat()
 
     def _update_system_cron(self):
-        cron_entries = []
+        if not self.system_cron:
+            return
+
+        block = [BLOCK_BEGIN]
         for channel, info in self.schedule.items():
             if info["enabled"]:
-                cron_entries.append(f"{info['cron']} {info['command']}")
+                block.append(f"{info['cron']} {info['command']}")
+        block.append(BLOCK_END)
+        if block == self._installed_block:
+            return
+
+        if self._user_crontab is None:
+            self._user_crontab, self._installed_block = self._read_crontab()
+            if block == self._installed_block:
+                return
 
-        cron_content = "\n".join(cron_entries)
-        temp_file = Path("/tmp/ytmanager_cron")
-        temp_file.write_text(cron_content)
+        cron_content = "\n".join(self._user_crontab + block) + "\n"
+        subprocess.run(["crontab", "-"], input=cron_content, text=True, check=False)
+        self._installed_block = block
 
-        subprocess.run(["crontab", str(temp_file)], check=False)
+    @staticmethod
+    def _read_crontab():
+        result = subprocess.run(["crontab", "-l"], capture_output=True, text=True, check=False)
+        lines = result.stdout.splitlines() if result.returncode == 0 else []
+        if BLOCK_BEGIN not in lines or BLOCK_END not in lines:
+            return lines, None
+        begin, end = lines.index(BLOCK_BEGIN), lines.index(BLOCK_END)
+        return lines[:begin] + lines[end + 1:], lines[begin:end + 1]
 
-    def record_run(self, channel: str):
-        if channel in self.schedule:
-            self.schedule[channel]["last_run"] = datetime.now().isoformat()
-            self._save()
+    def record_run(self, channel: str, fired_at: Optional[datetime] = None):
+        with self.storage.lock():
+            self.storage.refresh()
+            if channel in self.schedule:
+                fired_at = fired_at or datetime.now()
+                info = self.schedule[channel]
+                info["last_run"] = fired_at.isoformat()
+                info["next_run"] = self._calculate_next_run(info["cron"], max(fired_at, datetime.now()))
+                self.storage.put(channel, info)
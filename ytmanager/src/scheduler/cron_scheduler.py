@@ -0,0 +1,62 @@
+import asyncio
+import heapq
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from .cron import CronExpression
+from .cron_manager import CronManager
+from .queue import ExecutionQueue
+
+
+class CronScheduler:
+    def __init__(self, cron: CronManager, queue: ExecutionQueue, refresh_interval: float = 60.0):
+        self.cron = cron
+        self.queue = queue
+        self.refresh_interval = refresh_interval
+        self._heap: List[Tuple[datetime, str]] = []
+        self.rebuild()
+
+    def rebuild(self, now: Optional[datetime] = None):
+        now = now or datetime.now()
+        self._heap = [
+            (CronExpression(info["cron"]).next_after(now), channel)
+            for channel, info in self.cron.schedule.items()
+            if info["enabled"]
+        ]
+        heapq.heapify(self._heap)
+
+    def next_fire(self) -> Optional[Tuple[datetime, str]]:
+        return self._heap[0] if self._heap else None
+
+    def tick(self, now: Optional[datetime] = None) -> List[str]:
+        now = now or datetime.now()
+        queued = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, channel = heapq.heappop(self._heap)
+            info = self.cron.schedule.get(channel)
+            if not info or not info["enabled"]:
+                continue
+            queued.append(self.queue.add(channel, info["command"], metadata={"scheduled_for": fire_at.isoformat()}))
+            self.cron.record_run(channel, fire_at)
+            heapq.heappush(self._heap, (CronExpression(info["cron"]).next_after(max(fire_at, now)), channel))
+        return queued
+
+    def refresh(self):
+        with self.cron.storage.lock():
+            changes = self.cron.storage.refresh()
+        if changes is None or changes:
+            self.rebuild()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_refresh = loop.time() + self.refresh_interval
+        while True:
+            self.tick()
+            if loop.time() >= next_refresh:
+                self.refresh()
+                next_refresh = loop.time() + self.refresh_interval
+            delay = next_refresh - loop.time()
+            upcoming = self.next_fire()
+            if upcoming:
+                delay = min(delay, (upcoming[0] - datetime.now()).total_seconds())
+            await asyncio.sleep(max(delay, 0))
@@ -1,8 +1,12 @@
 from pathlib import Path
-from typing import Dict, List, Optional
-import json
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 from enum import Enum
+import heapq
+import itertools
+from ..storage.base import RecordStore
+from ..storage.journal import JournalStore
+from ..telemetry import TELEMETRY
 
 
 class TaskStatus(str, Enum):
@@ -13,92 +17,223 @@ class TaskStatus(str, Enum):
 
 
 class ExecutionQueue:
-    def __init__(self, queue_file: str = "data/execution_queue.json"):
+    def __init__(self, queue_file: str = "data/execution_queue.json", storage: Optional[RecordStore] = None):
         self.queue_file = Path(queue_file)
         self.queue_file.parent.mkdir(parents=True, exist_ok=True)
-        self.queue = self._load()
-
-    def _load(self) -> List[Dict]:
-        if self.queue_file.exists():
-            with open(self.queue_file) as f:
-                return json.load(f)
-        return []
-
-    def _save(self):
-        with open(self.queue_file, "w") as f:
-            json.dump(self.queue, f, indent=2, ensure_ascii=False)
-
-    def add(self, channel: str, command: str, priority: int = 0, metadata: Optional[Dict] = None) -> str:
-        task_id = f"{channel}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        task = {
-            "task_id": task_id,
-            "channel": channel,
-            "command": command,
-            "priority": priority,
-            "status": TaskStatus.PENDING,
-            "metadata": metadata or {},
-            "created_at": datetime.now().isoformat(),
-            "started_at": None,
-            "completed_at": None,
-            "error": None
-        }
-        self.queue.append(task)
-        self._sort()
-        self._save()
+        self.storage = storage or JournalStore(str(self.queue_file), key_field="task_id")
+        self._heap: List[Tuple] = []
+        self._heap_seq: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._by_status: Dict[TaskStatus, Dict[str, Dict]] = {status: {} for status in TaskStatus}
+        self._by_channel_status: Dict[Tuple[str, TaskStatus], Dict[str, Dict]] = {}
+        with self.storage.lock():
+            self.storage.load()
+            self._reindex()
+
+    @property
+    def tasks(self) -> Dict[str, Dict]:
+        return self.storage.records
+
+    def _reindex(self):
+        self._heap = []
+        self._heap_seq = {}
+        self._by_status = {status: {} for status in TaskStatus}
+        self._by_channel_status = {}
+        for task in sorted(self.tasks.values(), key=lambda t: t["created_at"]):
+            self._index(task)
+
+    def _sync(self):
+        changes = self.storage.refresh()
+        if changes is None:
+            self._reindex()
+            return
+        for task_id, previous in changes.items():
+            if previous:
+                self._unindex(previous)
+            if task_id in self.tasks:
+                self._index(self.tasks[task_id])
+
+    def refresh(self):
+        with self.storage.lock():
+            self._sync()
+
+    def _save(self, task: Dict):
+        self.storage.put(task["task_id"], task)
+
+    def _index(self, task: Dict):
+        status = TaskStatus(task["status"])
+        self._by_status[status][task["task_id"]] = task
+        self._by_channel_status.setdefault((task["channel"], status), {})[task["task_id"]] = task
+        if status == TaskStatus.PENDING:
+            self._push(task)
+
+    def _unindex(self, task: Dict):
+        status = TaskStatus(task["status"])
+        self._by_status[status].pop(task["task_id"], None)
+        self._by_channel_status.get((task["channel"], status), {}).pop(task["task_id"], None)
+        self._heap_seq.pop(task["task_id"], None)
+
+    def _push(self, task: Dict):
+        created = datetime.fromisoformat(task["created_at"]).timestamp()
+        seq = next(self._sequence)
+        self._heap_seq[task["task_id"]] = seq
+        heapq.heappush(self._heap, (-task["priority"], -created, seq, task["task_id"]))
+
+    def _transition(self, task: Dict, status: TaskStatus, **fields):
+        previous = TaskStatus(task["status"])
+        self._unindex(task)
+        task["status"] = status
+        task.update(fields)
+        self._index(task)
+        self._save(task)
+        if TELEMETRY.enabled:
+            self._observe(task, previous, status)
+
+    def _observe(self, task: Dict, previous: TaskStatus, status: TaskStatus):
+        TELEMETRY.count("queue.transitions", from_status=previous.value, to_status=status.value)
+        if status == TaskStatus.RUNNING:
+            waited = datetime.fromisoformat(task["started_at"]) - datetime.fromisoformat(task["created_at"])
+            TELEMETRY.observe("queue.wait_seconds", waited.total_seconds(), channel=task["channel"])
+        elif status in (TaskStatus.COMPLETED, TaskStatus.FAILED) and task.get("started_at"):
+            ran = datetime.fromisoformat(task["completed_at"]) - datetime.fromisoformat(task["started_at"])
+            TELEMETRY.observe("queue.run_seconds", ran.total_seconds(), channel=task["channel"], status=status.value)
+
+    def _new_task_id(self, channel: str) -> str:
+        base_id = f"{channel}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        task_id = base_id
+        suffix = 1
+        while task_id in self.tasks:
+            task_id = f"{base_id}_{suffix}"
+            suffix += 1
         return task_id
 
-    def _sort(self):
-        self.queue.sort(key=lambda t: (t["priority"], t["created_at"]), reverse=True)
-
-    def get_next(self) -> Optional[Dict]:
-        for task in self.queue:
-            if task["status"] == TaskStatus.PENDING:
-                return task
-        return None
+    def add(self, channel: str, command: str, priority: int = 0, metadata: Optional[Dict] = None) -> str:
+        with self.storage.lock():
+            self._sync()
+            task_id = self._new_task_id(channel)
+            task = {
+                "task_id": task_id,
+                "channel": channel,
+                "command": command,
+                "priority": priority,
+                "status": TaskStatus.PENDING,
+                "metadata": metadata or {},
+                "created_at": datetime.now().isoformat(),
+                "started_at": None,
+                "completed_at": None,
+                "error": None
+            }
+            self._index(task)
+            self._save(task)
+            TELEMETRY.count("queue.transitions", from_status="new", to_status=TaskStatus.PENDING.value)
+            return task_id
+
+    def get_next(self, exclude_running: bool = False) -> Optional[Dict]:
+        skipped = []
+        found = None
+        while self._heap:
+            _, _, seq, task_id = self._heap[0]
+            task = self.tasks.get(task_id)
+            if not task or task["status"] != TaskStatus.PENDING or self._heap_seq.get(task_id) != seq:
+                heapq.heappop(self._heap)
+            elif exclude_running and self.is_running(task["channel"]):
+                skipped.append(heapq.heappop(self._heap))
+            else:
+                found = task
+                break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    def claim(self, worker_id: str, lease_seconds: float = 300, exclude_running: bool = True) -> Optional[Dict]:
+        with self.storage.lock():
+            self._sync()
+            self._requeue_expired()
+            task = self.get_next(exclude_running)
+            if task:
+                now = datetime.now()
+                self._transition(
+                    task,
+                    TaskStatus.RUNNING,
+                    started_at=now.isoformat(),
+                    worker_id=worker_id,
+                    lease_expires_at=(now + timedelta(seconds=lease_seconds)).isoformat()
+                )
+            return task
+
+    def heartbeat(self, task_id: str, worker_id: str, lease_seconds: float = 300) -> bool:
+        with self.storage.lock():
+            self._sync()
+            task = self._find(task_id)
+            if not task or task["status"] != TaskStatus.RUNNING or task.get("worker_id") != worker_id:
+                return False
+            task["lease_expires_at"] = (datetime.now() + timedelta(seconds=lease_seconds)).isoformat()
+            self._save(task)
+            return True
+
+    def release(self, task_id: str, worker_id: str) -> bool:
+        with self.storage.lock():
+            self._sync()
+            task = self._find(task_id)
+            if not task or task["status"] != TaskStatus.RUNNING or task.get("worker_id") != worker_id:
+                return False
+            self._transition(task, TaskStatus.PENDING, started_at=None, worker_id=None, lease_expires_at=None)
+            return True
+
+    def requeue_expired(self) -> List[str]:
+        with self.storage.lock():
+            self._sync()
+            return self._requeue_expired()
+
+    def _requeue_expired(self) -> List[str]:
+        now = datetime.now()
+        expired = [
+            task for task in self._by_status[TaskStatus.RUNNING].values()
+            if task.get("lease_expires_at") and datetime.fromisoformat(task["lease_expires_at"]) < now
+        ]
+        for task in expired:
+            self._transition(task, TaskStatus.PENDING, started_at=None, worker_id=None, lease_expires_at=None)
+        return [task["task_id"] for task in expired]
 
     def start(self, task_id: str):
-        task = self._find(task_id)
-        if task:
-            task["status"] = TaskStatus.RUNNING
-            task["started_at"] = datetime.now().isoformat()
-            self._save()
+        with self.storage.lock():
+            self._sync()
+            task = self._find(task_id)
+            if task:
+                self._transition(task, TaskStatus.RUNNING, started_at=datetime.now().isoformat())
 
     def complete(self, task_id: str):
-        task = self._find(task_id)
-        if task:
-            task["status"] = TaskStatus.COMPLETED
-            task["completed_at"] = datetime.now().isoformat()
-            self._save()
+        with self.storage.lock():
+            self._sync()
+            task = self._find(task_id)
+            if task:
+                self._transition(task, TaskStatus.COMPLETED, completed_at=datetime.now().isoformat())
 
     def fail(self, task_id: str, error: str):
-        task = self._find(task_id)
-        if task:
-            task["status"] = TaskStatus.FAILED
-            task["completed_at"] = datetime.now().isoformat()
-            task["error"] = error
-            self._save()
+        with self.storage.lock():
+            self._sync()
+            task = self._find(task_id)
+            if task:
+                self._transition(task, TaskStatus.FAILED, completed_at=datetime.now().isoformat(), error=error)
 
     def _find(self, task_id: str) -> Optional[Dict]:
-        for task in self.queue:
-            if task["task_id"] == task_id:
-                return task
-        return None
+        return self.tasks.get(task_id)
 
     def is_running(self, channel: str) -> bool:
-        for task in self.queue:
-            if task["channel"] == channel and task["status"] == TaskStatus.RUNNING:
-                return True
-        return False
+        return bool(self._by_channel_status.get((channel, TaskStatus.RUNNING)))
 
     def list(self, status: Optional[TaskStatus] = None) -> List[Dict]:
-        if status:
-            return [t for t in self.queue if t["status"] == status]
-        return self.queue
+        tasks = self._by_status[TaskStatus(status)].values() if status else self.tasks.values()
+        return sorted(tasks, key=lambda t: (t["priority"], t["created_at"]), reverse=True)
 
     def cleanup(self, keep_recent: int = 100):
-        completed = [t for t in self.queue if t["status"] in [TaskStatus.COMPLETED, TaskStatus.FAILED]]
-        completed.sort(key=lambda t: t["completed_at"] or "", reverse=True)
-
-        to_keep = set(t["task_id"] for t in completed[:keep_recent])
-        self.queue = [t for t in self.queue if t["status"] in [TaskStatus.PENDING, TaskStatus.RUNNING] or t["task_id"] in to_keep]
-        self._save()
+        with self.storage.lock():
+            self._sync()
+            finished = [*self._by_status[TaskStatus.COMPLETED].values(), *self._by_status[TaskStatus.FAILED].values()]
+            finished.sort(key=lambda t: t["completed_at"] or "", reverse=True)
+
+            expired = finished[keep_recent:]
+            for task in expired:
+                self._unindex(task)
+            self.storage.put_many({}, deletes=[task["task_id"] for task in expired])
+            self.storage.compact()
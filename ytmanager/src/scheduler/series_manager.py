@@ -1,47 +1,43 @@
 from pathlib import Path
 from typing import Dict, List, Optional
-import json
 from datetime import datetime
+from ..storage.base import RecordStore
+from ..storage.json_store import JsonStore
 
 
 class SeriesManager:
-    def __init__(self, series_file: str = "data/series.json"):
+    def __init__(self, series_file: str = "data/series.json", storage: Optional[RecordStore] = None):
         self.series_file = Path(series_file)
         self.series_file.parent.mkdir(parents=True, exist_ok=True)
-        self.series = self._load()
-
-    def _load(self) -> Dict:
-        if self.series_file.exists():
-            with open(self.series_file) as f:
-                return json.load(f)
-        return {}
-
-    def _save(self):
-        with open(self.series_file, "w") as f:
-            json.dump(self.series, f, indent=2, ensure_ascii=False)
+        self.storage = storage or JsonStore(str(self.series_file))
+        with self.storage.lock():
+            self.series = self.storage.load()
 
     def create(self, series_id: str, title: str, episodes: int, schedule: str, prompt_template: Optional[Dict] = None) -> Dict:
-        self.series[series_id] = {
-            "title": title,
-            "total_episodes": episodes,
-            "schedule": schedule,
-            "prompt_template": prompt_template or {},
-            "episodes_produced": [],
-            "status": "active",
-            "created_at": datetime.now().isoformat()
-        }
-        self._save()
-        return self.series[series_id]
+        with self.storage.lock():
+            self.storage.refresh()
+            self.storage.put(series_id, {
+                "title": title,
+                "total_episodes": episodes,
+                "schedule": schedule,
+                "prompt_template": prompt_template or {},
+                "episodes_produced": [],
+                "status": "active",
+                "created_at": datetime.now().isoformat()
+            })
+            return self.series[series_id]
 
     def add_episode(self, series_id: str, run_id: str, episode_number: int, metadata: Optional[Dict] = None):
-        series = self.series[series_id]
-        series["episodes_produced"].append({
-            "episode": episode_number,
-            "run_id": run_id,
-            "produced_at": datetime.now().isoformat(),
-            "metadata": metadata or {}
-        })
-        self._save()
+        with self.storage.lock():
+            self.storage.refresh()
+            series = self.series[series_id]
+            series["episodes_produced"].append({
+                "episode": episode_number,
+                "run_id": run_id,
+                "produced_at": datetime.now().isoformat(),
+                "metadata": metadata or {}
+            })
+            self.storage.put(series_id, series)
 
     def get_next_episode(self, series_id: str) -> int:
         series = self.series[series_id]
@@ -52,9 +48,11 @@ class SeriesManager:
         return len(series["episodes_produced"]) >= series["total_episodes"]
 
     def complete(self, series_id: str):
-        self.series[series_id]["status"] = "completed"
-        self.series[series_id]["completed_at"] = datetime.now().isoformat()
-        self._save()
+        with self.storage.lock():
+            self.storage.refresh()
+            self.series[series_id]["status"] = "completed"
+            self.series[series_id]["completed_at"] = datetime.now().isoformat()
+            self.storage.put(series_id, self.series[series_id])
 
     def list_active(self) -> List[Dict]:
         return [{"series_id": sid, **info} for sid, info in self.series.items() if info["status"] == "active"]
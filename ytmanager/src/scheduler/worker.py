@@ -0,0 +1,206 @@
+import asyncio
+import contextlib
+import os
+import signal
+import socket
+import traceback
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from ..channels.launcher import Launcher
+from ..channels.output import RunOutput
+from ..channels.registry import ChannelRegistry
+from ..channels.run_index import RunIndex
+from ..optimizer.ab_test import ABTest
+from .queue import ExecutionQueue
+from .series_manager import SeriesManager
+
+LINE_LIMIT = 1024 * 1024
+
+
+class WorkerPool:
+    def __init__(
+        self,
+        queue: ExecutionQueue,
+        registry: ChannelRegistry,
+        concurrency: int = 2,
+        timeout: float = 3600,
+        log_dir: str = "data/logs",
+        poll_interval: float = 5.0,
+        lease_seconds: float = 300,
+        kill_grace: float = 10,
+        worker_id: Optional[str] = None,
+        experiments: Optional[ABTest] = None,
+        index: Optional[RunIndex] = None,
+        series: Optional[SeriesManager] = None
+    ):
+        self.queue = queue
+        self.registry = registry
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.kill_grace = kill_grace
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.experiments = experiments
+        self.index = index or RunIndex()
+        self.series = series
+
+    def log_path(self, task_id: str) -> Path:
+        return self.log_dir / f"{task_id}.log"
+
+    async def run(self, once: bool = False):
+        running: Set[asyncio.Task] = set()
+        try:
+            while True:
+                self._dispatch(running)
+                if not running:
+                    if once:
+                        return
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                done, running = await asyncio.wait(
+                    running, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    self._reap(task)
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    def _reap(self, task: asyncio.Task):
+        try:
+            task.result()
+        except Exception:
+            print("Worker task crashed:", flush=True)
+            traceback.print_exc()
+
+    def _dispatch(self, running: Set[asyncio.Task]):
+        while len(running) < self.concurrency:
+            task = self.queue.claim(self.worker_id, self.lease_seconds)
+            if not task:
+                return
+            running.add(asyncio.create_task(self._execute(task)))
+
+    def launcher(self, task: Dict) -> Launcher:
+        return Launcher(
+            self.registry.get(task["channel"]).project_path,
+            channel=task["channel"],
+            experiments=self.experiments,
+            index=self.index,
+            series=self.series,
+            command=task["command"]
+        )
+
+    async def _execute(self, task: Dict):
+        task_id = task["task_id"]
+        try:
+            await self._run_task(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(f"Task {task_id} failed in worker:", flush=True)
+            traceback.print_exc()
+            self.queue.fail(task_id, f"worker error: {type(exc).__name__}: {exc} (log: {self.log_path(task_id)})")
+
+    async def _run_task(self, task: Dict):
+        task_id = task["task_id"]
+        metadata = task["metadata"]
+        timeout = metadata.get("timeout", self.timeout)
+        log_path = self.log_path(task_id)
+
+        try:
+            launcher = self.launcher(task)
+        except KeyError as exc:
+            self.queue.fail(task_id, f"unknown channel: {exc}")
+            return
+        try:
+            launch = launcher.prepare(
+                metadata.get("news_query"),
+                metadata.get("dry_run", False),
+                series_id=metadata.get("series_id"),
+                episode=metadata.get("episode")
+            )
+        except Exception as exc:
+            self.queue.fail(task_id, f"launch failed: {type(exc).__name__}: {exc}")
+            return
+
+        output = RunOutput(str(log_path))
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *launch["cmd"],
+                cwd=launcher.project_path,
+                env=launch["env"],
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True,
+                limit=LINE_LIMIT
+            )
+        except (OSError, ValueError) as exc:
+            output.feed(f"{type(exc).__name__}: {exc}")
+            output.close(-1)
+            launcher.finish(launch, -1, output)
+            self.queue.fail(task_id, f"{type(exc).__name__}: {exc} (log: {log_path})")
+            return
+
+        pump = asyncio.create_task(self._pump(process.stdout, output))
+        try:
+            finished = await self._wait(task_id, process, timeout)
+        except asyncio.CancelledError:
+            try:
+                await self._terminate(process)
+                pump.cancel()
+                output.close(process.returncode)
+                launcher.finish(launch, process.returncode, output)
+            finally:
+                self.queue.release(task_id, self.worker_id)
+            raise
+        if not finished:
+            self._kill(process, signal.SIGKILL)
+            await process.wait()
+        await asyncio.wait([pump], timeout=self.poll_interval)
+        pump.cancel()
+        output.close(process.returncode)
+        launcher.finish(launch, process.returncode, output)
+
+        if not finished:
+            self.queue.fail(task_id, f"timeout after {timeout}s (log: {log_path})")
+        elif process.returncode == 0:
+            self.queue.complete(task_id)
+        else:
+            self.queue.fail(task_id, f"exit code {process.returncode} (log: {log_path})")
+
+    def _kill(self, process: asyncio.subprocess.Process, sig: int):
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(process.pid, sig)
+
+    async def _terminate(self, process: asyncio.subprocess.Process):
+        self._kill(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(asyncio.shield(process.wait()), self.kill_grace)
+        except asyncio.TimeoutError:
+            self._kill(process, signal.SIGKILL)
+            await process.wait()
+
+    async def _pump(self, stream: asyncio.StreamReader, output: RunOutput):
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            output.feed(line.decode(errors="replace"))
+
+    async def _wait(self, task_id: str, process: asyncio.subprocess.Process, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        waiter = asyncio.create_task(process.wait())
+        while not waiter.done():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.wait([waiter], timeout=min(self.lease_seconds / 3, remaining))
+            if not waiter.done():
+                self.queue.heartbeat(task_id, self.worker_id, self.lease_seconds)
+        return True
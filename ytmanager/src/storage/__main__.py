@@ -0,0 +1,24 @@
+import argparse
+from typing import List, Optional
+
+from ..channels.registry import ChannelRegistry
+from .factory import migrate_json_to_sqlite
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Storage")
+    parser.add_argument("--action", choices=["migrate"], required=True, help="Action")
+    parser.add_argument("--sqlite-path", help="SQLite database path (defaults to storage.sqlite_path in config)")
+    args = parser.parse_args(argv)
+
+    sqlite_path = args.sqlite_path or ChannelRegistry().storage.sqlite_path
+
+    if args.action == "migrate":
+        counts = migrate_json_to_sqlite(sqlite_path)
+        print(f"Migrated to {sqlite_path}:")
+        for name, count in counts.items():
+            print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from typing import Callable, ContextManager, Dict, Iterable, List, Optional, Protocol
+
+
+class RecordStore(Protocol):
+    records: Dict[str, Dict]
+
+    def load(self) -> Dict[str, Dict]: ...
+
+    def refresh(self) -> Optional[Dict[str, Optional[Dict]]]: ...
+
+    def lock(self) -> ContextManager: ...
+
+    def put(self, key: str, record: Dict): ...
+
+    def put_many(self, records: Dict[str, Dict], deletes: Iterable[str] = ()): ...
+
+    def delete(self, key: str): ...
+
+    def compact(self): ...
+
+
+class LogStore(Protocol):
+    def append(self, entry: Dict): ...
+
+    def load(self) -> List[Dict]: ...
+
+    def tail(self, limit: int, where: Optional[Callable[[Dict], bool]] = None) -> List[Dict]: ...
+
+    def range(
+        self,
+        channel: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict]: ...
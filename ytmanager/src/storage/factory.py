@@ -0,0 +1,75 @@
+from typing import Dict
+
+from .base import LogStore, RecordStore
+from .journal import JournalStore
+from .json_store import JsonStore
+
+RECORD_STORES: Dict[str, Dict] = {
+    "execution_queue": {"path": "data/execution_queue.json", "key_field": "task_id", "journal": True},
+    "cron_schedule": {"path": "data/cron_schedule.json"},
+    "series": {"path": "data/series.json"},
+    "ab_tests": {"path": "data/ab_tests.json"},
+    "ab_tests_archive": {"path": "data/ab_tests_archive.json", "journal": True},
+    "run_index": {"path": "data/run_index.json", "key_field": "run_id", "journal": True},
+}
+
+LOG_STORES: Dict[str, Dict] = {
+    "feedback_history": {
+        "path": "data/feedback_history.json",
+        "dir": "data/feedback_history",
+        "indexes": [("channel", "timestamp")]
+    },
+}
+
+
+class StorageFactory:
+    def __init__(self, backend: str = "json", sqlite_path: str = "data/ytmanager.db"):
+        self.backend = backend
+        self.sqlite_path = sqlite_path
+
+    def open(self, name: str) -> RecordStore:
+        spec = RECORD_STORES[name]
+        if self.backend == "sqlite":
+            from .sqlite_store import SqliteStore
+
+            return SqliteStore(self.sqlite_path, name, spec.get("key_field"))
+        if spec.get("journal"):
+            return JournalStore(spec["path"], spec.get("key_field"))
+        return JsonStore(spec["path"], spec.get("key_field"))
+
+    def open_log(self, name: str) -> LogStore:
+        spec = LOG_STORES[name]
+        if self.backend == "sqlite":
+            from .sqlite_store import SqliteLogStore
+
+            return SqliteLogStore(self.sqlite_path, name, spec["indexes"])
+        from .segmented_log import SegmentedLogStore
+
+        return SegmentedLogStore(spec["dir"], legacy_path=spec["path"])
+
+
+def migrate_json_to_sqlite(sqlite_path: str = "data/ytmanager.db") -> Dict[str, int]:
+    from .sqlite_store import shared_database
+
+    json_factory = StorageFactory("json")
+    sqlite_factory = StorageFactory("sqlite", sqlite_path)
+    _, transaction = shared_database(sqlite_path)
+    counts = {}
+
+    with transaction:
+        for name in RECORD_STORES:
+            source = json_factory.open(name)
+            with source.lock():
+                records = source.load()
+            target = sqlite_factory.open(name)
+            target.put_many(records)
+            counts[name] = len(records)
+
+        for name in LOG_STORES:
+            entries = json_factory.open_log(name).load()
+            target = sqlite_factory.open_log(name)
+            if not target.tail(1):
+                target.extend(entries)
+            counts[name] = len(entries)
+
+    return counts
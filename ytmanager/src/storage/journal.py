@@ -0,0 +1,114 @@
+import json
+import os
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, List, Optional
+
+from ..telemetry import TELEMETRY
+from .files import FileLock, atomic_write_text, file_identity
+
+
+class JournalStore:
+    def __init__(self, path: str, key_field: Optional[str] = None, compact_every: int = 1000, durable: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path = self.path.with_suffix(".wal")
+        self.key_field = key_field
+        self.compact_every = compact_every
+        self.durable = durable
+        self.records: Dict[str, Dict] = {}
+        self.journal_ops = 0
+        self.journal_offset = 0
+        self.snapshot_identity = None
+        self._lock = FileLock(str(self.path.with_suffix(".lock")))
+
+    @TELEMETRY.timed("storage.load", backend="journal")
+    def load(self) -> Dict[str, Dict]:
+        self.records.clear()
+        self.records.update(self._read_snapshot())
+        self.snapshot_identity = file_identity(self.path)
+        self.journal_ops = 0
+        self.journal_offset = 0
+        self._replay()
+        return self.records
+
+    def refresh(self) -> Optional[Dict[str, Optional[Dict]]]:
+        if file_identity(self.path) != self.snapshot_identity:
+            self.load()
+            return None
+        return self._replay()
+
+    def lock(self) -> ContextManager:
+        return self._lock
+
+    def put(self, key: str, record: Dict):
+        self.records[key] = record
+        self._append([{"op": "put", "key": key, "value": record}])
+
+    def put_many(self, records: Dict[str, Dict], deletes: Iterable[str] = ()):
+        ops = [{"op": "put", "key": key, "value": record} for key, record in records.items()]
+        ops += [{"op": "del", "key": key} for key in deletes]
+        if not ops:
+            return
+        for op in ops:
+            self._apply(op)
+        self._append(ops)
+
+    def delete(self, key: str):
+        self.records.pop(key, None)
+        self._append([{"op": "del", "key": key}])
+
+    @TELEMETRY.timed("storage.compact", backend="journal")
+    def compact(self):
+        data = list(self.records.values()) if self.key_field else self.records
+        atomic_write_text(self.path, json.dumps(data, ensure_ascii=False), durable=True)
+        self.snapshot_identity = file_identity(self.path)
+        with open(self.journal_path, "w"):
+            pass
+        self.journal_ops = 0
+        self.journal_offset = 0
+
+    def _read_snapshot(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        with open(self.path) as f:
+            data = json.load(f)
+        if self.key_field:
+            return {r[self.key_field]: r for r in data}
+        return data
+
+    def _replay(self) -> Dict[str, Optional[Dict]]:
+        changes: Dict[str, Optional[Dict]] = {}
+        if not self.journal_path.exists():
+            return changes
+        with open(self.journal_path, "rb+") as f:
+            f.seek(self.journal_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                op = json.loads(line)
+                if op["key"] not in changes:
+                    changes[op["key"]] = self.records.get(op["key"])
+                self._apply(op)
+                self.journal_offset += len(line)
+                self.journal_ops += 1
+            f.truncate(self.journal_offset)
+        return changes
+
+    def _apply(self, op: Dict):
+        if op["op"] == "put":
+            self.records[op["key"]] = op["value"]
+        else:
+            self.records.pop(op["key"], None)
+
+    @TELEMETRY.timed("storage.save", backend="journal")
+    def _append(self, ops: List[Dict]):
+        data = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops).encode()
+        with open(self.journal_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            if self.durable:
+                os.fsync(f.fileno())
+        self.journal_offset += len(data)
+        self.journal_ops += len(ops)
+        if self.journal_ops >= self.compact_every:
+            self.compact()
@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, Optional
+
+from ..telemetry import TELEMETRY
+from .files import FileLock, atomic_write_text, file_identity
+
+
+class JsonStore:
+    def __init__(self, path: str, key_field: Optional[str] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.key_field = key_field
+        self.records: Dict[str, Dict] = {}
+        self.identity = None
+        self._lock = FileLock(str(self.path.with_suffix(".lock")))
+
+    @TELEMETRY.timed("storage.load", backend="json")
+    def load(self) -> Dict[str, Dict]:
+        self.records.clear()
+        if self.path.exists():
+            with open(self.path) as f:
+                data = json.load(f)
+            self.records.update({r[self.key_field]: r for r in data} if self.key_field else data)
+        self.identity = file_identity(self.path)
+        return self.records
+
+    def refresh(self) -> Optional[Dict[str, Optional[Dict]]]:
+        if file_identity(self.path) == self.identity:
+            return {}
+        self.load()
+        return None
+
+    def lock(self) -> ContextManager:
+        return self._lock
+
+    def put(self, key: str, record: Dict):
+        self.records[key] = record
+        self._save()
+
+    def put_many(self, records: Dict[str, Dict], deletes: Iterable[str] = ()):
+        deletes = list(deletes)
+        if not records and not deletes:
+            return
+        self.records.update(records)
+        for key in deletes:
+            self.records.pop(key, None)
+        self._save()
+
+    def delete(self, key: str):
+        self.records.pop(key, None)
+        self._save()
+
+    def compact(self):
+        self._save()
+
+    @TELEMETRY.timed("storage.save", backend="json")
+    def _save(self):
+        data = list(self.records.values()) if self.key_field else self.records
+        atomic_write_text(self.path, json.dumps(data, indent=2, ensure_ascii=False))
+        self.identity = file_identity(self.path)
@@ -0,0 +1,30 @@
+from contextlib import nullcontext
+from typing import ContextManager, Dict, Iterable, Optional
+
+
+class MemoryStore:
+    def __init__(self):
+        self.records: Dict[str, Dict] = {}
+
+    def load(self) -> Dict[str, Dict]:
+        return self.records
+
+    def refresh(self) -> Optional[Dict[str, Optional[Dict]]]:
+        return {}
+
+    def lock(self) -> ContextManager:
+        return nullcontext()
+
+    def put(self, key: str, record: Dict):
+        self.records[key] = record
+
+    def put_many(self, records: Dict[str, Dict], deletes: Iterable[str] = ()):
+        self.records.update(records)
+        for key in deletes:
+            self.records.pop(key, None)
+
+    def delete(self, key: str):
+        self.records.pop(key, None)
+
+    def compact(self):
+        pass
@@ -0,0 +1,184 @@
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from ..telemetry import TELEMETRY
+from .files import FileLock, atomic_write_text, file_identity
+
+
+class SegmentedLogStore:
+    def __init__(self, root: str, legacy_path: Optional[str] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+        self.index: Dict[str, Dict] = {}
+        self.identity = None
+        self._lock = FileLock(str(self.root / "log.lock"))
+        with self._lock:
+            self._read_index()
+            if not self.index and legacy_path and Path(legacy_path).exists():
+                with open(legacy_path) as f:
+                    self.extend(sorted(json.load(f), key=lambda e: e.get("timestamp", "")))
+
+    def _read_index(self):
+        identity = file_identity(self.index_path)
+        if identity != self.identity:
+            self.index = json.loads(self.index_path.read_text()) if identity else {}
+            self.identity = identity
+        if not self._consistent():
+            with self._lock:
+                self.index = json.loads(self.index_path.read_text()) if self.index_path.exists() else {}
+                self.identity = file_identity(self.index_path)
+                if not self._consistent():
+                    self._rebuild_index()
+                    self._write_index()
+
+    def _consistent(self) -> bool:
+        return self._segment_sizes() == {month: meta.get("bytes") for month, meta in self.index.items()}
+
+    def _segment_sizes(self) -> Dict[str, int]:
+        sizes = {}
+        for path in self.root.iterdir():
+            if path.name.endswith((".jsonl", ".jsonl.gz")) and not path.name.startswith("."):
+                sizes[path.name.split(".")[0]] = path.stat().st_size
+        return sizes
+
+    def _rebuild_index(self):
+        self.index = {}
+        for path in sorted(self.root.glob("*.jsonl")):
+            compressed = path.with_name(f"{path.name}.gz")
+            if compressed.exists():
+                compressed.unlink()
+            data = path.read_bytes()
+            if not data.endswith(b"\n"):
+                with open(path, "r+b") as f:
+                    f.truncate(data.rfind(b"\n") + 1)
+        for path in sorted(self.root.glob("*.jsonl*")):
+            if path.name.startswith("."):
+                continue
+            month = path.name.split(".")[0]
+            self.index[month] = {"count": 0, "first": None, "last": None, "channels": {}}
+            if path.suffix == ".gz":
+                self.index[month]["compressed"] = True
+            self._index_entries(self.index[month], self._read_segment(month))
+            self.index[month]["bytes"] = path.stat().st_size
+
+    def _write_index(self):
+        atomic_write_text(self.index_path, json.dumps(self.index, ensure_ascii=False, sort_keys=True), durable=False)
+        self.identity = file_identity(self.index_path)
+
+    def _segment_path(self, month: str) -> Path:
+        compressed = self.index.get(month, {}).get("compressed")
+        return self.root / (f"{month}.jsonl.gz" if compressed else f"{month}.jsonl")
+
+    def _month(self, entry: Dict) -> str:
+        return (entry.get("timestamp") or datetime.now().isoformat())[:7]
+
+    def append(self, entry: Dict):
+        self.extend([entry])
+
+    @TELEMETRY.timed("storage.save", backend="segmented_log")
+    def extend(self, entries: List[Dict]):
+        with self._lock:
+            self._read_index()
+            by_month: Dict[str, List[Dict]] = {}
+            for entry in entries:
+                by_month.setdefault(self._month(entry), []).append(entry)
+            for month, batch in sorted(by_month.items()):
+                self._write_segment(month, batch)
+            self._compress_old()
+            self._write_index()
+
+    def _write_segment(self, month: str, entries: List[Dict]):
+        meta = self.index.setdefault(month, {"count": 0, "first": None, "last": None, "channels": {}})
+        path = self._segment_path(month)
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries).encode()
+        if meta.get("compressed"):
+            with gzip.open(path, "ab") as f:
+                f.write(data)
+        else:
+            with open(path, "ab") as f:
+                f.write(data)
+        self._index_entries(meta, entries)
+        meta["bytes"] = path.stat().st_size
+
+    def _index_entries(self, meta: Dict, entries: List[Dict]):
+        for entry in entries:
+            timestamp = entry.get("timestamp")
+            self._extend_range(meta, timestamp)
+            channel = meta["channels"].setdefault(entry.get("channel") or "", {"count": 0, "first": None, "last": None})
+            self._extend_range(channel, timestamp)
+
+    def _extend_range(self, meta: Dict, timestamp: Optional[str]):
+        meta["count"] += 1
+        if timestamp:
+            meta["first"] = min(meta["first"] or timestamp, timestamp)
+            meta["last"] = max(meta["last"] or timestamp, timestamp)
+
+    def _compress_old(self):
+        months = sorted(self.index)
+        for month in months[:-1]:
+            if self.index[month].get("compressed"):
+                continue
+            source = self.root / f"{month}.jsonl"
+            target = self.root / f"{month}.jsonl.gz"
+            temp = self.root / f".{month}.jsonl.gz.{os.getpid()}.tmp"
+            with open(source, "rb") as f, gzip.open(temp, "wb") as g:
+                shutil.copyfileobj(f, g)
+            os.replace(temp, target)
+            self.index[month]["compressed"] = True
+            self.index[month]["bytes"] = target.stat().st_size
+            source.unlink()
+
+    @TELEMETRY.timed("storage.load", backend="segmented_log")
+    def _read_segment(self, month: str) -> List[Dict]:
+        path = self._segment_path(month)
+        if not path.exists():
+            return []
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rb") as f:
+            return [json.loads(line) for line in f if line.endswith(b"\n")]
+
+    def _segments(self, newest_first: bool = False) -> Iterator[str]:
+        self._read_index()
+        return iter(sorted(self.index, reverse=newest_first))
+
+    def load(self) -> List[Dict]:
+        return [entry for month in self._segments() for entry in self._read_segment(month)]
+
+    def tail(self, limit: int, where: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        found = []
+        for month in self._segments(newest_first=True):
+            for entry in reversed(self._read_segment(month)):
+                if not where or where(entry):
+                    found.append(entry)
+                    if len(found) >= limit:
+                        return found[::-1]
+        return found[::-1]
+
+    def range(
+        self,
+        channel: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict]:
+        found = []
+        for month in self._segments():
+            meta = self.index[month]
+            if channel is not None:
+                meta = meta["channels"].get(channel)
+            if not meta:
+                continue
+            if (start and meta["last"] and meta["last"] < start) or (end and meta["first"] and meta["first"] >= end):
+                continue
+            found.extend(
+                e for e in self._read_segment(month)
+                if (not channel or e["channel"] == channel)
+                and (not start or e["timestamp"] >= start)
+                and (not end or e["timestamp"] < end)
+            )
+        return found
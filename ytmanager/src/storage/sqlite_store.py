@@ -0,0 +1,195 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..telemetry import TELEMETRY
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _field(name: str) -> str:
+    return f"json_extract(value, '$.{name}')"
+
+
+class _Transaction:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._depth = 0
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0:
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        self._lock.release()
+
+
+_DATABASES: Dict[Tuple[int, str], Tuple[sqlite3.Connection, _Transaction]] = {}
+
+
+def shared_database(db_path: str) -> Tuple[sqlite3.Connection, _Transaction]:
+    key = (os.getpid(), str(Path(db_path).resolve()))
+    if key not in _DATABASES:
+        conn = connect(db_path)
+        _DATABASES[key] = (conn, _Transaction(conn))
+    return _DATABASES[key]
+
+
+class SqliteStore:
+    def __init__(self, db_path: str, namespace: str, key_field: Optional[str] = None):
+        self.conn, self._transaction = shared_database(db_path)
+        self.table = namespace
+        self.key_field = key_field
+        self.records: Dict[str, Dict] = {}
+        self.last_seq = 0
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT, seq INTEGER NOT NULL)"
+        )
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_seq ON {self.table}(seq)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS store_meta (namespace TEXT PRIMARY KEY, purged_seq INTEGER)")
+
+    @TELEMETRY.timed("storage.load", backend="sqlite")
+    def load(self) -> Dict[str, Dict]:
+        self.records.clear()
+        for key, value in self.conn.execute(f"SELECT key, value FROM {self.table} WHERE value IS NOT NULL"):
+            self.records[key] = json.loads(value)
+        self.last_seq = self._max_seq()
+        return self.records
+
+    def refresh(self) -> Optional[Dict[str, Optional[Dict]]]:
+        if self._purged_seq() > self.last_seq:
+            self.load()
+            return None
+        changes: Dict[str, Optional[Dict]] = {}
+        rows = self.conn.execute(
+            f"SELECT key, value, seq FROM {self.table} WHERE seq > ? ORDER BY seq", (self.last_seq,)
+        )
+        for key, value, seq in rows:
+            if key not in changes:
+                changes[key] = self.records.get(key)
+            if value is None:
+                self.records.pop(key, None)
+            else:
+                self.records[key] = json.loads(value)
+            self.last_seq = seq
+        return changes
+
+    def lock(self) -> _Transaction:
+        return self._transaction
+
+    def put(self, key: str, record: Dict):
+        self.records[key] = record
+        self._write(key, json.dumps(record, ensure_ascii=False))
+
+    def put_many(self, records: Dict[str, Dict], deletes: Iterable[str] = ()):
+        with self._transaction:
+            for key, record in records.items():
+                self.put(key, record)
+            for key in deletes:
+                self.delete(key)
+
+    def delete(self, key: str):
+        self.records.pop(key, None)
+        self._write(key, None)
+
+    def compact(self):
+        with self._transaction:
+            purged = self.conn.execute(f"SELECT max(seq) FROM {self.table} WHERE value IS NULL").fetchone()[0]
+            if purged is None:
+                return
+            self.conn.execute(f"DELETE FROM {self.table} WHERE value IS NULL")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO store_meta (namespace, purged_seq) VALUES (?, ?)", (self.table, purged)
+            )
+
+    @TELEMETRY.timed("storage.save", backend="sqlite")
+    def _write(self, key: str, value: Optional[str]):
+        with self._transaction:
+            seq = self._max_seq() + 1
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, seq) VALUES (?, ?, ?)", (key, value, seq)
+            )
+        if seq == self.last_seq + 1:
+            self.last_seq = seq
+
+    def _max_seq(self) -> int:
+        return self.conn.execute(f"SELECT coalesce(max(seq), 0) FROM {self.table}").fetchone()[0]
+
+    def _purged_seq(self) -> int:
+        row = self.conn.execute("SELECT purged_seq FROM store_meta WHERE namespace = ?", (self.table,)).fetchone()
+        return row[0] if row else 0
+
+
+class SqliteLogStore:
+    def __init__(self, db_path: str, namespace: str, indexes: Sequence[Sequence[str]] = (("channel", "timestamp"),)):
+        self.conn, self._transaction = shared_database(db_path)
+        self.table = namespace
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (id INTEGER PRIMARY KEY AUTOINCREMENT, value TEXT)")
+        for fields in indexes:
+            columns = ", ".join(_field(f) for f in fields)
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_{'_'.join(fields)} ON {self.table}({columns})")
+
+    @TELEMETRY.timed("storage.save", backend="sqlite_log")
+    def append(self, entry: Dict):
+        with self._transaction:
+            self.conn.execute(
+                f"INSERT INTO {self.table} (value) VALUES (?)", (json.dumps(entry, ensure_ascii=False),)
+            )
+
+    @TELEMETRY.timed("storage.save", backend="sqlite_log")
+    def extend(self, entries: List[Dict]):
+        with self._transaction:
+            self.conn.executemany(
+                f"INSERT INTO {self.table} (value) VALUES (?)", [(json.dumps(e, ensure_ascii=False),) for e in entries]
+            )
+
+    @TELEMETRY.timed("storage.load", backend="sqlite_log")
+    def load(self) -> List[Dict]:
+        return [json.loads(value) for value, in self.conn.execute(f"SELECT value FROM {self.table} ORDER BY id")]
+
+    def tail(self, limit: int, where: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        found = []
+        for value, in self.conn.execute(f"SELECT value FROM {self.table} ORDER BY id DESC"):
+            entry = json.loads(value)
+            if not where or where(entry):
+                found.append(entry)
+                if len(found) >= limit:
+                    break
+        return found[::-1]
+
+    def range(
+        self,
+        channel: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict]:
+        clauses = []
+        params = []
+        if channel:
+            clauses.append(f"{_field('channel')} = ?")
+            params.append(channel)
+        if start:
+            clauses.append(f"{_field('timestamp')} >= ?")
+            params.append(start)
+        if end:
+            clauses.append(f"{_field('timestamp')} < ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(f"SELECT value FROM {self.table} {where} ORDER BY id", params)
+        return [json.loads(value) for value, in rows]
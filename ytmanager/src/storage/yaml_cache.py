@@ -0,0 +1,123 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..telemetry import TELEMETRY
+from .files import atomic_write_text, file_identity
+
+CACHE_DIR = Path("data/cache/yaml")
+RACY_NS = 2_000_000_000
+
+_memo: Dict[str, Dict] = {}
+
+
+@TELEMETRY.timed("yaml.parse")
+def parse_yaml(text: str) -> Any:
+    import yaml
+
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+@TELEMETRY.timed("yaml.dump")
+def dump_yaml(data: Any) -> str:
+    import yaml
+
+    return yaml.dump(data, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), allow_unicode=True, sort_keys=False)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cache_file(path: Path, cache_dir: Path) -> Path:
+    return cache_dir / f"{_digest(str(path).encode())[:16]}.json"
+
+
+def _identity(path: Path) -> Optional[List[int]]:
+    identity = file_identity(path)
+    return list(identity) if identity else None
+
+
+def _stable_identity(path: Path) -> Optional[List[int]]:
+    identity = _identity(path)
+    if identity and time.time_ns() - identity[1] < RACY_NS:
+        return None
+    return identity
+
+
+def _encode(data: Any) -> Optional[str]:
+    try:
+        encoded = json.dumps(data, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    return encoded if json.loads(encoded) == data else None
+
+
+def _lookup(path: Path, cache_dir: Optional[Path]) -> Optional[Dict]:
+    if str(path) in _memo:
+        return _memo[str(path)]
+    if cache_dir is None:
+        return None
+    cache_file = _cache_file(path, cache_dir)
+    if not cache_file.exists():
+        return None
+    try:
+        with open(cache_file) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or not {"identity", "sha256", "data"} <= entry.keys():
+        return None
+    _memo[str(path)] = entry
+    return entry
+
+
+def _remember(path: Path, digest: str, data: Any, cache_dir: Optional[Path]):
+    entry = {"identity": _stable_identity(path), "sha256": digest, "data": _encode(data)}
+    _memo[str(path)] = entry
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(_cache_file(path, cache_dir), json.dumps(entry, ensure_ascii=False), durable=False)
+
+
+@TELEMETRY.timed("storage.load", backend="yaml")
+def load_yaml(path: str, cache_dir: Optional[Path] = CACHE_DIR) -> Tuple[Any, str]:
+    path = Path(path).resolve()
+    entry = _lookup(path, cache_dir)
+    if entry and entry["data"] is not None and entry["identity"] == _identity(path):
+        TELEMETRY.count("yaml.cache", result="hit")
+        return json.loads(entry["data"]), entry["sha256"]
+
+    raw = path.read_bytes()
+    digest = _digest(raw)
+    if entry and entry["data"] is not None and entry["sha256"] == digest:
+        TELEMETRY.count("yaml.cache", result="rehash")
+        data = json.loads(entry["data"])
+    else:
+        TELEMETRY.count("yaml.cache", result="miss")
+        data = parse_yaml(raw.decode())
+    _remember(path, digest, data, cache_dir)
+    return data, digest
+
+
+def file_hash(path: str, cache_dir: Optional[Path] = CACHE_DIR) -> Optional[str]:
+    path = Path(path).resolve()
+    if not path.exists():
+        return None
+    entry = _lookup(path, cache_dir)
+    if entry and entry["identity"] == _identity(path):
+        return entry["sha256"]
+    return _digest(path.read_bytes())
+
+
+@TELEMETRY.timed("storage.save", backend="yaml")
+def save_yaml(path: str, data: Any, cache_dir: Optional[Path] = CACHE_DIR) -> Tuple[str, bool]:
+    text = dump_yaml(data)
+    digest = _digest(text.encode())
+    if file_hash(path, cache_dir) == digest:
+        return text, False
+    atomic_write_text(Path(path), text)
+    _remember(Path(path).resolve(), digest, data, cache_dir)
+    return text, True
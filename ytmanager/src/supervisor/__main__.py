@@ -0,0 +1,55 @@
+import argparse
+import json
+from typing import List, Optional
+
+from .client import DEFAULT_SOCKET, SupervisorClient
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Resident supervisor: cron, workers and a local control socket")
+    parser.add_argument(
+        "--action", choices=["start", "status", "reload", "metrics", "stop"], default="start", help="Action"
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--concurrency", type=int, default=2, help="Max parallel tasks")
+    parser.add_argument("--timeout", type=float, default=3600, help="Per-task timeout seconds")
+    parser.add_argument("--lease", type=float, default=300, help="Task lease seconds renewed by heartbeats")
+    parser.add_argument("--reload-interval", type=float, default=2.0, help="Seconds between config/state checks")
+    parser.add_argument("--no-worker", action="store_true", help="Do not run queued tasks")
+    parser.add_argument("--no-cron", action="store_true", help="Do not fire cron schedules")
+    args = parser.parse_args(argv)
+
+    if args.action != "start":
+        client = SupervisorClient.connect(args.socket)
+        if not client:
+            parser.exit(1, f"No supervisor running on {args.socket}\n")
+        if args.action == "metrics":
+            print(client.call("metrics")["prometheus"], end="")
+            return
+        method = {"status": "status", "reload": "reload", "stop": "shutdown"}[args.action]
+        print(json.dumps(client.call(method), ensure_ascii=False, indent=2))
+        return
+
+    if SupervisorClient.connect(args.socket):
+        parser.exit(1, f"Supervisor already running on {args.socket}\n")
+
+    import asyncio
+
+    from .server import Supervisor
+    from .state import SupervisorState
+
+    supervisor = Supervisor(
+        SupervisorState(system_cron=False),
+        socket_path=args.socket,
+        concurrency=args.concurrency,
+        timeout=args.timeout,
+        lease_seconds=args.lease,
+        reload_interval=args.reload_interval,
+        worker=not args.no_worker,
+        cron=not args.no_cron
+    )
+    asyncio.run(supervisor.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import itertools
+import json
+import os
+import socket
+from typing import Any, Optional
+
+DEFAULT_SOCKET = os.environ.get("YTMANAGER_SOCKET", "data/ytmanager.sock")
+
+
+class SupervisorError(RuntimeError):
+    pass
+
+
+class SupervisorClient:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(socket_path)
+        self._reader = self._sock.makefile("rb")
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def connect(cls, socket_path: str = DEFAULT_SOCKET) -> Optional["SupervisorClient"]:
+        if not os.path.exists(socket_path):
+            return None
+        try:
+            return cls(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return None
+
+    def call(self, method: str, **params) -> Any:
+        request = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        self._sock.sendall(json.dumps(request, ensure_ascii=False).encode() + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise SupervisorError("supervisor closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise SupervisorError(response["error"]["message"])
+        return response["result"]
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
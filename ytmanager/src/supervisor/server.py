@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+import signal
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..channels.run_index import RunIndex
+from ..optimizer.ab_test import ABTest
+from ..scheduler.cron_scheduler import CronScheduler
+from ..scheduler.queue import TaskStatus
+from ..scheduler.worker import WorkerPool
+from ..storage.factory import StorageFactory
+from ..telemetry import TELEMETRY
+from .client import DEFAULT_SOCKET, SupervisorClient
+from .state import SupervisorState
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+SERVER_ERROR = -32000
+
+
+class Supervisor:
+    def __init__(
+        self,
+        state: SupervisorState,
+        socket_path: str = DEFAULT_SOCKET,
+        concurrency: int = 2,
+        timeout: float = 3600,
+        lease_seconds: float = 300,
+        reload_interval: float = 2.0,
+        worker: bool = True,
+        cron: bool = True
+    ):
+        self.state = state
+        self.socket_path = Path(socket_path)
+        self.reload_interval = reload_interval
+        if cron:
+            state.sync_cron(state.registry.list())
+        self.scheduler = CronScheduler(state.cron, state.queue) if cron else None
+        storage = StorageFactory(state.registry.storage.backend, state.registry.storage.sqlite_path)
+        self.pool = WorkerPool(
+            state.queue,
+            state.registry,
+            concurrency=concurrency,
+            timeout=timeout,
+            poll_interval=1.0,
+            lease_seconds=lease_seconds,
+            experiments=ABTest(storage=storage.open("ab_tests"), archive=storage.open("ab_tests_archive")),
+            index=RunIndex(storage=storage.open("run_index")),
+            series=state.series
+        ) if worker else None
+        self.started_at = time.time()
+        self.reloads: List[Dict] = []
+        self._stop: Optional[asyncio.Event] = None
+        self._clients: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self.state.methods.update({
+            "ping": self.ping,
+            "status": self.status,
+            "reload": self.reload,
+            "shutdown": self.shutdown,
+            "metrics": self.metrics,
+        })
+
+    def ping(self) -> Dict:
+        return {"pid": os.getpid(), "uptime": time.time() - self.started_at}
+
+    def status(self) -> Dict:
+        queue = self.state.queue
+        upcoming = self.scheduler.next_fire() if self.scheduler else None
+        return {
+            **self.ping(),
+            "socket": str(self.socket_path),
+            "channels": len(self.state.registry.list()),
+            "queue": {status.value: len(queue.list(status)) for status in TaskStatus},
+            "running": [task["task_id"] for task in queue.list(TaskStatus.RUNNING)],
+            "worker": bool(self.pool),
+            "cron": bool(self.scheduler),
+            "next_fire": {"at": upcoming[0].isoformat(), "channel": upcoming[1]} if upcoming else None,
+            "reloads": self.reloads[-10:],
+        }
+
+    def reload(self) -> List[str]:
+        changed = self.state.reload()
+        if changed:
+            self.reloads.append({"at": datetime.now().isoformat(), "channels": changed})
+            print(f"Reloaded channels: {', '.join(changed)}", flush=True)
+            if self.scheduler:
+                self.scheduler.rebuild()
+        return changed
+
+    def metrics(self) -> Dict:
+        return {"enabled": TELEMETRY.enabled, "prometheus": TELEMETRY.prometheus(), **TELEMETRY.snapshot()}
+
+    def shutdown(self) -> bool:
+        self._stop.set()
+        return True
+
+    def dispatch(self, line: bytes) -> Dict:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as exc:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(exc)}}
+        if not isinstance(request, dict):
+            message = f"request must be an object, got {type(request).__name__}"
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": message}}
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        method = request.get("method")
+        if method not in self.state.methods:
+            response["error"] = {"code": METHOD_NOT_FOUND, "message": f"unknown method: {method}"}
+            return response
+        try:
+            response["result"] = self.state.call(method, **request.get("params", {}))
+        except Exception as exc:
+            response["error"] = {"code": SERVER_ERROR, "message": f"{type(exc).__name__}: {exc}"}
+        return response
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError) as exc:
+                    print(f"Closing client connection: {exc}", flush=True)
+                    message = f"request line too long: {exc}"
+                    await self._reply(writer, {"jsonrpc": "2.0", "id": None, "error": {
+                        "code": INVALID_REQUEST, "message": message
+                    }})
+                    break
+                if not line:
+                    break
+                await self._reply(writer, self.dispatch(line))
+        except (ConnectionResetError, BrokenPipeError) as exc:
+            print(f"Client connection lost: {type(exc).__name__}: {exc}", flush=True)
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    async def _reply(self, writer: asyncio.StreamWriter, response: Dict):
+        writer.write(json.dumps(response, ensure_ascii=False, default=str).encode() + b"\n")
+        await writer.drain()
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                self.state.refresh()
+                self.reload()
+            except Exception as exc:
+                print(f"Reload failed, keeping current config: {type(exc).__name__}: {exc}", flush=True)
+
+    def _claim_socket(self):
+        client = SupervisorClient.connect(str(self.socket_path))
+        if client:
+            client.close()
+            raise RuntimeError(f"supervisor already running on {self.socket_path}")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+
+    async def run(self):
+        self._claim_socket()
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self._stop.set)
+
+        server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+        self.socket_path.chmod(0o600)
+        tasks = [asyncio.create_task(self._watch())]
+        if self.scheduler:
+            tasks.append(asyncio.create_task(self.scheduler.run()))
+        if self.pool:
+            tasks.append(asyncio.create_task(self.pool.run()))
+        print(f"Supervisor listening on {self.socket_path} (pid {os.getpid()})", flush=True)
+
+        await self._stop.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        server.close()
+        handlers = list(self._clients.values())
+        for writer in list(self._clients):
+            writer.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await server.wait_closed()
+        self.socket_path.unlink(missing_ok=True)
+        print("Supervisor stopped", flush=True)
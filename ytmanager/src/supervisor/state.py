@@ -0,0 +1,70 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from ..channels.registry import ChannelRegistry
+from ..scheduler.cron_manager import CronManager
+from ..scheduler.queue import ExecutionQueue
+from ..scheduler.series_manager import SeriesManager
+from ..storage.factory import StorageFactory
+
+DEFAULT_COMMAND = "uv run python -m src.main"
+
+
+class SupervisorState:
+    def __init__(self, config_path: str = "config/channels.yaml", system_cron: bool = False):
+        self.registry = ChannelRegistry(config_path)
+        storage = StorageFactory(self.registry.storage.backend, self.registry.storage.sqlite_path)
+        self.cron = CronManager(storage=storage.open("cron_schedule"), system_cron=system_cron)
+        self.series = SeriesManager(storage=storage.open("series"))
+        self.queue = ExecutionQueue(storage=storage.open("execution_queue"))
+        self.methods: Dict[str, Callable[..., Any]] = {
+            "channels.list": self.registry.list,
+            "channels.get": lambda name: self.registry.get(name).model_dump(),
+            "queue.add": self.enqueue,
+            "queue.list": self.queue.list,
+            "queue.get": lambda task_id: self.queue.tasks.get(task_id),
+            "cron.list": self.cron.list,
+            "series.list": self.series.list_active,
+            "series.get": self.series.get,
+            "reload": self.reload,
+        }
+
+    def call(self, method: str, **params) -> Any:
+        if method not in self.methods:
+            raise KeyError(f"unknown method: {method}")
+        return self.methods[method](**params)
+
+    def enqueue(
+        self,
+        channel: str,
+        command: str = DEFAULT_COMMAND,
+        priority: int = 0,
+        metadata: Optional[Dict] = None
+    ) -> str:
+        self.registry.get(channel)
+        return self.queue.add(channel, command, priority=priority, metadata=metadata)
+
+    def refresh(self):
+        self.queue.refresh()
+        with self.series.storage.lock():
+            self.series.storage.refresh()
+        with self.cron.storage.lock():
+            self.cron.storage.refresh()
+
+    def sync_cron(self, channels: List[str]) -> List[str]:
+        updated = []
+        for name in channels:
+            if name not in self.registry.channel_names:
+                if name in self.cron.schedule:
+                    self.cron.remove(name)
+                    updated.append(name)
+                continue
+            schedule = self.registry.get(name).schedule
+            if self.cron.schedule.get(name, {}).get("cron") != schedule:
+                self.cron.add(name, schedule, DEFAULT_COMMAND)
+                updated.append(name)
+        return updated
+
+    def reload(self) -> List[str]:
+        changed = self.registry.reload()
+        self.sync_cron(changed)
+        return changed
@@ -0,0 +1,255 @@
+import bisect
+import functools
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0, 3600.0)
+PREFIX = "ytmanager_"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_NOOP = nullcontext()
+_current_span: ContextVar[Optional[int]] = ContextVar("ytmanager_span", default=None)
+_span_ids = itertools.count(1)
+
+
+def metric_name(name: str) -> str:
+    return PREFIX + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def label_key(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    return repr(float(value))
+
+
+def format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [*labels, extra] if extra else list(labels)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in pairs) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        running = list(itertools.accumulate(self.counts))
+        return [*((repr(bound), running[i]) for i, bound in enumerate(self.buckets)), ("+Inf", running[-1])]
+
+
+class Span:
+    def __init__(self, telemetry: "Telemetry", name: str, labels: Dict[str, Any]):
+        self.telemetry = telemetry
+        self.name = name
+        self.labels = labels
+        self.span_id = next(_span_ids)
+
+    def __enter__(self) -> "Span":
+        self.parent_id = _current_span.get()
+        self._token = _current_span.set(self.span_id)
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        status = "error" if exc_type else "ok"
+        self.telemetry.observe(f"{self.name}.seconds", duration, **self.labels)
+        if exc_type:
+            self.telemetry.count(f"{self.name}.errors", **self.labels)
+        if not self.telemetry._trace:
+            return False
+        self.telemetry.emit({
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "pid": os.getpid(),
+            "start": self.started_at,
+            "duration": duration,
+            "status": status,
+            "error": f"{exc_type.__name__}: {exc}" if exc_type else None,
+            "labels": {key: str(value) for key, value in self.labels.items()},
+        })
+        return False
+
+
+class Telemetry:
+    def __init__(self, enabled: bool = False, trace_path: Optional[str] = None, sinks: Optional[List[Any]] = None):
+        self.enabled = False
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.sinks: List[Any] = []
+        self.trace_path: Optional[Path] = None
+        self._trace = None
+        self._lock = threading.Lock()
+        if enabled:
+            self.enable(trace_path, sinks)
+
+    @classmethod
+    def from_env(cls) -> "Telemetry":
+        setting = os.environ.get("YTMANAGER_TELEMETRY", "")
+        if setting.lower() in ("", "0", "false", "off"):
+            return cls()
+        trace_path = None if setting.lower() in ("1", "true", "on") else setting
+        aim_repo = os.environ.get("YTMANAGER_TELEMETRY_AIM")
+        return cls(enabled=True, trace_path=trace_path, sinks=[AimSink(aim_repo)] if aim_repo else None)
+
+    def enable(self, trace_path: Optional[str] = None, sinks: Optional[List[Any]] = None):
+        if trace_path:
+            self.trace_path = Path(trace_path)
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            self._trace = open(self.trace_path, "a", buffering=1)
+        self.sinks.extend(sinks or [])
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self._trace:
+            self._trace.close()
+            self._trace = None
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def span(self, name: str, **labels) -> ContextManager:
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, labels)
+
+    def timed(self, name: str, **labels) -> Callable:
+        def decorate(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with Span(self, name, labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, label_key(labels))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    def track(self, name: str, value: float, **context):
+        if not self.enabled:
+            return
+        for sink in self.sinks:
+            sink.track(name, value, context)
+
+    def emit(self, record: Dict):
+        if self._trace:
+            line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            with self._lock:
+                self._trace.write(line)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), "count": h.count, "sum": h.sum, "buckets": list(h.counts)}
+                    for (name, labels), h in sorted(self.histograms.items(), key=lambda item: item[0])
+                ],
+            }
+
+    def merge(self, snapshot: Dict):
+        with self._lock:
+            for counter in snapshot.get("counters", []):
+                key = (counter["name"], label_key(counter["labels"]))
+                self.counters[key] = self.counters.get(key, 0) + counter["value"]
+            for item in snapshot.get("histograms", []):
+                key = (item["name"], label_key(item["labels"]))
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram()
+                h = self.histograms[key]
+                h.counts = [a + b for a, b in zip(h.counts, item["buckets"])]
+                h.sum += item["sum"]
+                h.count += item["count"]
+
+    def prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE {metric_name(name)}_total counter")
+            for (counter, labels), value in counters:
+                if counter == name:
+                    lines.append(f"{metric_name(name)}_total{format_labels(labels)} {format_value(value)}")
+        for name in sorted({name for (name, _), _ in histograms}):
+            lines.append(f"# TYPE {metric_name(name)} histogram")
+            for (histogram, labels), h in histograms:
+                if histogram != name:
+                    continue
+                for bound, cumulative in h.cumulative():
+                    lines.append(f"{metric_name(name)}_bucket{format_labels(labels, ('le', bound))} {cumulative}")
+                lines.append(f"{metric_name(name)}_sum{format_labels(labels)} {format_value(h.sum)}")
+                lines.append(f"{metric_name(name)}_count{format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        from .storage.files import atomic_write_text
+
+        atomic_write_text(Path(path), self.prometheus(), durable=False)
+
+
+class AimSink:
+    def __init__(self, repo: Optional[str] = None, experiment: str = "ytmanager"):
+        from aim import Run
+
+        self.run = Run(repo=repo, experiment=experiment)
+
+    def track(self, name: str, value: float, context: Dict[str, Any]):
+        self.run.track(value, name=name, context={key: str(item) for key, item in context.items()})
+
+    def close(self):
+        self.run.close()
+
+
+TELEMETRY = Telemetry.from_env()
@@ -0,0 +1,40 @@
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from src.channels.registry import ChannelRegistry
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    path = tmp_path / "project"
+    (path / "config").mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def registry(tmp_path, project) -> ChannelRegistry:
+    config = tmp_path / "config" / "channels.yaml"
+    config.parent.mkdir(parents=True, exist_ok=True)
+    config.write_text(textwrap.dedent(f"""\
+        templates:
+          default:
+            youtube_channel_id: UC_test
+            schedule: "0 6 * * *"
+            analytics:
+              metrics: [views]
+            optimizer:
+              enabled: true
+        channels:
+          demo:
+            extends: default
+            project_path: {project}
+    """))
+    return ChannelRegistry(str(config))
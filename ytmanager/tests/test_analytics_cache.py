@@ -0,0 +1,115 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.analytics import cache as cache_module
+from src.analytics.cache import CHANNEL_METRICS, AnalyticsCache, date_range
+
+START = date(2026, 3, 1)
+END = date(2026, 3, 10)
+
+
+class Clock:
+    now = datetime(2026, 3, 10, 12, 0)
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return Clock.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(cache_module, "datetime", FixedDatetime)
+    Clock.now = datetime(2026, 3, 10, 12, 0)
+    return Clock
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalyticsCache(str(tmp_path / "cache"), settle_days=3, ttl_hours=6)
+
+
+class Fetcher:
+    def __init__(self):
+        self.spans = []
+
+    def __call__(self, start: date, end: date) -> dict:
+        self.spans.append((start.isoformat(), end.isoformat()))
+        rows = [[day.isoformat(), 100 + day.day] for day in date_range(start, end)]
+        return {"columnHeaders": [{"name": "day"}, {"name": "views"}], "rows": rows}
+
+
+def report(cache: AnalyticsCache, fetch: Fetcher, start: date = START, end: date = END) -> dict:
+    return cache.get_report("UC_test", CHANNEL_METRICS, start, end, fetch)
+
+
+@pytest.mark.unit
+class TestAnalyticsCache:
+    def test_first_read_fetches_the_whole_window(self, cache, clock):
+        fetch = Fetcher()
+
+        result = report(cache, fetch)
+
+        assert fetch.spans == [("2026-03-01", "2026-03-10")]
+        assert [row[0] for row in result["rows"]] == [day.isoformat() for day in date_range(START, END)]
+
+    def test_unsettled_days_are_served_from_cache_within_ttl(self, cache, clock):
+        fetch = Fetcher()
+        report(cache, fetch)
+
+        clock.now += timedelta(hours=5, minutes=59)
+        report(cache, fetch)
+
+        assert len(fetch.spans) == 1
+
+    def test_only_unsettled_days_are_refetched_after_ttl(self, cache, clock):
+        fetch = Fetcher()
+        report(cache, fetch)
+
+        clock.now += timedelta(hours=6)
+        report(cache, fetch)
+
+        assert fetch.spans[1:] == [("2026-03-08", "2026-03-10")]
+
+    def test_settled_days_are_kept_forever(self, cache, clock):
+        fetch = Fetcher()
+        report(cache, fetch)
+
+        clock.now = datetime(2027, 3, 10)
+        report(cache, fetch)
+        report(cache, fetch)
+
+        assert fetch.spans[1:] == [("2026-03-08", "2026-03-10")]
+
+    def test_settled_boundary_is_midnight_after_settle_days(self, cache, clock):
+        clock.now = datetime(2026, 3, 10, 0, 0)
+        report(cache, Fetcher())
+
+        settled = cache.settled_days("UC_test", CHANNEL_METRICS, START, END)
+
+        assert sorted(settled) == [day.isoformat() for day in date_range(START, date(2026, 3, 7))]
+        assert settled["2026-03-07"] == {"views": 107}
+        assert cache.stale_days("UC_test", CHANNEL_METRICS, START, END) == []
+        clock.now += timedelta(hours=6)
+        assert cache.stale_days("UC_test", CHANNEL_METRICS, START, END) == [
+            date(2026, 3, 8), date(2026, 3, 9), date(2026, 3, 10)
+        ]
+
+    def test_refetched_days_become_settled(self, cache, clock):
+        fetch = Fetcher()
+        report(cache, fetch)
+        assert "2026-03-08" not in cache.settled_days("UC_test", CHANNEL_METRICS, START, END)
+
+        clock.now = datetime(2026, 3, 11, 0, 0)
+        report(cache, fetch)
+
+        assert "2026-03-08" in cache.settled_days("UC_test", CHANNEL_METRICS, START, END)
+        assert "2026-03-09" not in cache.settled_days("UC_test", CHANNEL_METRICS, START, END)
+
+    def test_missing_rows_are_not_settled(self, cache, clock):
+        cache.get_report("UC_test", CHANNEL_METRICS, START, END, lambda start, end: {"rows": []})
+
+        assert report(cache, Fetcher())["rows"] == []
+        assert cache.settled_days("UC_test", CHANNEL_METRICS, START, END) == {}
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+import requests
+
+from src.analytics.bulk import BulkAnalyticsFetcher, BulkFetchError
+from src.analytics.fake_server import FakeYouTubeServer, video_row
+from src.analytics.quota import QuotaGuard, QuotaLedger, TokenBucket
+
+START = datetime(2026, 3, 1)
+END = datetime(2026, 3, 7)
+
+
+@pytest.fixture
+def server():
+    with FakeYouTubeServer(videos_per_channel=120) as server:
+        yield server
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return QuotaLedger(str(tmp_path / "quota_ledger.json"))
+
+
+@pytest.fixture
+def fetcher(server, ledger):
+    return BulkAnalyticsFetcher(
+        requests.Session(),
+        max_workers=4,
+        chunk_size=50,
+        data_api_url=f"{server.url}/youtube/v3",
+        analytics_api_url=f"{server.url}/v2",
+        quota=QuotaGuard(ledger, TokenBucket(rate=1000, capacity=1000))
+    )
+
+
+def requests_to(server: FakeYouTubeServer, suffix: str) -> list:
+    return [params for path, params in server.request_log if path.endswith(suffix)]
+
+
+@pytest.mark.integration
+class TestBulkAnalyticsFetcher:
+    def test_lists_every_page(self, fetcher, server):
+        video_ids = fetcher.list_channel_video_ids("UC1")
+
+        assert video_ids == [f"UC1_v{i:05d}" for i in range(120)]
+        assert [params.get("pageToken") for params in requests_to(server, "/search")] == [None, "50", "100"]
+
+    def test_limit_stops_paging(self, fetcher, server):
+        assert len(fetcher.list_channel_video_ids("UC1", limit=60)) == 60
+        assert len(requests_to(server, "/search")) == 2
+
+    def test_fetch_channel_batches_video_reports(self, fetcher, server):
+        report = fetcher.fetch_channel("UC1", START, END)
+
+        reports = requests_to(server, "/reports")
+        assert [len(params["filters"].split("==")[1].split(",")) for params in reports] == [50, 50, 20]
+        assert all(params["ids"] == "channel==UC1" for params in reports)
+        assert [h["name"] for h in report["columnHeaders"]][:2] == ["video", "views"]
+        assert report["rows"] == [video_row(f"UC1_v{i:05d}", "2026-03-01", "2026-03-07") for i in range(120)]
+
+    def test_fetch_channels_in_parallel(self, fetcher, ledger):
+        channels = ["UC1", "UC2", "UC3"]
+
+        reports = fetcher.fetch_channels(channels, START, END)
+
+        assert sorted(reports) == channels
+        for channel in channels:
+            assert {row[0].split("_v")[0] for row in reports[channel]["rows"]} == {channel}
+            assert len(reports[channel]["rows"]) == 120
+        usage = ledger.usage()
+        assert usage["calls"] == 18
+        assert usage["used"] == fetcher.estimate_quota({channel: 120 for channel in channels})
+        assert usage["by_method"]["youtube.search.list"] == 9 * QuotaGuard.cost("youtube.search.list")
+
+    def test_failed_channel_keeps_the_other_results(self, fetcher, ledger, monkeypatch):
+        fetch_channel = fetcher.fetch_channel
+
+        def flaky(channel_id, *args):
+            if channel_id == "UC2":
+                raise requests.HTTPError("404 channel not found")
+            return fetch_channel(channel_id, *args)
+
+        monkeypatch.setattr(fetcher, "fetch_channel", flaky)
+
+        with pytest.raises(BulkFetchError) as error:
+            fetcher.fetch_channels(["UC1", "UC2", "UC3"], START, END)
+
+        assert sorted(error.value.results) == ["UC1", "UC3"]
+        assert len(error.value.results["UC3"]["rows"]) == 120
+        assert list(error.value.errors) == ["UC2"]
+        assert "UC2" in str(error.value)
+        assert ledger.usage()["calls"] == 12
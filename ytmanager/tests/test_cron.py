@@ -0,0 +1,110 @@
+import subprocess
+from datetime import datetime
+
+import pytest
+
+from src.scheduler import cron_manager
+from src.scheduler.cron import CronExpression, parse_field
+from src.scheduler.cron_manager import CronManager
+
+
+def next_fire(expression: str, moment: str) -> str:
+    return CronExpression(expression).next_after(datetime.fromisoformat(moment)).isoformat(timespec="minutes")
+
+
+@pytest.mark.unit
+class TestParseField:
+    def test_steps_ranges_and_lists(self):
+        assert parse_field("*/15", 0, 59) == {0, 15, 30, 45}
+        assert parse_field("5/20", 0, 59) == {5, 25, 45}
+        assert parse_field("1-5/2,10", 0, 59) == {1, 3, 5, 10}
+
+    def test_names(self):
+        expression = CronExpression("0 9 * jan-mar mon-fri")
+        assert expression.months == {1, 2, 3}
+        assert expression.weekdays == {1, 2, 3, 4, 5}
+
+    @pytest.mark.parametrize("expression", ["60 * * * *", "* 24 * * *", "* * 0 * *", "5-1 * * * *", "* * * *"])
+    def test_invalid_expressions(self, expression):
+        with pytest.raises(ValueError):
+            CronExpression(expression)
+
+
+@pytest.mark.unit
+class TestNextAfter:
+    @pytest.mark.parametrize("expression, moment, expected", [
+        ("0 6 * * *", "2026-03-10T05:59:30", "2026-03-10T06:00"),
+        ("0 6 * * *", "2026-03-10T06:00:00", "2026-03-11T06:00"),
+        ("*/15 * * * *", "2026-03-10T10:44:59", "2026-03-10T10:45"),
+        ("59 23 31 12 *", "2026-12-31T23:59:00", "2027-12-31T23:59"),
+        ("0 0 1 * *", "2026-01-31T12:00:00", "2026-02-01T00:00"),
+        ("0 0 31 * *", "2026-04-01T00:00:00", "2026-05-31T00:00"),
+        ("0 0 29 2 *", "2026-03-01T00:00:00", "2028-02-29T00:00"),
+        ("30 8 * * 7", "2026-03-10T00:00:00", "2026-03-15T08:30"),
+        ("30 8 * * 0", "2026-03-10T00:00:00", "2026-03-15T08:30"),
+        ("0 12 * * sat", "2026-03-14T12:00:00", "2026-03-21T12:00"),
+        ("@hourly", "2026-03-10T10:00:00", "2026-03-10T11:00"),
+        ("@weekly", "2026-03-10T10:00:00", "2026-03-15T00:00"),
+    ])
+    def test_next_fire(self, expression, moment, expected):
+        assert next_fire(expression, moment) == expected
+
+    def test_day_of_month_or_day_of_week(self):
+        runs = CronExpression("0 0 13 * fri").next_runs(datetime(2026, 3, 1), 3)
+        assert [run.date().isoformat() for run in runs] == ["2026-03-06", "2026-03-13", "2026-03-20"]
+
+    def test_starred_step_day_is_not_ored_with_day_of_week(self):
+        runs = CronExpression("0 0 */2 * mon").next_runs(datetime(2026, 3, 1), 3)
+        assert [run.date().isoformat() for run in runs] == ["2026-03-09", "2026-03-23", "2026-04-13"]
+
+    def test_next_runs_are_strictly_increasing(self):
+        runs = CronExpression("0 */6 * * mon-fri").next_runs(datetime(2026, 3, 13, 20, 0), 4)
+        assert [run.isoformat(timespec="minutes") for run in runs] == [
+            "2026-03-16T00:00", "2026-03-16T06:00", "2026-03-16T12:00", "2026-03-16T18:00",
+        ]
+
+    def test_impossible_date_never_fires(self):
+        with pytest.raises(ValueError, match="never fires"):
+            CronExpression("0 0 31 2 *").next_after(datetime(2026, 1, 1))
+
+
+@pytest.mark.unit
+class TestSystemCrontab:
+    def fake_crontab(self, monkeypatch, installed: str):
+        calls = []
+
+        def run(args, input=None, **kwargs):
+            calls.append((args, input))
+            return subprocess.CompletedProcess(args, 0, stdout=installed if args[1] == "-l" else "")
+
+        monkeypatch.setattr(cron_manager.subprocess, "run", run)
+        return calls
+
+    def test_disabled_by_default(self, tmp_path, monkeypatch):
+        calls = self.fake_crontab(monkeypatch, "")
+        manager = CronManager(str(tmp_path / "cron.json"))
+        manager.add("ch", "0 6 * * *", "run ch")
+        manager.disable("ch")
+        assert calls == []
+
+    def test_rewrites_only_the_marked_block(self, tmp_path, monkeypatch):
+        block = f"{cron_manager.BLOCK_BEGIN}\n0 0 * * * stale\n{cron_manager.BLOCK_END}\n"
+        installed = f"MAILTO=me\n0 1 * * * backup\n{block}"
+        calls = self.fake_crontab(monkeypatch, installed)
+        manager = CronManager(str(tmp_path / "cron.json"), system_cron=True)
+        manager.add("ch", "0 6 * * *", "run ch")
+        manager.add("other", "0 7 * * *", "run other")
+        manager.remove("missing")
+
+        assert [args for args, _ in calls] == [["crontab", "-l"], ["crontab", "-"], ["crontab", "-"]]
+        assert calls[-1][1].splitlines() == [
+            "MAILTO=me", "0 1 * * * backup", cron_manager.BLOCK_BEGIN, "0 6 * * * run ch", "0 7 * * * run other",
+            cron_manager.BLOCK_END,
+        ]
+
+    def test_skips_write_when_block_is_current(self, tmp_path, monkeypatch):
+        installed = f"{cron_manager.BLOCK_BEGIN}\n0 6 * * * run ch\n{cron_manager.BLOCK_END}\n"
+        calls = self.fake_crontab(monkeypatch, installed)
+        manager = CronManager(str(tmp_path / "cron.json"), system_cron=True)
+        manager.add("ch", "0 6 * * *", "run ch")
+        assert [args for args, _ in calls] == [["crontab", "-l"]]
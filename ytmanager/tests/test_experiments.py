@@ -0,0 +1,137 @@
+import asyncio
+import json
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from src.analytics.cache import CHANNEL_METRICS, AnalyticsCache
+from src.channels.run_index import RunIndex
+from src.optimizer.ab_test import ABTest
+from src.optimizer.feedback_loop import FeedbackLoop
+from src.optimizer.results import ExperimentResults
+from src.scheduler.queue import ExecutionQueue, TaskStatus
+from src.scheduler.worker import WorkerPool
+
+HOOK = "\n\nOpen with the single most surprising fact."
+CAPTURE = (
+    "sh -c 'mkdir -p \"$YTMANAGER_RUN_DIR\"; "
+    "echo \"$YTMANAGER_ASSIGNMENT\" > \"$YTMANAGER_RUN_DIR/assignment.json\"; "
+    "cp \"$YTMANAGER_PROMPTS_PATH\" \"$YTMANAGER_RUN_DIR/prompts.yaml\"'"
+)
+
+
+@pytest.fixture
+def prompts(project):
+    path = project / "config" / "prompts.yaml"
+    path.write_text("news_prompt: news\nscript_prompt: script\nmetadata_prompt: metadata\n")
+    return path
+
+
+@pytest.fixture
+def ab(tmp_path):
+    ab = ABTest(str(tmp_path / "ab_tests.json"))
+    ab.create_experiment(
+        "hook", {"control": {}, "hook": {"script_prompt": HOOK}}, control="control", channels=["demo"],
+        primary_metric="views"
+    )
+    return ab
+
+
+@pytest.fixture
+def index(tmp_path):
+    return RunIndex(str(tmp_path / "run_index.json"))
+
+
+def run_tasks(registry, ab: ABTest, index: RunIndex, count: int) -> ExecutionQueue:
+    queue = ExecutionQueue("execution_queue.json")
+    for _ in range(count):
+        queue.add("demo", CAPTURE)
+    pool = WorkerPool(
+        queue, registry, concurrency=4, poll_interval=0.05, lease_seconds=5, experiments=ab, index=index
+    )
+    asyncio.run(pool.run(once=True))
+    queue.refresh()
+    return queue
+
+
+def backdate(index: RunIndex, run: dict, day: date):
+    finished = datetime.combine(day, time(12))
+    started = finished - timedelta(minutes=5)
+    index.record({**run, "started_at": started.isoformat(), "finished_at": finished.isoformat()})
+
+
+def cache_views(cache: AnalyticsCache, views: dict):
+    days = sorted(views)
+    rows = [[day.isoformat(), views[day]] for day in days]
+    report = {"columnHeaders": [{"name": "day"}, {"name": "views"}], "rows": rows}
+    cache.get_report("UC_test", CHANNEL_METRICS, days[0], days[-1], lambda start, end: report)
+
+
+@pytest.mark.integration
+class TestExperimentLoop:
+    def test_worker_serves_the_assigned_arm(self, registry, project, prompts, ab, index):
+        queue = run_tasks(registry, ab, index, 1)
+
+        assert [task["status"] for task in queue.list()] == [TaskStatus.COMPLETED]
+        run = index.latest("demo")
+        assert set(run["assignment"]) == {"hook"}
+        assert json.loads(open(run["outputs"]["assignment"]).read()) == run["assignment"]
+        served = project / "runs" / run["run_id"] / "prompts.yaml"
+        assert (HOOK.strip() in served.read_text()) == (run["assignment"]["hook"] == "hook")
+        assert prompts.read_text().count(HOOK.strip()) == 0
+
+    def test_unsettled_days_are_not_ingested(self, registry, prompts, ab, index, tmp_path):
+        run_tasks(registry, ab, index, 1)
+        cache = AnalyticsCache(str(tmp_path / "cache"))
+        cache_views(cache, {date.today(): 100})
+
+        results = ExperimentResults(ab, index, cache)
+
+        assert results.ingest("demo", "UC_test") == 0
+        assert len(results.pending("demo")) == 1
+
+    def test_crash_before_marking_runs_does_not_double_ingest(self, registry, prompts, ab, index, tmp_path):
+        run_tasks(registry, ab, index, 4)
+        day = date.today() - timedelta(days=5)
+        for run in index.for_channel("demo"):
+            backdate(index, run, day)
+        cache = AnalyticsCache(str(tmp_path / "cache"))
+        cache_views(cache, {day: 100})
+        crashing = RunIndex(str(tmp_path / "run_index.json"))
+
+        def crash(run):
+            raise OSError("killed")
+
+        crashing.record = crash
+        with pytest.raises(OSError):
+            ExperimentResults(ab, crashing, cache).ingest("demo", "UC_test")
+
+        assert ExperimentResults(ab, index, cache).ingest("demo", "UC_test") == 0
+        assert ExperimentResults(ab, index, cache).pending("demo") == []
+        assert sum(result["runs"] for result in ab.tests["hook"]["results"].values()) == 4
+
+    def test_experiment_runs_to_a_conclusion(self, registry, prompts, ab, index, tmp_path):
+        random.seed(3)
+        rng = random.Random(3)
+        run_tasks(registry, ab, index, 40)
+        runs = index.for_channel("demo")
+        views = {}
+        for i, run in enumerate(runs):
+            day = date.today() - timedelta(days=5 + i)
+            backdate(index, run, day)
+            views[day] = rng.gauss(200 if run["assignment"]["hook"] == "hook" else 100, 15)
+        cache = AnalyticsCache(str(tmp_path / "cache"))
+        cache_views(cache, views)
+        results = ExperimentResults(ab, index, cache)
+
+        assert results.ingest("demo", "UC_test") == 40
+        assert results.ingest("demo", "UC_test") == 0
+        assert sum(result["runs"] for result in ab.tests["hook"]["results"].values()) == 40
+
+        loop = FeedbackLoop(str(prompts), ab_test=ab, history_path=str(tmp_path / "history.json"))
+        weekly = loop.run_weekly([], "demo", min_sample_size=5)
+
+        assert weekly["ab_test_analyses"]["hook"]["winner"] == "hook"
+        assert ab.get("hook")["status"] == "concluded"
+        assert ab.active_for("demo") == []
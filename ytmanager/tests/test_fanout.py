@@ -0,0 +1,127 @@
+import os
+import textwrap
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import pytest
+import requests
+
+from src.analytics.cache import CHANNEL_METRICS, AnalyticsCache
+from src.analytics.fake_server import FakeYouTubeServer, day_row
+from src.channels.registry import ChannelRegistry
+from src.channels.run_index import RunIndex
+from src.optimizer.ab_test import ABTest
+from src.optimizer.fanout import run_all
+from src.storage.factory import StorageFactory
+
+LOOKBACK_DAYS = 14
+
+
+class FakeAPI:
+    def __init__(self, url: str, cache: Optional[AnalyticsCache] = None):
+        self.url = url
+        self.cache = cache
+
+    def get_channel_analytics(self, channel_id: str, lookback_days: int = 7) -> dict:
+        end = date.today()
+        start = end - timedelta(days=lookback_days)
+        if self.cache:
+            return self.cache.get_report(
+                channel_id, CHANNEL_METRICS, start, end, lambda first, last: self._query(channel_id, first, last)
+            )
+        return self._query(channel_id, start, end)
+
+    def _query(self, channel_id: str, start: date, end: date) -> dict:
+        params = {
+            "ids": f"channel=={channel_id}",
+            "startDate": start.isoformat(),
+            "endDate": end.isoformat(),
+            "metrics": CHANNEL_METRICS,
+            "dimensions": "day",
+        }
+        return requests.get(f"{self.url}/v2/reports", params=params).json()
+
+
+@pytest.fixture
+def server():
+    with FakeYouTubeServer() as server:
+        yield server
+
+
+@pytest.fixture
+def registry(tmp_path, project):
+    (project / "config" / "prompts.yaml").write_text("news_prompt: news\nscript_prompt: script\n")
+    config = tmp_path / "config" / "channels.yaml"
+    config.parent.mkdir(parents=True, exist_ok=True)
+    config.write_text(textwrap.dedent(f"""\
+        templates:
+          default:
+            schedule: "0 6 * * *"
+            project_path: {project}
+            analytics:
+              metrics: [views]
+              lookback_days: {LOOKBACK_DAYS}
+            optimizer:
+              enabled: true
+        channels:
+          demo:
+            extends: default
+            youtube_channel_id: UC_demo
+          shorts:
+            extends: default
+            youtube_channel_id: UC_shorts
+    """))
+    return ChannelRegistry(str(config))
+
+
+def expected_views(channel_id: str) -> int:
+    end = date.today()
+    days = [end - timedelta(days=i) for i in range(LOOKBACK_DAYS + 1)]
+    return sum(day_row(channel_id, day.isoformat())[1] for day in days)
+
+
+def pending_run(channel: str) -> dict:
+    ab = ABTest(storage=StorageFactory().open("ab_tests"), archive=StorageFactory().open("ab_tests_archive"))
+    ab.create_experiment("hook", {"control": {}, "hook": {"script_prompt": "hook"}}, channels=[channel])
+    finished = datetime.now() - timedelta(days=10)
+    return RunIndex(storage=StorageFactory().open("run_index")).record({
+        "run_id": "run-1",
+        "channel": channel,
+        "project_path": "",
+        "started_at": (finished - timedelta(minutes=5)).isoformat(),
+        "finished_at": finished.isoformat(),
+        "exit_code": 0,
+        "dry_run": False,
+        "outputs": {},
+        "assignment": {"hook": "hook"},
+    })
+
+
+@pytest.mark.integration
+class TestRunAll:
+    def test_merges_per_channel_results_from_the_pool(self, registry, server, tmp_path):
+        report = run_all(registry, FakeAPI(server.url, AnalyticsCache(str(tmp_path / "cache"))), tune_workers=2)
+
+        assert report["summary"]["channels"] == 2
+        assert report["summary"]["ok"] == 2
+        channels = report["channels"]
+        assert channels["demo"]["metrics"]["views"] == expected_views("UC_demo")
+        assert channels["shorts"]["metrics"]["views"] == expected_views("UC_shorts")
+        assert channels["demo"]["pid"] == channels["shorts"]["pid"] != os.getpid()
+
+    def test_children_use_the_parent_cache(self, registry, server, tmp_path):
+        pending_run("demo")
+
+        report = run_all(registry, FakeAPI(server.url, AnalyticsCache(str(tmp_path / "custom_cache"))))
+
+        assert report["channels"]["demo"]["ingested"] == 1
+        assert RunIndex(storage=StorageFactory().open("run_index")).get("run-1")["ingested_at"]
+
+    def test_no_cache_skips_ingestion_in_children(self, registry, server):
+        pending_run("demo")
+
+        report = run_all(registry, FakeAPI(server.url))
+
+        assert report["summary"]["ok"] == 2
+        assert report["channels"]["demo"]["ingested"] == 0
+        assert not RunIndex(storage=StorageFactory().open("run_index")).get("run-1").get("ingested_at")
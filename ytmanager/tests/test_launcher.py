@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from src.channels.launcher import Launcher
+from src.channels.run_index import RunIndex
+
+WRITE_OUTPUT = (
+    "sh -c 'sleep 0.2; mkdir -p \"$YTMANAGER_RUN_DIR\"; "
+    "echo \"$YTMANAGER_RUN_ID\" > \"$YTMANAGER_RUN_DIR/script.json\"'"
+)
+
+
+@pytest.mark.integration
+class TestLauncher:
+    def test_child_writes_into_the_announced_run_dir(self, project, tmp_path):
+        launcher = Launcher(str(project), channel="demo", index=RunIndex(str(tmp_path / "run_index.json")),
+                            command=WRITE_OUTPUT)
+
+        result = launcher.run()
+
+        run = launcher.last_run
+        assert result.returncode == 0
+        assert launcher.get_latest_run_id() == run["run_id"]
+        assert open(run["outputs"]["script"]).read().strip() == run["run_id"]
+
+    def test_overlapping_runs_record_their_own_outputs(self, project, tmp_path):
+        index = RunIndex(str(tmp_path / "run_index.json"))
+        launchers = [Launcher(str(project), channel="demo", index=index, command=WRITE_OUTPUT) for _ in range(4)]
+
+        threads = [threading.Thread(target=launcher.run) for launcher in launchers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        run_ids = {launcher.last_run["run_id"] for launcher in launchers}
+        assert len(run_ids) == 4
+        for launcher in launchers:
+            run = index.get(launcher.last_run["run_id"])
+            assert open(run["outputs"]["script"]).read().strip() == run["run_id"]
+
+    def test_failed_run_is_recorded_without_outputs(self, project, tmp_path):
+        launcher = Launcher(str(project), channel="demo", index=RunIndex(str(tmp_path / "run_index.json")),
+                            command="sh -c 'exit 2'")
+
+        launcher.run(stream=True)
+
+        assert launcher.last_run["exit_code"] == 2
+        assert launcher.last_run["outputs"] == {}
+        assert launcher.last_run["log"].endswith(".log")
+
+    def test_missing_binary_closes_the_stream_log(self, project, tmp_path):
+        launcher = Launcher(str(project), channel="demo", index=RunIndex(str(tmp_path / "run_index.json")),
+                            command="definitely-not-a-real-binary")
+
+        with pytest.raises(FileNotFoundError):
+            launcher.run(stream=True)
+
+        assert launcher.output._file.closed
+        assert launcher.output.status["state"] == "failed"
+        assert launcher.output.status["exit_code"] == -1
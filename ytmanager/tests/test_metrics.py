@@ -0,0 +1,81 @@
+import pytest
+
+from src.analytics.metrics import MetricsCalculator, frame_to_rows
+
+HEADERS = ["day", "video", "views", "estimatedMinutesWatched", "averageViewDuration", "averageViewPercentage", "likes"]
+ROWS = [
+    ["2026-03-01", "v1", 100, 50, 30, 40, 10],
+    ["2026-03-01", "v2", 300, 200, 60, 60, 20],
+    ["2026-03-02", "v1", 200, 120, 45, 50, 5],
+]
+
+
+def report(rows=ROWS, headers=HEADERS) -> dict:
+    return {"columnHeaders": [{"name": name} for name in headers], "rows": rows}
+
+
+@pytest.fixture
+def frames():
+    return MetricsCalculator().calculate_frames(report())
+
+
+@pytest.mark.unit
+class TestMetricsCalculator:
+    def test_summary_is_view_weighted(self, frames):
+        assert frames.summary == pytest.approx({
+            "views": 600,
+            "watch_time": 370,
+            "average_view_duration": (30 * 100 + 60 * 300 + 45 * 200) / 600,
+            "engagement_rate": 35 / 600,
+            "retention_rate": (0.4 * 100 + 0.6 * 300 + 0.5 * 200) / 600,
+            "subscriber_net": 0,
+        })
+
+    def test_per_day_grouping(self, frames):
+        rows = frame_to_rows(frames.per_day)
+        assert [row["day"] for row in rows] == ["2026-03-01", "2026-03-02"]
+        assert rows[0] == pytest.approx({
+            "day": "2026-03-01",
+            "views": 400,
+            "watch_time": 250,
+            "average_view_duration": (30 * 100 + 60 * 300) / 400,
+            "engagement_rate": 30 / 400,
+            "retention_rate": (0.4 * 100 + 0.6 * 300) / 400,
+            "subscriber_net": 0,
+        })
+        assert rows[1]["average_view_duration"] == pytest.approx(45)
+        assert rows[1]["engagement_rate"] == pytest.approx(5 / 200)
+
+    def test_per_video_grouping(self, frames):
+        rows = {row["video"]: row for row in frame_to_rows(frames.per_video)}
+        assert rows["v1"]["views"] == 300
+        assert rows["v1"]["watch_time"] == 170
+        assert rows["v1"]["average_view_duration"] == pytest.approx((30 * 100 + 45 * 200) / 300)
+        assert rows["v1"]["retention_rate"] == pytest.approx((0.4 * 100 + 0.5 * 200) / 300)
+        assert rows["v2"]["engagement_rate"] == pytest.approx(20 / 300)
+
+    def test_missing_columns_are_zero(self, frames):
+        assert frames.series["engagements"].tolist() == [10, 20, 5]
+        assert frames.series["subscriber_net"].tolist() == [0, 0, 0]
+        assert frames.aggregates["subscriber_net"]["sum"] == 0
+
+    def test_aggregates(self, frames):
+        views = frames.aggregates["views"]
+        assert views["sum"] == 600
+        assert views["mean"] == pytest.approx(200)
+        assert views["p50"] == pytest.approx(200)
+        assert views["weighted_mean"] == pytest.approx((100 ** 2 + 300 ** 2 + 200 ** 2) / 600)
+
+    def test_zero_view_groups_do_not_divide_by_zero(self):
+        frames = MetricsCalculator().calculate_frames(report([["2026-03-01", "v1", 0, 0, 0, 0, 0]]))
+        assert frames.summary["engagement_rate"] == 0.0
+        assert frames.per_day["average_view_duration"].tolist() == [0.0]
+
+    def test_rows_without_headers_use_default_columns(self):
+        data = {"rows": [["2026-03-01", 100, 50, 30, 40, 10, 2, 3, 4, 1]]}
+        summary = MetricsCalculator().calculate_all(data)
+        assert summary["engagement_rate"] == pytest.approx(15 / 100)
+        assert summary["subscriber_net"] == 3
+
+    def test_empty_report(self):
+        assert MetricsCalculator().calculate_all({"rows": []}) == {}
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from src.channels.output import RunOutput
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "logs" / "run.log"
+
+
+def status(log_path) -> dict:
+    return json.loads(log_path.with_suffix(".status.json").read_text())
+
+
+@pytest.mark.unit
+class TestRotation:
+    def test_rotates_at_max_bytes_and_keeps_backups(self, log_path):
+        output = RunOutput(str(log_path), max_bytes=100, backups=2, patterns=[])
+        for i in range(40):
+            output.feed(f"line {i:02d} " + "x" * 11)
+        output.close(0)
+
+        backups = sorted(path.name for path in log_path.parent.glob("run.log.*"))
+        assert backups == ["run.log.1", "run.log.2"]
+        for path in [log_path, *log_path.parent.glob("run.log.*")]:
+            assert path.stat().st_size <= 100
+        assert log_path.read_text().splitlines()[-1].startswith("line 39")
+        assert (log_path.parent / "run.log.1").read_text().splitlines()[-1].startswith("line 34")
+        assert output.tail().count("\n") == 40
+
+    def test_appends_to_an_existing_log(self, log_path):
+        log_path.parent.mkdir(parents=True)
+        log_path.write_text("previous\n")
+
+        output = RunOutput(str(log_path), patterns=[])
+        output.feed("next")
+        output.close(0)
+
+        assert log_path.read_text() == "previous\nnext\n"
+
+    def test_close_records_the_exit_code(self, log_path):
+        output = RunOutput(str(log_path))
+        output.feed("boom")
+        output.close(3)
+
+        assert status(log_path)["state"] == "failed"
+        assert status(log_path)["exit_code"] == 3
+        assert status(log_path)["lines"] == 1
+
+
+@pytest.mark.unit
+class TestProgress:
+    @pytest.mark.parametrize("line, expected", [
+        ("[Step 2/5] rendering audio", {"step": 2, "total": 5, "percent": 40.0, "stage": "rendering audio"}),
+        ("step 3 / 4: upload", {"step": 3, "total": 4, "percent": 75.0, "stage": "upload"}),
+        ("progress: 42.5%", {"percent": 42.5}),
+        (" 87%|████████▋ | 87/100", {"percent": 87.0}),
+    ])
+    def test_parses_progress_lines(self, log_path, line, expected):
+        output = RunOutput(str(log_path))
+        output.feed(line)
+
+        assert {key: output.status[key] for key in expected} == expected
+        assert {key: status(log_path)[key] for key in expected} == expected
+
+    def test_plain_lines_do_not_update_progress(self, log_path):
+        seen = []
+        output = RunOutput(str(log_path), on_progress=seen.append)
+        output.feed("fetching news")
+
+        assert seen == []
+        assert output.status["percent"] is None
+        assert status(log_path)["updated_at"] is None
+
+    def test_progress_callback_receives_the_status(self, log_path):
+        seen = []
+        output = RunOutput(str(log_path), on_progress=lambda current: seen.append(dict(current)))
+        output.feed("Step 1/2: script")
+        output.feed("Step 2/2: video")
+
+        assert [(entry["step"], entry["stage"]) for entry in seen] == [(1, "script"), (2, "video")]
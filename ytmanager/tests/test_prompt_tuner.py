@@ -0,0 +1,79 @@
+import pytest
+
+from src.optimizer.prompt_tuner import PromptTuner
+
+ORIGINAL = "news_prompt: news\nscript_prompt: script\nmetadata_prompt: metadata\n"
+HOOK = {"script-hook": {"prompt": "script_prompt", "addition": "\n\nOpen with a hook.", "ab_variant": False}}
+TITLE = {"metadata-title": {"prompt": "metadata_prompt", "addition": "\n\nKeep titles short.", "ab_variant": False}}
+
+
+@pytest.fixture
+def prompts(project):
+    path = project / "config" / "prompts.yaml"
+    path.write_text(ORIGINAL)
+    return path
+
+
+@pytest.mark.unit
+class TestPromptTuner:
+    def test_reading_does_not_create_history(self, prompts):
+        tuner = PromptTuner(str(prompts))
+
+        tuner.render({"script_prompt": ["\n\nextra"]})
+        tuner.apply_improvements(HOOK, dry_run=True)
+
+        assert not (prompts.parent / ".prompt_history").exists()
+        assert prompts.read_text() == ORIGINAL
+
+    def test_dry_run_does_not_block_a_later_apply(self, prompts):
+        tuner = PromptTuner(str(prompts))
+
+        tuner.apply_improvements(HOOK, dry_run=True)
+        assert tuner.statuses == {"script-hook": "applied"}
+        assert tuner.applied == {}
+        assert tuner.prompts["script_prompt"] == "script"
+
+        tuner.apply_improvements(HOOK)
+        assert tuner.statuses == {"script-hook": "applied"}
+        assert "Open with a hook." in PromptTuner(str(prompts)).prompts["script_prompt"]
+
+    def test_applying_twice_is_idempotent(self, prompts):
+        PromptTuner(str(prompts)).apply_improvements(HOOK)
+        text = prompts.read_text()
+
+        tuner = PromptTuner(str(prompts))
+        assert tuner.apply_improvements(HOOK) == []
+        assert tuner.statuses == {"script-hook": "skipped"}
+        assert prompts.read_text() == text
+        assert [v["message"] for v in tuner.history.versions()] == ["external", "patch"]
+
+    def test_rollback_restores_text_and_applied_patches(self, prompts):
+        PromptTuner(str(prompts)).apply_improvements(HOOK)
+        PromptTuner(str(prompts)).apply_improvements(TITLE)
+
+        tuner = PromptTuner(str(prompts))
+        tuner.rollback()
+        assert tuner.applied == {"script_prompt": ["script-hook"]}
+        assert "Keep titles short." not in prompts.read_text()
+
+        first = tuner.history.versions()[0]["version"]
+        tuner.rollback(first[:12])
+        assert prompts.read_text() == ORIGINAL
+        assert tuner.applied == {}
+
+        tuner.apply_improvements(TITLE)
+        assert tuner.statuses == {"metadata-title": "applied"}
+
+    def test_rollback_keeps_external_edits_recoverable(self, prompts):
+        tuner = PromptTuner(str(prompts))
+        tuner.apply_improvements(HOOK)
+        prompts.write_text(ORIGINAL.replace("news", "edited news"))
+
+        PromptTuner(str(prompts)).rollback()
+
+        assert "Open with a hook." in prompts.read_text()
+        assert PromptTuner(str(prompts)).history.versions()[-2]["message"] == "external"
+
+    def test_nothing_to_roll_back(self, prompts):
+        with pytest.raises(ValueError, match="no earlier prompt version"):
+            PromptTuner(str(prompts)).rollback()
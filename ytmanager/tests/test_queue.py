@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from src.scheduler.queue import ExecutionQueue, TaskStatus
+from src.storage.journal import JournalStore
+
+
+@pytest.fixture
+def queue_file(tmp_path):
+    return str(tmp_path / "execution_queue.json")
+
+
+def open_queue(path: str, compact_every: int = 1000) -> ExecutionQueue:
+    return ExecutionQueue(path, storage=JournalStore(path, key_field="task_id", compact_every=compact_every))
+
+
+@pytest.mark.unit
+class TestPriority:
+    def test_higher_priority_first_then_newest(self, queue_file):
+        queue = open_queue(queue_file)
+        low = queue.add("a", "cmd", priority=0)
+        high = queue.add("b", "cmd", priority=5)
+        later_low = queue.add("c", "cmd", priority=0)
+
+        order = [queue.claim("w")["task_id"] for _ in range(3)]
+
+        assert order == [high, later_low, low]
+        assert queue.claim("w") is None
+
+    def test_exclude_running_skips_busy_channel(self, queue_file):
+        queue = open_queue(queue_file)
+        other = queue.add("b", "cmd", priority=1)
+        first = queue.add("a", "cmd", priority=3)
+        second = queue.add("a", "cmd", priority=2)
+
+        assert queue.claim("w")["task_id"] == first
+        assert queue.claim("w")["task_id"] == other
+        assert queue.claim("w") is None
+        queue.complete(first)
+        assert queue.claim("w")["task_id"] == second
+
+    def test_release_does_not_leave_stale_heap_entries(self, queue_file):
+        queue = open_queue(queue_file)
+        task_id = queue.add("a", "cmd")
+
+        for _ in range(5):
+            assert queue.claim("w")["task_id"] == task_id
+            assert queue.release(task_id, "w")
+
+        assert len(queue._heap) <= 2
+        assert queue.claim("w")["task_id"] == task_id
+        assert queue.claim("w") is None
+
+    def test_cleanup_deletes_in_one_write(self, queue_file, monkeypatch):
+        queue = open_queue(queue_file)
+        ids = [queue.add(f"channel_{i}", "cmd") for i in range(10)]
+        for task_id in ids:
+            queue.complete(task_id)
+        writes = []
+        put_many = queue.storage.put_many
+
+        def counted(records, deletes=()):
+            writes.append(list(deletes))
+            put_many(records, deletes)
+
+        monkeypatch.setattr(queue.storage, "put_many", counted)
+        monkeypatch.setattr(queue.storage, "delete", lambda key: pytest.fail("cleanup deleted one task at a time"))
+
+        queue.cleanup(keep_recent=3)
+
+        assert len(writes) == 1
+        assert len(writes[0]) == 7
+        assert len(open_queue(queue_file).list(TaskStatus.COMPLETED)) == 3
+
+
+@pytest.mark.integration
+class TestSharedQueue:
+    def test_two_instances_never_claim_the_same_task(self, queue_file):
+        producer = open_queue(queue_file)
+        ids = {producer.add(f"channel_{i}", "cmd") for i in range(6)}
+        first, second = open_queue(queue_file), open_queue(queue_file)
+
+        claimed = []
+        for _ in range(3):
+            claimed.append(first.claim("w1")["task_id"])
+            claimed.append(second.claim("w2")["task_id"])
+
+        assert sorted(claimed) == sorted(ids)
+        assert first.claim("w1") is None and second.claim("w2") is None
+        producer.refresh()
+        assert len(producer.list(TaskStatus.RUNNING)) == 6
+
+    def test_expired_lease_is_requeued_for_another_worker(self, queue_file):
+        first, second = open_queue(queue_file), open_queue(queue_file)
+        task_id = first.add("a", "cmd")
+        assert first.claim("w1", lease_seconds=-1)["task_id"] == task_id
+
+        assert second.requeue_expired() == [task_id]
+        assert not first.heartbeat(task_id, "w1")
+        reclaimed = second.claim("w2")
+        assert reclaimed["task_id"] == task_id
+        assert reclaimed["worker_id"] == "w2"
+
+    def test_heartbeat_only_from_owner(self, queue_file):
+        first, second = open_queue(queue_file), open_queue(queue_file)
+        task_id = first.add("a", "cmd")
+        first.claim("w1", lease_seconds=60)
+
+        assert first.heartbeat(task_id, "w1", lease_seconds=600)
+        assert not second.heartbeat(task_id, "w2")
+        assert second.requeue_expired() == []
+
+    def test_compaction_is_visible_to_other_instance(self, queue_file):
+        writer = open_queue(queue_file, compact_every=5)
+        reader = open_queue(queue_file, compact_every=5)
+        ids = [writer.add(f"channel_{i}", "cmd") for i in range(8)]
+        for task_id in ids[:4]:
+            writer.start(task_id)
+            writer.complete(task_id)
+
+        reader.refresh()
+        assert {t["task_id"] for t in reader.list(TaskStatus.COMPLETED)} == set(ids[:4])
+        assert {t["task_id"] for t in reader.list(TaskStatus.PENDING)} == set(ids[4:])
+
+        writer.cleanup(keep_recent=1)
+        snapshot = json.loads(open(queue_file).read())
+        assert len(snapshot) == 5
+        reader.refresh()
+        assert len(reader.list(TaskStatus.COMPLETED)) == 1
+        assert reader.claim("w")["task_id"] == ids[-1]
+
+    def test_reopen_replays_journal(self, queue_file):
+        queue = open_queue(queue_file)
+        task_id = queue.add("a", "cmd", metadata={"timeout": 5})
+        queue.fail(task_id, "boom")
+
+        reopened = open_queue(queue_file)
+        task = reopened.list(TaskStatus.FAILED)[0]
+        assert task["task_id"] == task_id
+        assert task["error"] == "boom"
+        assert task["metadata"] == {"timeout": 5}
@@ -0,0 +1,101 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.analytics.quota import QuotaExhausted, QuotaGuard, QuotaLedger, TokenBucket
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status: int, reason: str = ""):
+        super().__init__(f"HTTP {status} {reason}")
+        self.resp = SimpleNamespace(status=status)
+        self.content = json.dumps({"error": {"errors": [{"reason": reason}]}}).encode()
+
+
+class FakeRequest:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return QuotaLedger(str(tmp_path / "quota_ledger.json"), daily_limit=500)
+
+
+@pytest.fixture
+def guard(ledger):
+    return QuotaGuard(ledger, TokenBucket(rate=1000, capacity=1000), max_retries=3, base_delay=0)
+
+
+@pytest.mark.unit
+class TestQuotaGuard:
+    def test_retries_server_errors_and_charges_once(self, guard, ledger):
+        request = FakeRequest(FakeHttpError(503), {"items": []})
+
+        assert guard.execute("youtube.search.list", request) == {"items": []}
+
+        assert request.calls == 2
+        usage = ledger.usage()
+        assert usage["used"] == 100
+        assert usage["calls"] == 1
+        assert usage["retries"] == 1
+        assert usage["by_method"] == {"youtube.search.list": 100}
+
+    def test_gives_up_after_max_retries_without_charging(self, guard, ledger):
+        request = FakeRequest(*[FakeHttpError(500)] * 4)
+
+        with pytest.raises(FakeHttpError):
+            guard.execute("youtube.videos.list", request)
+
+        assert request.calls == 4
+        assert ledger.usage()["used"] == 0
+
+    def test_client_errors_are_not_retried(self, guard, ledger):
+        request = FakeRequest(FakeHttpError(404, "notFound"))
+
+        with pytest.raises(FakeHttpError):
+            guard.execute("youtube.videos.list", request)
+
+        assert request.calls == 1
+        assert ledger.usage()["used"] == 0
+
+    def test_quota_exceeded_exhausts_the_day(self, guard, ledger):
+        request = FakeRequest(FakeHttpError(403, "quotaExceeded"))
+
+        with pytest.raises(QuotaExhausted):
+            guard.execute("youtube.videos.list", request)
+
+        assert request.calls == 1
+        assert ledger.remaining() == 0
+        with pytest.raises(QuotaExhausted):
+            guard.execute("youtube.videos.list", FakeRequest({}))
+
+    def test_refuses_calls_the_budget_cannot_cover(self, guard, ledger):
+        ledger.record("youtube.search.list", 450)
+
+        assert not guard.can_afford("youtube.search.list")
+        assert guard.can_afford("youtube.videos.list", calls=50)
+        request = FakeRequest({})
+        with pytest.raises(QuotaExhausted):
+            guard.execute("youtube.search.list", request)
+        assert request.calls == 0
+
+    def test_ledger_persists_across_instances(self, guard, ledger, tmp_path):
+        guard.execute("youtube.channels.list", FakeRequest({}))
+        guard.execute("youtubeAnalytics.reports.query", FakeRequest({}))
+
+        reopened = QuotaLedger(str(tmp_path / "quota_ledger.json"), daily_limit=500)
+        assert reopened.usage()["calls"] == 2
+        assert reopened.remaining() == 498
+        assert QuotaGuard(reopened).metrics()["by_method"] == {
+            "youtube.channels.list": 1, "youtubeAnalytics.reports.query": 1,
+        }
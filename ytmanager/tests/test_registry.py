@@ -0,0 +1,117 @@
+import textwrap
+
+import pytest
+from pydantic import ValidationError
+
+from src.channels.registry import ChannelRegistry
+from src.storage import yaml_cache
+
+BASE = """\
+    templates:
+      default:
+        youtube_channel_id: UC_default
+        schedule: "0 6 * * *"
+        analytics:
+          metrics: [views, likes]
+          lookback_days: 7
+        optimizer:
+          enabled: true
+      money:
+        extends: default
+        schedule: "0 8 * * *"
+        analytics:
+          lookback_days: 28
+    channels:
+      alpha:
+        extends: money
+        project_path: /srv/alpha
+        youtube_channel_id: UC_alpha
+      beta:
+        extends: [default, alpha]
+        project_path: /srv/beta
+        optimizer:
+          enabled: false
+      gamma:
+        extends: default
+        project_path: /srv/gamma
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    yaml_cache._memo.clear()
+    path = tmp_path / "config" / "channels.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(BASE))
+    return path
+
+
+def rewrite(path, old: str, new: str):
+    path.write_text(path.read_text().replace(old, new))
+
+
+@pytest.mark.unit
+class TestChannelRegistry:
+    def test_extends_deep_merges_in_order(self, config):
+        registry = ChannelRegistry(str(config))
+
+        alpha = registry.get("alpha")
+        assert (alpha.schedule, alpha.youtube_channel_id) == ("0 8 * * *", "UC_alpha")
+        assert (alpha.analytics.metrics, alpha.analytics.lookback_days) == (["views", "likes"], 28)
+        beta = registry.get("beta")
+        assert (beta.project_path, beta.youtube_channel_id, beta.optimizer.enabled) == ("/srv/beta", "UC_alpha", False)
+        assert registry.list() == ["alpha", "beta", "gamma"]
+
+    def test_channels_are_resolved_lazily_and_memoized(self, config):
+        registry = ChannelRegistry(str(config))
+        assert registry.channels == {}
+
+        alpha = registry.get("alpha")
+
+        assert set(registry.channels) == {"alpha"}
+        assert registry.get("alpha") is alpha
+        with pytest.raises(KeyError):
+            registry.get("default")
+
+    def test_validation_happens_on_get_only(self, config):
+        rewrite(config, "    project_path: /srv/gamma\n", "")
+        registry = ChannelRegistry(str(config))
+
+        assert "gamma" in registry.list()
+        with pytest.raises(ValidationError):
+            registry.get("gamma")
+
+    def test_cycles_are_reported(self, config):
+        rewrite(config, "extends: default\n    schedule", "extends: beta\n    schedule")
+
+        with pytest.raises(ValueError, match="cycle"):
+            ChannelRegistry(str(config)).get("alpha")
+
+    def test_reload_invalidates_only_descendants(self, config):
+        registry = ChannelRegistry(str(config))
+        untouched = registry.get("gamma")
+        registry.get("alpha")
+        registry.get("beta")
+
+        rewrite(config, "lookback_days: 28", "lookback_days: 14")
+
+        assert registry.reload() == ["alpha", "beta"]
+        assert registry.get("gamma") is untouched
+        assert registry.get("alpha").analytics.lookback_days == 14
+        assert registry.reload() == []
+
+    def test_reload_reports_added_and_removed_channels(self, config):
+        registry = ChannelRegistry(str(config))
+        rewrite(config, "  gamma:\n    extends: default\n    project_path: /srv/gamma\n",
+                "  delta:\n    extends: default\n    project_path: /srv/delta\n")
+
+        assert registry.reload() == ["delta", "gamma"]
+        assert registry.list() == ["alpha", "beta", "delta"]
+
+    def test_empty_storage_section_uses_defaults(self, config):
+        config.write_text("storage:\n" + config.read_text())
+
+        registry = ChannelRegistry(str(config))
+
+        assert registry.storage.backend == "json"
+        assert registry.list() == ["alpha", "beta", "gamma"]
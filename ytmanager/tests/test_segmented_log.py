@@ -0,0 +1,88 @@
+import gzip
+import json
+
+import pytest
+
+from src.storage.segmented_log import SegmentedLogStore
+
+
+def entry(timestamp: str, channel: str = "demo", **extra) -> dict:
+    return {"timestamp": timestamp, "channel": channel, **extra}
+
+
+@pytest.fixture
+def root(tmp_path):
+    return tmp_path / "feedback_history"
+
+
+@pytest.mark.unit
+class TestSegmentedLogStore:
+    def test_months_are_segmented_and_old_ones_compressed(self, root):
+        log = SegmentedLogStore(str(root))
+        log.extend([entry("2026-01-05T00:00:00"), entry("2026-02-01T00:00:00", "other")])
+        log.append(entry("2026-03-01T00:00:00", applied=["x"]))
+
+        assert sorted(path.name for path in root.glob("2026-*")) == [
+            "2026-01.jsonl.gz", "2026-02.jsonl.gz", "2026-03.jsonl"
+        ]
+        assert [e["timestamp"][:7] for e in log.load()] == ["2026-01", "2026-02", "2026-03"]
+        assert log.range("other") == [entry("2026-02-01T00:00:00", "other")]
+        assert log.range("demo", "2026-01-01", "2026-02-01") == [entry("2026-01-05T00:00:00")]
+        assert log.tail(1, where=lambda e: bool(e.get("applied")))[0]["timestamp"].startswith("2026-03")
+
+    def test_legacy_history_is_imported_once(self, root, tmp_path):
+        legacy = tmp_path / "feedback_history.json"
+        legacy.write_text(json.dumps([entry("2026-02-01T00:00:00"), entry("2026-01-01T00:00:00")]))
+
+        SegmentedLogStore(str(root), legacy_path=str(legacy))
+        log = SegmentedLogStore(str(root), legacy_path=str(legacy))
+
+        assert [e["timestamp"] for e in log.load()] == ["2026-01-01T00:00:00", "2026-02-01T00:00:00"]
+
+    def test_crash_before_index_write_is_recovered(self, root, monkeypatch):
+        log = SegmentedLogStore(str(root))
+        log.append(entry("2026-01-01T00:00:00"))
+
+        def crash():
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(log, "_write_index", crash)
+        with pytest.raises(KeyboardInterrupt):
+            log.extend([entry("2026-01-02T00:00:00"), entry("2026-02-01T00:00:00", "other")])
+
+        reader = SegmentedLogStore(str(root))
+        assert len(reader.load()) == 3
+        assert reader.range("other") == [entry("2026-02-01T00:00:00", "other")]
+        assert reader.index["2026-01"]["count"] == 2
+        assert json.loads((root / "index.json").read_text())["2026-02"]["channels"]["other"]["count"] == 1
+
+    def test_index_written_by_another_process_is_picked_up(self, root):
+        reader = SegmentedLogStore(str(root))
+        SegmentedLogStore(str(root)).append(entry("2026-01-01T00:00:00"))
+
+        assert reader.range("demo") == [entry("2026-01-01T00:00:00")]
+
+    def test_torn_tail_is_dropped_before_the_next_append(self, root):
+        log = SegmentedLogStore(str(root))
+        log.append(entry("2026-01-01T00:00:00"))
+        with open(root / "2026-01.jsonl", "a") as f:
+            f.write('{"timestamp": "2026-01-02')
+
+        log.append(entry("2026-01-03T00:00:00"))
+
+        assert [e["timestamp"] for e in SegmentedLogStore(str(root)).load()] == [
+            "2026-01-01T00:00:00", "2026-01-03T00:00:00"
+        ]
+
+    def test_interrupted_compression_does_not_duplicate_entries(self, root):
+        log = SegmentedLogStore(str(root))
+        log.append(entry("2026-01-01T00:00:00"))
+        index = (root / "index.json").read_text()
+        log.append(entry("2026-02-01T00:00:00"))
+        (root / "index.json").write_text(index)
+        with gzip.open(root / "2026-01.jsonl.gz", "rb") as f:
+            (root / "2026-01.jsonl").write_bytes(f.read())
+
+        reader = SegmentedLogStore(str(root))
+
+        assert [e["timestamp"][:7] for e in reader.load()] == ["2026-01", "2026-02"]
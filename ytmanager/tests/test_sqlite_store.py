@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.scheduler.queue import ExecutionQueue, TaskStatus
+from src.storage.factory import StorageFactory, migrate_json_to_sqlite
+from src.storage.sqlite_store import SqliteLogStore, SqliteStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "ytmanager.db")
+
+
+@pytest.mark.unit
+class TestSqliteStore:
+    def test_refresh_reads_only_newer_rows(self, db_path):
+        writer = SqliteStore(db_path, "series")
+        reader = SqliteStore(db_path, "series")
+        writer.put("a", {"n": 1})
+        reader.load()
+
+        writer.put("b", {"n": 2})
+        writer.delete("a")
+
+        assert reader.refresh() == {"b": None, "a": {"n": 1}}
+        assert reader.records == {"b": {"n": 2}}
+
+    def test_compaction_forces_reload(self, db_path):
+        writer = SqliteStore(db_path, "series")
+        reader = SqliteStore(db_path, "series")
+        writer.put("a", {"n": 1})
+        reader.load()
+        writer.delete("a")
+        writer.compact()
+
+        assert reader.refresh() is None
+        assert reader.records == {}
+
+    def test_concurrent_threads_do_not_interleave_transactions(self, db_path):
+        store = SqliteStore(db_path, "execution_queue", key_field="task_id")
+        log = SqliteLogStore(db_path, "feedback_history")
+        errors = []
+
+        def write(worker: int):
+            try:
+                for i in range(100):
+                    store.put_many({f"{worker}-{i}-{j}": {"worker": worker} for j in range(10)})
+                    log.append({"channel": f"c{worker}", "timestamp": f"{i:04d}"})
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(SqliteStore(db_path, "execution_queue").load()) == 8 * 100 * 10
+        assert len(log.range(channel="c3")) == 100
+
+
+@pytest.mark.integration
+def test_queue_on_sqlite_backend(db_path):
+    producer = ExecutionQueue(storage=SqliteStore(db_path, "execution_queue", key_field="task_id"))
+    consumer = ExecutionQueue(storage=SqliteStore(db_path, "execution_queue", key_field="task_id"))
+    task_id = producer.add("demo", "cmd")
+
+    claimed = consumer.claim("w")
+    consumer.complete(claimed["task_id"])
+
+    producer.refresh()
+    assert producer.tasks[task_id]["status"] == TaskStatus.COMPLETED
+
+
+@pytest.mark.integration
+class TestMigration:
+    @pytest.fixture
+    def json_data(self):
+        json_factory = StorageFactory("json")
+        ab_tests = json_factory.open("ab_tests")
+        with ab_tests.lock():
+            ab_tests.load()
+            ab_tests.put("exp", {"status": "active"})
+        history = json_factory.open_log("feedback_history")
+        for i in range(3):
+            history.append({"channel": "demo", "timestamp": f"2026-03-0{i + 1}T00:00:00", "i": i})
+
+    def test_failed_migration_rolls_back_and_can_be_resumed(self, json_data, db_path, monkeypatch):
+        def crash(self, entries):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(SqliteLogStore, "extend", crash)
+            with pytest.raises(sqlite3.OperationalError):
+                migrate_json_to_sqlite(db_path)
+
+        assert SqliteStore(db_path, "ab_tests").load() == {}
+        assert SqliteLogStore(db_path, "feedback_history").load() == []
+
+        counts = migrate_json_to_sqlite(db_path)
+
+        assert counts["ab_tests"] == 1
+        assert counts["feedback_history"] == 3
+        assert SqliteStore(db_path, "ab_tests").load() == {"exp": {"status": "active"}}
+        assert [entry["i"] for entry in SqliteLogStore(db_path, "feedback_history").load()] == [0, 1, 2]
+
+    def test_rerun_does_not_duplicate_logs(self, json_data, db_path):
+        migrate_json_to_sqlite(db_path)
+        migrate_json_to_sqlite(db_path)
+
+        assert len(SqliteLogStore(db_path, "feedback_history").load()) == 3
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.startup import COMMANDS, HEAVY_MODULES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys
+from src.cli import main
+try:
+    main(sys.argv[1:])
+except SystemExit:
+    pass
+print(json.dumps(sorted(name for name in sys.modules if name.split(".")[0] in {n.split(".")[0] for n in HEAVY})))
+"""
+
+
+def loaded_modules(args: list, cwd: Path) -> list:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    env.pop("YTMANAGER_TELEMETRY", None)
+    code = f"HEAVY = {HEAVY_MODULES!r}\n{PROBE}"
+    result = subprocess.run([sys.executable, "-c", code, *args], cwd=cwd, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("name", sorted(COMMANDS))
+def test_lightweight_commands_skip_heavy_imports(name, registry, tmp_path):
+    loaded_modules(COMMANDS[name], tmp_path)
+
+    assert loaded_modules(COMMANDS[name], tmp_path) == []
@@ -0,0 +1,195 @@
+import random
+import statistics
+from collections import Counter
+
+import pytest
+
+from src.optimizer.ab_test import ABTest
+from src.optimizer.stats import always_valid_p_value, thompson_draw, variance, welford_update
+
+
+def summarize(values) -> dict:
+    stats = {}
+    for value in values:
+        welford_update(stats, value)
+    return stats
+
+
+@pytest.mark.unit
+class TestWelford:
+    def test_matches_two_pass_statistics(self):
+        values = [random.Random(1).gauss(100, 15) for _ in range(500)]
+        stats = summarize(values)
+
+        assert stats["n"] == 500
+        assert stats["mean"] == pytest.approx(statistics.mean(values))
+        assert variance(stats) == pytest.approx(statistics.variance(values))
+
+    def test_variance_needs_two_samples(self):
+        assert variance({}) == 0.0
+        assert variance(summarize([5.0])) == 0.0
+
+
+@pytest.mark.unit
+class TestSequentialTest:
+    def run(self, effect: float, samples: int, seed: int) -> list:
+        rng = random.Random(seed)
+        control, treatment = {}, {}
+        p = 1.0
+        history = []
+        for _ in range(samples):
+            welford_update(control, rng.gauss(100, 20))
+            welford_update(treatment, rng.gauss(100 + effect, 20))
+            p = always_valid_p_value(p, control, treatment)
+            history.append(p)
+        return history
+
+    def test_holds_until_burn_in(self):
+        assert self.run(effect=50, samples=9, seed=0) == [1.0] * 9
+
+    def test_p_value_never_increases(self):
+        history = self.run(effect=5, samples=300, seed=3)
+        assert all(later <= earlier for earlier, later in zip(history, history[1:]))
+
+    def test_detects_a_real_effect(self):
+        assert self.run(effect=15, samples=200, seed=4)[-1] < 0.01
+
+    def test_null_effect_rarely_significant(self):
+        significant = sum(self.run(effect=0, samples=200, seed=seed)[-1] <= 0.05 for seed in range(40))
+        assert significant <= 4
+
+
+@pytest.mark.unit
+class TestThompson:
+    def test_unexplored_arm_is_always_drawn_first(self):
+        assert thompson_draw(summarize([1.0, 2.0])) == float("inf")
+
+    def test_draws_concentrate_on_the_mean(self):
+        random.seed(7)
+        stats = summarize([10.0 + (i % 5) for i in range(400)])
+        draws = [thompson_draw(stats) for _ in range(200)]
+        assert statistics.mean(draws) == pytest.approx(stats["mean"], abs=0.1)
+
+
+def run_experiment(ab: ABTest, rounds: int, means: dict, seed: int) -> Counter:
+    rng = random.Random(seed)
+    served = Counter()
+    for _ in range(rounds):
+        arm = ab.select_variant("exp")
+        served[arm] += 1
+        ab.record_result("exp", arm, {"views": rng.gauss(means[arm], 10)})
+    return served
+
+
+@pytest.mark.integration
+class TestExperiment:
+    arms = {"control": {}, "better": {"script_prompt": "x"}, "worse": {"script_prompt": "y"}}
+    means = {"control": 100, "better": 130, "worse": 70}
+
+    def test_ratio_allocation_picks_winner_and_retires_loser(self, tmp_path):
+        random.seed(5)
+        ab = ABTest(str(tmp_path / "ab_tests.json"))
+        ab.create_experiment("exp", self.arms, control="control", primary_metric="views")
+
+        served = run_experiment(ab, 150, self.means, seed=5)
+        analysis = ab.analyze("exp", min_sample_size=10)
+
+        assert analysis["winner"] == "better"
+        assert analysis["verdicts"] == {"better": "better", "worse": "worse"}
+        assert analysis["retired"] == ["worse"]
+        assert served["worse"] < 60
+        reopened = ABTest(str(tmp_path / "ab_tests.json"))
+        assert reopened.tests["exp"]["results"]["better"]["runs"] == served["better"]
+
+    def test_thompson_allocation_starves_the_worst_arm(self, tmp_path):
+        random.seed(11)
+        ab = ABTest(str(tmp_path / "ab_tests.json"))
+        ab.create_experiment("exp", self.arms, control="control", allocation="thompson", primary_metric="views")
+
+        served = run_experiment(ab, 300, self.means, seed=11)
+
+        assert served["better"] > served["control"] > served["worse"]
+        assert served["worse"] <= 10
+        assert ab.analyze("exp", min_sample_size=5)["winner"] == "better"
+
+
+@pytest.mark.unit
+class TestABTestPersistence:
+    arms = {"control": {}, "treatment": {"script_prompt": "x"}}
+
+    @pytest.fixture
+    def ab(self, tmp_path):
+        ab = ABTest(str(tmp_path / "ab_tests.json"))
+        ab.create_experiment("exp", self.arms, control="control", primary_metric="views")
+        return ab
+
+    def reopen(self, tmp_path) -> ABTest:
+        return ABTest(str(tmp_path / "ab_tests.json"))
+
+    def test_record_results_writes_once_per_batch(self, ab, monkeypatch):
+        writes = []
+        put_many = ab.storage.put_many
+
+        def counted(*args, **kwargs):
+            writes.append(args)
+            put_many(*args, **kwargs)
+
+        monkeypatch.setattr(ab.storage, "put_many", counted)
+
+        count = ab.record_results([("exp", "control", {"views": 100.0})] * 30)
+
+        assert count == 30
+        assert len(writes) == 1
+
+    def test_failed_batch_is_rolled_back(self, ab, tmp_path):
+        ab.record_result("exp", "control", {"views": 100.0})
+
+        def results():
+            yield "exp", "control", {"views": 200.0}
+            yield "exp", "treatment", {"views": 300.0}
+            raise RuntimeError("metrics fetch failed")
+
+        with pytest.raises(RuntimeError):
+            ab.record_results(results())
+
+        assert ab.tests["exp"]["results"]["control"]["runs"] == 1
+        assert ab.tests["exp"]["results"]["treatment"]["runs"] == 0
+        assert ab.get_averages("exp")["control"] == {"views": 100.0}
+        assert self.reopen(tmp_path).tests["exp"] == ab.tests["exp"]
+
+    def test_failed_create_is_rolled_back(self, ab, tmp_path):
+        with pytest.raises(RuntimeError):
+            with ab.transaction():
+                ab.create_experiment("other", self.arms)
+                raise RuntimeError("abort")
+
+        assert "other" not in ab.tests
+        assert "other" not in self.reopen(tmp_path).tests
+
+    def test_run_ids_are_recorded_once(self, ab, tmp_path):
+        assert ab.record_results([("exp", "control", {"views": 1.0}, "run-1")]) == 1
+        assert ab.record_results([("exp", "control", {"views": 1.0}, "run-1")]) == 0
+        assert self.reopen(tmp_path).tests["exp"]["results"]["control"]["runs"] == 1
+
+    def test_concluded_tests_move_to_the_archive(self, ab, tmp_path):
+        for _ in range(3):
+            ab.record_results([("exp", "control", {"views": 100.0}), ("exp", "treatment", {"views": 90.0})])
+
+        ab.conclude("exp")
+
+        assert "exp" not in ab.tests
+        reopened = self.reopen(tmp_path)
+        assert "exp" not in reopened.tests
+        assert reopened.get("exp")["status"] == "concluded"
+        assert reopened.get_averages("exp")["control"] == {"views": 100.0}
+
+    def test_worse_arm_is_retired_and_never_served(self, ab):
+        rng = random.Random(2)
+        for _ in range(60):
+            ab.record_results([
+                ("exp", "control", {"views": rng.gauss(100, 5)}),
+                ("exp", "treatment", {"views": rng.gauss(60, 5)}),
+            ])
+
+        assert ab.tests["exp"]["retired"] == ["treatment"]
+        assert {ab.select_variant("exp") for _ in range(50)} == {"control"}
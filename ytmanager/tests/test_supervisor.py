@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import socket
+
+import pytest
+
+from src.scheduler.queue import TaskStatus
+from src.supervisor.server import INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR, Supervisor
+from src.supervisor.state import SupervisorState
+
+
+@pytest.fixture
+def state(registry, tmp_path):
+    return SupervisorState(str(tmp_path / "config" / "channels.yaml"), system_cron=False)
+
+
+def supervisor(state, tmp_path, **options) -> Supervisor:
+    return Supervisor(state, socket_path=str(tmp_path / "s.sock"), cron=False, **options)
+
+
+@pytest.mark.unit
+class TestDispatch:
+    @pytest.mark.parametrize("line", [b"[]", b"1", b'"ping"', b"null"])
+    def test_non_object_requests_are_rejected(self, state, tmp_path, line):
+        response = supervisor(state, tmp_path, worker=False).dispatch(line)
+
+        assert response["id"] is None
+        assert response["error"]["code"] == INVALID_REQUEST
+
+    def test_errors_and_results(self, state, tmp_path):
+        server = supervisor(state, tmp_path, worker=False)
+
+        assert server.dispatch(b"{")["error"]["code"] == PARSE_ERROR
+        assert server.dispatch(b'{"id": 1, "method": "nope"}')["error"]["code"] == METHOD_NOT_FOUND
+        assert server.dispatch(b'{"id": 2, "method": "channels.list"}') == {
+            "jsonrpc": "2.0", "id": 2, "result": ["demo"]
+        }
+
+
+@pytest.mark.integration
+def test_shutdown_releases_running_tasks(state, project, tmp_path):
+    server = supervisor(state, tmp_path, concurrency=1, lease_seconds=60)
+    server.pool.poll_interval = 0.05
+    task_id = state.enqueue("demo", "sh -c 'echo $$ > pid; exec sleep 30'")
+
+    async def scenario():
+        running = asyncio.create_task(server.run())
+        for _ in range(100):
+            await asyncio.sleep(0.05)
+            if (project / "pid").exists() and (project / "pid").read_text().strip():
+                break
+        reader, writer = await asyncio.open_unix_connection(str(tmp_path / "s.sock"))
+        writer.write(b"[]\n" + json.dumps({"id": 1, "method": "shutdown"}).encode() + b"\n")
+        await writer.drain()
+        invalid = json.loads(await reader.readline())
+        assert json.loads(await reader.readline())["result"] is True
+        writer.close()
+        await asyncio.wait_for(running, 15)
+        return invalid
+
+    assert asyncio.run(scenario())["error"]["code"] == INVALID_REQUEST
+
+    state.queue.refresh()
+    task = state.queue.tasks[task_id]
+    assert task["status"] == TaskStatus.PENDING
+    assert task["worker_id"] is None and task["lease_expires_at"] is None
+    pid = int((project / "pid").read_text())
+    assert not os.path.exists(f"/proc/{pid}") or "Z" in open(f"/proc/{pid}/stat").read().split()[2]
+
+
+@pytest.mark.integration
+class TestConnections:
+    def serve(self, state, tmp_path, client) -> list:
+        server = supervisor(state, tmp_path, worker=False)
+        path = str(tmp_path / "s.sock")
+
+        async def scenario():
+            errors = []
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+            listener = await asyncio.start_unix_server(server._handle, path=path)
+            result = await client(path)
+            await asyncio.sleep(0.1)
+            listener.close()
+            await listener.wait_closed()
+            return result, errors
+
+        return asyncio.run(scenario())
+
+    def test_oversized_line_is_rejected_and_closed(self, state, tmp_path):
+        async def client(path):
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'{"method": "' + b"x" * 100_000 + b'"}\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            eof = await reader.read()
+            writer.close()
+            return response, eof
+
+        (response, eof), errors = self.serve(state, tmp_path, client)
+
+        assert response["error"]["code"] == INVALID_REQUEST
+        assert eof == b""
+        assert errors == []
+
+    def test_client_reset_is_handled(self, state, tmp_path):
+        async def client(path):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(path)
+            sock.sendall(json.dumps({"id": 1, "method": "channels.list"}).encode() + b"\n" * 2000)
+            sock.close()
+            await asyncio.sleep(0.2)
+
+        _, errors = self.serve(state, tmp_path, client)
+
+        assert errors == []
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from src.telemetry import Histogram, Telemetry
+
+
+@pytest.fixture
+def telemetry(tmp_path):
+    telemetry = Telemetry(enabled=True, trace_path=str(tmp_path / "trace.jsonl"))
+    yield telemetry
+    telemetry.disable()
+
+
+def trace(telemetry: Telemetry) -> list:
+    return [json.loads(line) for line in telemetry.trace_path.read_text().splitlines()]
+
+
+@pytest.mark.unit
+class TestSpans:
+    def test_nested_spans_record_their_parent(self, telemetry):
+        with telemetry.span("outer") as outer:
+            with telemetry.span("inner", channel="demo") as inner:
+                pass
+            with telemetry.span("sibling"):
+                pass
+
+        records = {record["name"]: record for record in trace(telemetry)}
+        assert records["outer"]["parent_id"] is None
+        assert records["inner"]["parent_id"] == outer.span_id
+        assert records["sibling"]["parent_id"] == outer.span_id
+        assert records["inner"]["span_id"] == inner.span_id
+        assert records["inner"]["labels"] == {"channel": "demo"}
+
+    def test_failed_span_counts_an_error(self, telemetry):
+        with pytest.raises(ValueError):
+            with telemetry.span("load", backend="json"):
+                raise ValueError("bad")
+
+        assert trace(telemetry)[0]["status"] == "error"
+        assert trace(telemetry)[0]["error"] == "ValueError: bad"
+        assert telemetry.counters == {("load.errors", (("backend", "json"),)): 1}
+        assert telemetry.histograms[("load.seconds", (("backend", "json"),))].count == 1
+
+    def test_timed_is_a_no_op_when_disabled(self):
+        telemetry = Telemetry()
+
+        @telemetry.timed("work")
+        def work(value):
+            return value * 2
+
+        assert work(21) == 42
+        with telemetry.span("other"):
+            telemetry.count("calls")
+        assert telemetry.counters == {}
+        assert telemetry.histograms == {}
+
+    def test_timed_records_a_histogram(self, telemetry):
+        @telemetry.timed("work", kind="unit")
+        def work():
+            return "done"
+
+        assert work() == "done"
+        assert telemetry.histograms[("work.seconds", (("kind", "unit"),))].count == 1
+
+
+@pytest.mark.unit
+class TestMetrics:
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram(buckets=(0.001, 0.01, 1.0))
+        for value in (0.0005, 0.001, 0.005, 0.5, 30):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [("0.001", 2), ("0.01", 3), ("1.0", 4), ("+Inf", 5)]
+        assert histogram.count == 5
+
+    def test_merge_adds_counters_and_histograms(self, telemetry):
+        other = Telemetry(enabled=True)
+        for target in (telemetry, other):
+            target.count("runs", 2, channel="demo")
+            target.observe("latency", 0.002)
+        other.count("runs", channel="other")
+
+        telemetry.merge(other.snapshot())
+
+        assert telemetry.counters[("runs", (("channel", "demo"),))] == 4
+        assert telemetry.counters[("runs", (("channel", "other"),))] == 1
+        histogram = telemetry.histograms[("latency", ())]
+        assert histogram.count == 2
+        assert histogram.sum == pytest.approx(0.004)
+        assert histogram.cumulative()[-1] == ("+Inf", 2)
+
+    def test_prometheus_text_format(self, telemetry):
+        telemetry.count("youtube_api.quota_units", 1234567, method='search "list"')
+        telemetry.observe("storage.load", 0.002)
+
+        lines = telemetry.prometheus().splitlines()
+
+        assert lines[:2] == [
+            "# TYPE ytmanager_youtube_api_quota_units_total counter",
+            'ytmanager_youtube_api_quota_units_total{method="search \\"list\\""} 1234567.0',
+        ]
+        assert "# TYPE ytmanager_storage_load histogram" in lines
+        assert 'ytmanager_storage_load_bucket{le="0.001"} 0' in lines
+        assert 'ytmanager_storage_load_bucket{le="0.005"} 1' in lines
+        assert 'ytmanager_storage_load_bucket{le="+Inf"} 1' in lines
+        assert "ytmanager_storage_load_sum 0.002" in lines
+        assert "ytmanager_storage_load_count 1" in lines
+
+    def test_large_counters_keep_full_precision(self, telemetry):
+        telemetry.count("bytes", 123456789012)
+        telemetry.observe("duration", 1234567.891)
+
+        text = telemetry.prometheus()
+
+        assert "ytmanager_bytes_total 123456789012.0" in text
+        assert "ytmanager_duration_sum 1234567.891" in text
@@ -0,0 +1,92 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.analytics.timeseries import MetricSeries, MetricsStore
+
+ORIGIN = date(2026, 1, 1)
+
+
+def brute_force(days: dict, metric: str, window: int, end: date) -> dict:
+    values = [
+        days[day][metric] for day in days
+        if end - timedelta(days=window - 1) <= day <= end and metric in days[day]
+    ]
+    return {"sum": sum(values), "count": len(values), "mean": sum(values) / len(values) if values else 0.0}
+
+
+def assert_windows_match(series: MetricSeries, days: dict, ends: list):
+    for end in ends:
+        for window in (1, 7, 28, 90):
+            result = series.window(window, end)
+            for metric in series.metrics:
+                expected = brute_force(days, metric, window, end)
+                assert result[metric]["count"] == expected["count"], (window, end, metric)
+                assert result[metric]["sum"] == pytest.approx(expected["sum"]), (window, end, metric)
+                assert result[metric]["mean"] == pytest.approx(expected["mean"]), (window, end, metric)
+
+
+@pytest.mark.unit
+class TestMetricSeries:
+    def test_windows_match_brute_force_with_gaps_and_out_of_order_writes(self, tmp_path):
+        rng = random.Random(2)
+        series = MetricSeries(tmp_path / "demo")
+        days = {}
+        offsets = [offset for offset in range(200) if rng.random() > 0.2]
+        rng.shuffle(offsets)
+        for offset in offsets:
+            day = ORIGIN + timedelta(days=offset)
+            metrics = {"views": float(rng.randint(0, 1000))}
+            if offset > 50:
+                metrics["likes"] = float(rng.randint(0, 50))
+            series.put(day, metrics)
+            days[day] = metrics
+
+        assert series.origin == ORIGIN + timedelta(days=min(offsets))
+        assert series.meta["capacity"] >= 200
+        ends = [ORIGIN + timedelta(days=offset) for offset in (0, 3, 30, 51, 120, 199)]
+        assert_windows_match(series, days, ends)
+
+    def test_overwriting_a_day_updates_later_windows(self, tmp_path):
+        series = MetricSeries(tmp_path / "demo")
+        for offset in range(10):
+            series.put(ORIGIN + timedelta(days=offset), {"views": 10.0})
+
+        series.put(ORIGIN + timedelta(days=2), {"views": 40.0})
+        series.put(ORIGIN + timedelta(days=3), {"views": float("nan")})
+
+        assert series.window(7, ORIGIN + timedelta(days=6)) == {"views": {"sum": 90.0, "count": 6, "mean": 15.0}}
+        assert series.window(28)["views"]["count"] == 9
+
+    def test_window_before_origin_is_empty(self, tmp_path):
+        series = MetricSeries(tmp_path / "demo")
+        series.put(ORIGIN, {"views": 1.0})
+
+        assert series.window(7, ORIGIN - timedelta(days=1)) == {}
+        assert MetricSeries(tmp_path / "empty").window(7) == {}
+
+    def test_reopened_series_keeps_prefix_sums(self, tmp_path):
+        days = {}
+        series = MetricSeries(tmp_path / "demo")
+        for offset in range(40):
+            day = ORIGIN + timedelta(days=offset)
+            days[day] = {"views": float(offset)}
+            series.put(day, days[day])
+        series.flush()
+
+        reopened = MetricSeries(tmp_path / "demo")
+
+        assert_windows_match(reopened, days, [ORIGIN + timedelta(days=39), ORIGIN + timedelta(days=20)])
+        assert list(reopened.range(ORIGIN, ORIGIN + timedelta(days=2))["views"]) == [0.0, 1.0, 2.0]
+
+
+@pytest.mark.unit
+def test_store_window_reports_means_of_present_metrics(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics_ts"))
+    store.ingest("demo", ORIGIN, {"views": 100.0})
+    store.ingest("demo", ORIGIN + timedelta(days=1), {"views": 300.0, "likes": 6.0})
+
+    assert store.window("demo", 7) == {"views": 200.0, "likes": 6.0}
+    assert store.window("demo", 1, ORIGIN) == {"views": 100.0}
+    assert set(store.windows("demo")) == {7, 28, 90}
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import time
+
+import pytest
+import yaml
+
+from src.channels.launcher import Launcher
+from src.scheduler.queue import ExecutionQueue, TaskStatus
+from src.scheduler.worker import WorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return ExecutionQueue(str(tmp_path / "execution_queue.json"))
+
+
+def drain(queue: ExecutionQueue, registry, timeout: float = 30) -> WorkerPool:
+    pool = WorkerPool(queue, registry, timeout=timeout, poll_interval=0.05, lease_seconds=3)
+    asyncio.run(pool.run(once=True))
+    return pool
+
+
+def task(queue: ExecutionQueue, task_id: str) -> dict:
+    queue.refresh()
+    return queue.tasks[task_id]
+
+
+@pytest.mark.integration
+class TestWorkerPool:
+    def test_successful_command_completes(self, queue, registry, project):
+        task_id = queue.add("demo", "sh -c 'pwd > cwd.txt'")
+
+        drain(queue, registry)
+
+        assert task(queue, task_id)["status"] == TaskStatus.COMPLETED
+        assert (project / "cwd.txt").read_text().strip() == str(project)
+
+    def test_nonzero_exit_fails(self, queue, registry):
+        task_id = queue.add("demo", "sh -c 'exit 3'")
+
+        drain(queue, registry)
+
+        assert task(queue, task_id)["status"] == TaskStatus.FAILED
+        assert task(queue, task_id)["error"].startswith("exit code 3")
+
+    def test_unknown_channel_fails_instead_of_staying_running(self, queue, registry):
+        task_id = queue.add("missing", "true")
+
+        drain(queue, registry)
+
+        assert task(queue, task_id)["status"] == TaskStatus.FAILED
+        assert "unknown channel" in task(queue, task_id)["error"]
+
+    def test_missing_binary_fails(self, queue, registry):
+        task_id = queue.add("demo", "definitely-not-a-real-binary --flag")
+
+        drain(queue, registry)
+
+        assert task(queue, task_id)["status"] == TaskStatus.FAILED
+        assert "FileNotFoundError" in task(queue, task_id)["error"]
+
+    def test_timeout_kills_the_whole_process_group(self, queue, registry, project):
+        task_id = queue.add("demo", "sh -c 'sleep 30 & echo $! > child.pid; wait'", metadata={"timeout": 1})
+
+        started = time.monotonic()
+        drain(queue, registry)
+
+        assert time.monotonic() - started < 10
+        assert task(queue, task_id)["status"] == TaskStatus.FAILED
+        assert task(queue, task_id)["error"].startswith("timeout")
+        child = int((project / "child.pid").read_text())
+        for _ in range(50):
+            if not os.path.exists(f"/proc/{child}") or "Z" in open(f"/proc/{child}/stat").read().split()[2]:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail(f"grandchild {child} survived the timeout")
+
+    def test_prepare_error_fails_the_task(self, queue, registry, monkeypatch):
+        def prepare(*args, **kwargs):
+            raise yaml.YAMLError("bad prompt overlay")
+
+        monkeypatch.setattr(Launcher, "prepare", prepare)
+        task_id = queue.add("demo", "true")
+
+        drain(queue, registry)
+
+        assert task(queue, task_id)["status"] == TaskStatus.FAILED
+        assert "YAMLError: bad prompt overlay" in task(queue, task_id)["error"]
+
+    def test_finish_error_fails_the_task_and_is_logged(self, queue, registry, monkeypatch, capsys):
+        def finish(*args, **kwargs):
+            raise RuntimeError("run index unavailable")
+
+        monkeypatch.setattr(Launcher, "finish", finish)
+        task_id = queue.add("demo", "true")
+
+        drain(queue, registry)
+
+        assert task(queue, task_id)["status"] == TaskStatus.FAILED
+        assert task(queue, task_id)["error"].startswith("worker error: RuntimeError: run index unavailable")
+        assert "run index unavailable" in capsys.readouterr().err
+
+    def test_crashed_task_does_not_stop_the_pool(self, queue, registry, monkeypatch, capsys):
+        def broken(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(queue, "complete", broken)
+        monkeypatch.setattr(queue, "fail", broken)
+        queue.add("demo", "true")
+
+        drain(queue, registry)
+
+        assert "Worker task crashed" in capsys.readouterr().out
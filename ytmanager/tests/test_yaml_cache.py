@@ -0,0 +1,101 @@
+import json
+import os
+import pickle
+import time
+from datetime import date
+
+import pytest
+
+from src.storage import yaml_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    yaml_cache._memo.clear()
+    yield
+    yaml_cache._memo.clear()
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "channels.yaml"
+    path.write_text("channels:\n  demo:\n    schedule: '0 6 * * *'\n")
+    return path
+
+
+def reparsing_fails(monkeypatch):
+    def fail(text):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(yaml_cache, "parse_yaml", fail)
+
+
+@pytest.mark.unit
+class TestYamlCache:
+    def test_second_process_reads_the_json_cache(self, config, cache_dir, monkeypatch):
+        data, digest = yaml_cache.load_yaml(str(config), cache_dir)
+        yaml_cache._memo.clear()
+        reparsing_fails(monkeypatch)
+
+        assert yaml_cache.load_yaml(str(config), cache_dir) == (data, digest)
+        entry = json.loads(next(cache_dir.glob("*.json")).read_text())
+        assert entry["sha256"] == digest
+
+    def test_returned_data_is_a_copy(self, config, cache_dir):
+        data, _ = yaml_cache.load_yaml(str(config), cache_dir)
+        data["channels"]["demo"]["schedule"] = "mutated"
+
+        assert yaml_cache.load_yaml(str(config), cache_dir)[0]["channels"]["demo"]["schedule"] == "0 6 * * *"
+
+    def test_pickle_in_cache_dir_is_never_loaded(self, config, cache_dir):
+        class Exploit:
+            def __reduce__(self):
+                return (config.write_text, ("owned",))
+
+        yaml_cache.load_yaml(str(config), cache_dir)
+        yaml_cache._memo.clear()
+        cache_file = next(cache_dir.glob("*.json"))
+        cache_file.write_bytes(pickle.dumps(Exploit()))
+
+        data, _ = yaml_cache.load_yaml(str(config), cache_dir)
+
+        assert data == {"channels": {"demo": {"schedule": "0 6 * * *"}}}
+        assert config.read_text() != "owned"
+
+    def test_changed_file_is_reparsed(self, config, cache_dir):
+        yaml_cache.load_yaml(str(config), cache_dir)
+        config.write_text("channels: {}\n")
+
+        assert yaml_cache.load_yaml(str(config), cache_dir)[0] == {"channels": {}}
+
+    def test_values_json_cannot_represent_are_not_cached(self, tmp_path, cache_dir):
+        path = tmp_path / "dates.yaml"
+        path.write_text("launched: 2026-03-01\n1: one\n")
+
+        yaml_cache.load_yaml(str(path), cache_dir)
+        yaml_cache._memo.clear()
+
+        assert yaml_cache.load_yaml(str(path), cache_dir)[0] == {"launched": date(2026, 3, 1), 1: "one"}
+
+    def test_save_skips_identical_content(self, config, cache_dir):
+        yaml_cache.load_yaml(str(config), cache_dir)
+        text, written = yaml_cache.save_yaml(str(config), {"channels": {}}, cache_dir)
+        assert written
+
+        assert yaml_cache.save_yaml(str(config), {"channels": {}}, cache_dir) == (text, False)
+        assert yaml_cache.load_yaml(str(config), cache_dir)[0] == {"channels": {}}
+
+    def test_recently_modified_files_are_rehashed(self, config, cache_dir):
+        yaml_cache.load_yaml(str(config), cache_dir)
+        assert yaml_cache._memo[str(config.resolve())]["identity"] is None
+
+        settled = time.time() - 60
+        os.utime(config, (settled, settled))
+        yaml_cache._memo.clear()
+        yaml_cache.load_yaml(str(config), cache_dir)
+        assert yaml_cache._memo[str(config.resolve())]["identity"] == list(yaml_cache.file_identity(config.resolve()))